@@ -0,0 +1,267 @@
+# File: backend/aggregates.py
+"""Per-restaurant, per-area and per-area-and-cuisine aggregates, built once per data version.
+
+Each table is a small frame with one row per restaurant, area or
+(area, cuisine) cell, holding dish counts and price statistics. Top-k
+queries walk a sort order that is computed once per table, column and
+direction, masked by the filters, so a request costs one pass over the
+restaurants rather than a groupby over the dishes.
+
+A new version can be built from the previous one. Restaurants whose rows
+hash the same as before keep their aggregates, and only the area and
+(area, cuisine) cells holding a changed restaurant are regrouped.
+"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Price statistics per restaurant: quantile of its dish prices.
+PRICE_QUANTILES = {'minPrice': 0.0, 'q1Price': 0.25, 'medianPrice': 0.5, 'q3Price': 0.75, 'maxPrice': 1.0}
+PRICE_STATS = tuple(PRICE_QUANTILES) + ('meanPrice',)
+# Multi-valued restaurant attributes: column -> response field with the values it serves.
+MEMBER_COLUMNS = {'Cuisine': 'cuisines', 'Food Type': 'foodTypes'}
+RESTAURANT_SORTS = ('medianPrice', 'minPrice', 'meanPrice', 'maxPrice', 'dishes', 'name')
+AREA_SORTS = ('dishes', 'restaurants', 'meanPrice', 'medianPrice', 'minPrice', 'maxPrice')
+# Sorts that default to largest first; the rest default to smallest first.
+DESCENDING_SORTS = ('dishes', 'restaurants')
+
+
+def _key_column(df: pd.DataFrame) -> str:
+    """Restaurants are told apart by URL when the table has one, else by name."""
+    return 'URL' if 'URL' in df.columns else 'Restaurant_Name'
+
+
+def _group_starts(counts: np.ndarray) -> np.ndarray:
+    return np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64)
+
+
+def restaurant_hashes(df: pd.DataFrame, codes: np.ndarray, n: int) -> np.ndarray:
+    """Order-independent content hash of each restaurant's rows (uint64, wrapping sum of row hashes)."""
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    order = np.argsort(codes, kind='stable')
+    return np.add.reduceat(row_hashes[order], _group_starts(np.bincount(codes, minlength=n)))
+
+
+def _restaurant_stats(df: pd.DataFrame, key: str):
+    """Return ``(table, members)`` for every restaurant in ``df``.
+
+    ``table`` is indexed by the restaurant key; ``members`` maps each
+    MEMBER_COLUMNS column to a frame of per-restaurant dish counts per value.
+    """
+    codes, keys = pd.factorize(df[key])
+    n = len(keys)
+    prices = df['Price'].to_numpy(dtype=np.float64)
+    counts = np.bincount(codes, minlength=n)
+    starts = _group_starts(counts)
+    sorted_prices = prices[np.lexsort((prices, codes))]
+    columns = {}
+    for label, q in PRICE_QUANTILES.items():
+        # Linear interpolation between the closest ranks, like np.quantile.
+        position = starts + q * (counts - 1)
+        below = np.floor(position).astype(np.int64)
+        above = np.ceil(position).astype(np.int64)
+        columns[label] = sorted_prices[below] + (sorted_prices[above] - sorted_prices[below]) * (position - below)
+    columns['meanPrice'] = np.bincount(codes, weights=prices, minlength=n) / counts
+
+    # The first row of each restaurant supplies its name and area.
+    first_row = np.empty(n, dtype=np.int64)
+    first_row[codes[::-1]] = np.arange(len(codes) - 1, -1, -1)
+    table = pd.DataFrame(dict(
+        name=df['Restaurant_Name'].to_numpy(dtype=object)[first_row],
+        area=df['Area'].to_numpy(dtype=object)[first_row] if 'Area' in df.columns else None,
+        dishes=counts,
+        hash=restaurant_hashes(df, codes, n),
+        **columns,
+    ), index=pd.Index(keys, name='key'))
+
+    members = {}
+    for column in MEMBER_COLUMNS:
+        if column not in df.columns:
+            continue
+        value_codes, values = pd.factorize(df[column])
+        valid = value_codes >= 0
+        flat = np.bincount(codes[valid] * len(values) + value_codes[valid], minlength=n * len(values))
+        members[column] = pd.DataFrame(flat.reshape(n, len(values)), index=table.index, columns=list(values))
+    return table, members
+
+
+def _group_stats(df: pd.DataFrame, by: List[str], key: str) -> pd.DataFrame:
+    groups = df.groupby(by, observed=True, sort=False)
+    stats = groups['Price'].agg(dishes='size', meanPrice='mean', medianPrice='median', minPrice='min',
+                                maxPrice='max')
+    stats['restaurants'] = groups[key].nunique()
+    return stats
+
+
+class RankedTable:
+    """A frame plus sort orders built on first use, for top-k queries under a row mask."""
+
+    def __init__(self, frame: pd.DataFrame, tiebreak: str):
+        self.frame = frame
+        # Ties are broken by this column in ascending order.
+        self._tiebreak = pd.factorize(frame[tiebreak].astype(str), sort=True)[0]
+        self._orders: Dict[tuple, np.ndarray] = {}
+        self._columns = {column: frame[column].to_numpy() for column in frame.columns}
+
+    def __len__(self):
+        return len(self.frame)
+
+    def order(self, column: str, descending: bool) -> np.ndarray:
+        key = (column, descending)
+        if key not in self._orders:
+            values = self.frame[column]
+            values = (values.to_numpy(dtype=np.float64) if pd.api.types.is_numeric_dtype(values)
+                      else pd.factorize(values.astype(str), sort=True)[0])
+            self._orders[key] = np.lexsort((self._tiebreak, -values if descending else values))
+        return self._orders[key]
+
+    def records(self, rows: np.ndarray) -> List[dict]:
+        """Rows at ``rows`` as dicts of Python scalars, without going through ``DataFrame.iloc``."""
+        names = list(self._columns)
+        return [dict(zip(names, row)) for row in zip(*(values[rows].tolist() for values in self._columns.values()))]
+
+    def top(self, mask: Optional[np.ndarray], column: str, descending: bool, limit: int):
+        """Return ``(matches, rows)``: how many rows pass ``mask``, and the first ``limit`` in order."""
+        order = self.order(column, descending)
+        if mask is None:
+            return len(order), order[:limit]
+        hits = order[mask[order]]
+        return len(hits), hits[:limit]
+
+
+class MenuAggregates:
+    """Restaurant, area and (area, cuisine) aggregate tables of one menu table.
+
+    With ``previous`` (the aggregates of an earlier version) only what
+    changed is recomputed; ``reused`` counts the restaurants carried over.
+    """
+
+    def __init__(self, df: pd.DataFrame, previous: Optional['MenuAggregates'] = None):
+        self.key = _key_column(df)
+        self.has_area = 'Area' in df.columns
+        self.reused = 0
+        if previous is not None and previous.key == self.key and previous.has_area == self.has_area:
+            self._update(df, previous)
+        else:
+            self.restaurant_table, self.members = _restaurant_stats(df, self.key)
+            self.cells = _group_stats(df, ['Area', 'Cuisine'], self.key) if self.has_area else None
+            self.areas = _group_stats(df, ['Area'], self.key) if self.has_area else None
+        self._index()
+
+    def _update(self, df: pd.DataFrame, previous: 'MenuAggregates'):
+        codes, keys = pd.factorize(df[self.key])
+        keys = pd.Index(keys, name='key')
+        hashes = restaurant_hashes(df, codes, len(keys))
+        old = previous.restaurant_table
+        at = old.index.get_indexer(keys)
+        known = at >= 0
+        unchanged = np.zeros(len(keys), dtype=bool)
+        unchanged[known] = old['hash'].to_numpy()[at[known]] == hashes[known]
+        self.reused = int(unchanged.sum())
+
+        changed_rows = ~unchanged[codes]
+        fresh, fresh_members = _restaurant_stats(df[changed_rows], self.key)
+        kept = keys[unchanged]
+        self.restaurant_table = pd.concat([old.loc[kept], fresh]).reindex(keys)
+        self.members = {}
+        for column, counts in fresh_members.items():
+            carried = previous.members.get(column)
+            parts = [counts] if carried is None else [carried.loc[kept], counts]
+            self.members[column] = pd.concat(parts).fillna(0).astype(np.int64).reindex(keys)
+
+        if not self.has_area:
+            self.cells = self.areas = None
+            return
+        # Cells holding a changed restaurant before or after the change get regrouped.
+        area_codes, area_values = pd.factorize(df['Area'])
+        cuisine_codes, cuisine_values = pd.factorize(df['Cuisine'])
+        cell_codes = area_codes.astype(np.int64) * len(cuisine_values) + cuisine_codes
+        touched = set(zip(area_values[area_codes[changed_rows]], cuisine_values[cuisine_codes[changed_rows]]))
+        gone = old.index.difference(kept)
+        if len(gone) and 'Cuisine' in previous.members:
+            served = previous.members['Cuisine'].loc[gone]
+            for key_value, row in served.iterrows():
+                area = old.at[key_value, 'area']
+                touched.update((area, cuisine) for cuisine in row.index[row.to_numpy() > 0])
+        area_at = {area: i for i, area in enumerate(area_values)}
+        cuisine_at = {cuisine: i for i, cuisine in enumerate(cuisine_values)}
+        touched_codes = [area_at[area] * len(cuisine_values) + cuisine_at[cuisine] for area, cuisine in touched
+                         if area in area_at and cuisine in cuisine_at]
+        cells = _group_stats(df[np.isin(cell_codes, touched_codes)], ['Area', 'Cuisine'], self.key)
+        self.cells = pd.concat([previous.cells[~previous.cells.index.isin(list(touched))], cells])
+
+        touched_areas = {area for area, _ in touched}
+        touched_area_codes = [area_at[area] for area in touched_areas if area in area_at]
+        areas = _group_stats(df[np.isin(area_codes, touched_area_codes)], ['Area'], self.key)
+        self.areas = pd.concat([previous.areas[~previous.areas.index.isin(touched_areas)], areas])
+
+    def _index(self):
+        self.restaurants = RankedTable(self.restaurant_table.reset_index(), 'name')
+        self.area_codes, self.area_values = pd.factorize(self.restaurant_table['area'])
+        self.member_names = {column: counts.columns.tolist() for column, counts in self.members.items()}
+        self.member_values = {column: {value: i for i, value in enumerate(names)}
+                              for column, names in self.member_names.items()}
+        self.member_arrays = {column: counts.to_numpy() for column, counts in self.members.items()}
+        if self.has_area:
+            self.area_table = RankedTable(self.areas.reset_index(), 'Area')
+            self.cell_table = RankedTable(self.cells.reset_index(), 'Area')
+            self.cell_cuisines = self.cell_table.frame['Cuisine'].astype(object).to_numpy()
+
+    def restaurant_mask(self, filters: Dict[str, Sequence]) -> Optional[np.ndarray]:
+        """Restaurants in any wanted area that serve any wanted value of each member column."""
+        mask = None
+        for column, wanted in filters.items():
+            if not wanted:
+                continue
+            if column == 'Area':
+                wanted = set(wanted)
+                codes = [i for i, value in enumerate(self.area_values) if value in wanted]
+                matches = np.isin(self.area_codes, codes)
+            elif column in self.member_arrays:
+                columns = [self.member_values[column][value] for value in wanted
+                           if value in self.member_values[column]]
+                matches = self.member_arrays[column][:, columns].any(axis=1)
+            else:
+                continue
+            mask = matches if mask is None else mask & matches
+        return mask
+
+    def top_restaurants(self, filters: Dict[str, Sequence], sort: str = 'medianPrice',
+                        descending: bool = False, limit: int = 10) -> dict:
+        """Restaurants passing ``filters`` (column -> wanted values), ranked by ``sort``."""
+        total, rows = self.restaurants.top(self.restaurant_mask(filters), sort, descending, limit)
+        results = []
+        for i, row in zip(rows.tolist(), self.restaurants.records(rows)):
+            record = {'name': row['name'], 'area': row['area'], 'dishes': int(row['dishes'])}
+            if self.key == 'URL':
+                record['url'] = row['key']
+            record.update({stat: round(float(row[stat]), 2) for stat in PRICE_STATS})
+            for column, field in MEMBER_COLUMNS.items():
+                if column in self.member_arrays:
+                    # Most dishes first, ties by name, so the column order of the counts never shows.
+                    values, counts = self.member_names[column], self.member_arrays[column][i].tolist()
+                    served = sorted((-count, values[j]) for j, count in enumerate(counts) if count)
+                    record[field] = [value for _, value in served]
+            results.append(record)
+        return {'total': total, 'results': results}
+
+    def top_areas(self, cuisines: Sequence[str] = (), sort: str = 'dishes', descending: bool = True,
+                  limit: int = 10) -> dict:
+        """Areas ranked by ``sort``, or (area, cuisine) cells when ``cuisines`` are given."""
+        if cuisines:
+            table = self.cell_table
+            mask = np.isin(self.cell_cuisines, list(cuisines))
+        else:
+            table, mask = self.area_table, None
+        total, rows = table.top(mask, sort, descending, limit)
+        results = []
+        for row in table.records(rows):
+            record = {'area': row['Area']}
+            if cuisines:
+                record['cuisine'] = row['Cuisine']
+            record.update(dishes=int(row['dishes']), restaurants=int(row['restaurants']))
+            record.update({stat: round(float(row[stat]), 2)
+                           for stat in ('meanPrice', 'medianPrice', 'minPrice', 'maxPrice')})
+            results.append(record)
+        return {'total': total, 'results': results}
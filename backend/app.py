@@ -1,82 +1,171 @@
 # File: backend/app.py
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify
 from flask_cors import CORS
-import pandas as pd
+import numpy as np
 import os
 
+import queries
+from dataset import open_datasets
+from metrics import METRICS, PROMETHEUS_CONTENT_TYPE, SERVER_TIMING, Spans
+from queries import EMPTY_DATA_ERROR, QueryError
+
 app = Flask(__name__)
 # Allow all origins, which is fine for Vercel deployment
-CORS(app, resources={r"/api/*": {"origins": "*"}}) 
-
-data_file_name = 'Zomato_Menu_Classified_with_Area.csv'
-
-try:
-    script_dir = os.path.dirname(__file__) 
-    file_path = os.path.join(script_dir, data_file_name)
-    
-    print(f"--- LOG: Attempting to load data from: {file_path}")
-    df = pd.read_csv(file_path)
-    print(f"--- LOG: CSV file loaded. Initial row count: {len(df)}")
-    print(f"--- LOG: Columns found: {df.columns.tolist()}")
-
-    # --- ADVANCED PRICE CLEANING ---
-    if 'Price' in df.columns:
-        print("--- LOG: Starting 'Price' column cleaning...")
-        # First, drop rows where 'Price' is already empty
-        df.dropna(subset=['Price'], inplace=True)
-        print(f"--- LOG: Rows after dropping empty prices: {len(df)}")
-        
-        # Convert to string and use regex to remove everything that isn't a digit or decimal
-        df['Price'] = df['Price'].astype(str).str.replace(r'[^\d.]', '', regex=True)
-        
-        # After cleaning, some might be empty strings. Replace them with NaN.
-        df.loc[df['Price'] == '', 'Price'] = pd.NA
-        print(f"--- LOG: Rows after replacing empty strings in Price: {len(df)}")
-
-        # Now convert to numeric. Coerce will handle any remaining bad formats.
-        df['Price'] = pd.to_numeric(df['Price'], errors='coerce')
-        
-        # Finally, drop any rows that could not be converted.
-        df.dropna(subset=['Price'], inplace=True)
-        print(f"--- LOG: Rows after final numeric conversion of Price: {len(df)}")
-    else:
-        print("--- LOG: WARNING - 'Price' column not found.")
-
-    # --- CLEAN OTHER CRITICAL COLUMNS ---
-    # This is another potential point of failure. We will check it too.
-    initial_rows_before_final_clean = len(df)
-    df.dropna(subset=['Item_Name', 'Restaurant_Name', 'Food Type', 'Cuisine'], inplace=True)
-    print(f"--- LOG: Rows after cleaning other critical columns: {len(df)}")
-    print(f"--- LOG: Dropped {initial_rows_before_final_clean - len(df)} rows due to missing critical data.")
-    
-    print(f"--- LOG: FINAL DATA READY with {len(df)} rows.")
-        
-except Exception as e:
-    print(f"--- LOG: FATAL ERROR - An exception occurred during data loading: {e}")
-    df = pd.DataFrame() # Ensure df is empty on error
+CORS(app, resources={r"/api/*": {"origins": "*"}}, expose_headers=['X-Data-Version'])
+
+# The table and every index built from it live in one Dataset that a reload
+# swaps as a whole; handlers read it once per request through current_data().
+datasets = open_datasets()
+# Optional shared secret for POST /api/admin/reload.
+RELOAD_TOKEN = os.environ.get('RELOAD_TOKEN')
+
+def current_data():
+    """The dataset this request works on, fixed at its first call."""
+    if 'dataset' not in g:
+        g.dataset = datasets.current
+    return g.dataset
+
+@app.before_request
+def start_spans():
+    g.spans = Spans(request.url_rule.rule if request.url_rule is not None else 'unmatched')
+
+@app.after_request
+def add_data_version(response):
+    version = current_data().version
+    if version:
+        response.headers['X-Data-Version'] = version
+    spans = g.get('spans')
+    if spans is not None:
+        g.status_code, g.total = response.status_code, spans.total()
+        if SERVER_TIMING:
+            response.headers['Server-Timing'] = spans.server_timing(g.total)
+    return response
+
+@app.teardown_request
+def record_request(error=None):
+    # Runs even when a handler or hook raised, so those requests count as 500s.
+    spans = g.get('spans')
+    if spans is not None:
+        METRICS.record(spans, g.get('status_code', 500), g.get('total'))
+
+@app.errorhandler(QueryError)
+def bad_query(error):
+    return jsonify({"error": str(error)}), 400
 
 # --- API Endpoint (no changes needed here) ---
 @app.route('/api/recommend', methods=['POST'])
 def get_recommendations():
-    if df.empty:
-        return jsonify({"error": "Server data is empty or not loaded correctly."}), 500
-    
-    # ... rest of the function is the same ...
-    data = request.get_json()
-    food_types = data.get('foodTypes', [])
-    cuisines = data.get('cuisines', [])
-    min_price = data.get('minPrice')
-    max_price = data.get('maxPrice')
-    filtered_df = df.copy()
-    if food_types: filtered_df = filtered_df[filtered_df['Food Type'].isin(food_types)]
-    if cuisines: filtered_df = filtered_df[filtered_df['Cuisine'].isin(cuisines)]
-    if 'Price' in filtered_df.columns:
-        if min_price is not None: filtered_df = filtered_df[filtered_df['Price'] >= float(min_price)]
-        if max_price is not None: filtered_df = filtered_df[filtered_df['Price'] <= float(max_price)]
-    if filtered_df.empty: return jsonify([])
-    num_samples = min(len(filtered_df), 5)
-    recommendations = filtered_df.sample(n=num_samples)
-    return jsonify(recommendations.to_dict(orient='records'))
+    data_set = current_data()
+    if data_set.empty:
+        return jsonify({"error": EMPTY_DATA_ERROR}), 500
+
+    positions = queries.recommend(data_set, request.get_json(), g.spans)
+    if positions.size == 0: return jsonify([])
+    # Only the sampled rows are ever materialised and serialised.
+    recommendations = data_set.df.iloc[positions]
+    response = jsonify(recommendations.to_dict(orient='records'))
+    g.spans.mark('serialize')
+    return response
+
+@app.route('/api/recommend/batch', methods=['POST'])
+def get_batch_recommendations():
+    """Answer a list of recommend queries in one request, in request order.
+
+    Body: ``{"queries": [{foodTypes, cuisines, minPrice, maxPrice, count}, ...],
+    "seed": optional}`` or just the list of queries.
+    """
+    data_set = current_data()
+    if data_set.empty:
+        return jsonify({"error": EMPTY_DATA_ERROR}), 500
+
+    samples = queries.recommend_batch(data_set, request.get_json())
+    # One row lookup and conversion for the whole batch, then split per query.
+    records = data_set.df.iloc[np.concatenate(samples)].to_dict(orient='records') if samples else []
+    results, start = [], 0
+    for positions in samples:
+        results.append(records[start:start + len(positions)])
+        start += len(positions)
+    return jsonify(results)
+
+@app.route('/api/facets', methods=['GET'])
+def get_facets():
+    """Distinct Food Types, Cuisines and Areas with counts and price statistics.
+
+    Optional query parameters narrow the counts: repeated ``foodTypes``,
+    ``cuisines`` and ``areas`` values, and ``minPrice``/``maxPrice``.
+    """
+    data_set = current_data()
+    if data_set.empty:
+        return jsonify({"error": EMPTY_DATA_ERROR}), 500
+
+    conditional = queries.facets(data_set, request.args)
+    if conditional is None:
+        return Response(data_set.facets.unfiltered_json, mimetype='application/json')
+    return jsonify(conditional)
+
+@app.route('/api/search', methods=['GET'])
+def search_menu():
+    """Dish and restaurant names matching ``q``, typo-tolerant and by word prefix.
+
+    Takes the same optional filters as /api/facets, plus ``limit``. Each
+    result has its type (``item`` or ``restaurant``), name, score and the
+    number of dishes matching the filters.
+    """
+    data_set = current_data()
+    if data_set.empty:
+        return jsonify({"error": EMPTY_DATA_ERROR}), 500
+    return jsonify(queries.search(data_set, request.args))
+
+@app.route('/api/restaurants', methods=['GET'])
+def top_restaurants():
+    """Restaurants with their dish count, price quartiles, cuisines and food types.
+
+    Filtered by repeated ``areas``, ``cuisines`` and ``foodTypes`` values,
+    ordered by ``sort`` (default ``medianPrice``) and ``order`` (asc/desc),
+    at most ``limit`` of them. ``total`` counts every match.
+    """
+    data_set = current_data()
+    if data_set.empty:
+        return jsonify({"error": EMPTY_DATA_ERROR}), 500
+    return jsonify(queries.restaurants(data_set, request.args))
+
+@app.route('/api/areas', methods=['GET'])
+def top_areas():
+    """Dish and restaurant counts and price statistics per area.
+
+    With ``cuisines``, one row per matching (area, cuisine) pair instead.
+    ``sort`` (default ``dishes``), ``order`` and ``limit`` as for /api/restaurants.
+    """
+    data_set = current_data()
+    if data_set.empty:
+        return jsonify({"error": EMPTY_DATA_ERROR}), 500
+    return jsonify(queries.areas(data_set, request.args))
+
+@app.route('/api/cache/stats', methods=['GET'])
+def get_cache_stats():
+    data_set = current_data()
+    return jsonify(dict(data_set.filter_cache.stats(), ranked=data_set.ranked_cache.stats()))
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Request and stage latency histograms and load-phase timings, in Prometheus text format."""
+    return Response(METRICS.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+@app.route('/api/admin/reload', methods=['POST'])
+def reload_data():
+    """Start loading the data files into a new version in the background.
+
+    The live version keeps serving until the new one is fully built. When
+    RELOAD_TOKEN is set, the request must carry it in ``X-Reload-Token``.
+    """
+    if RELOAD_TOKEN and request.headers.get('X-Reload-Token') != RELOAD_TOKEN:
+        return jsonify({"error": "Invalid reload token."}), 403
+    started = datasets.reload()
+    return jsonify(dict(datasets.status(), started=started)), 202
+
+@app.route('/api/admin/data', methods=['GET'])
+def get_data_status():
+    return jsonify(datasets.status())
 
 if __name__ == '__main__':
     app.run(debug=False, port=5000)
\ No newline at end of file
@@ -0,0 +1,199 @@
+# File: backend/area_classifier.py
+"""Classify Zomato restaurant URLs (or free text) into Pune areas."""
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+OTHER_AREA = "Other"
+
+# URL/slug fragment -> display name of the area.
+AREA_MAP = {
+    "hinjawadi": "Hinjawadi",
+    "baner": "Baner",
+    "kothrud": "Kothrud",
+    "wakad": "Wakad",
+    "viman-nagar": "Viman Nagar",
+    "koregaon-park": "Koregaon Park",
+    "hadapsar": "Hadapsar",
+    "aundh": "Aundh",
+    "magarpatta": "Magarpatta",
+    "pimple-saudagar": "Pimple Saudagar",
+    "fc-road": "FC Road",
+    "camp": "Camp",
+    "swargate": "Swargate",
+    "deccan": "Deccan",
+    "pimpri": "Pimpri",
+    "chinchwad": "Chinchwad",
+    "bavdhan": "Bavdhan",
+    "dhankawadi": "Dhankawadi",
+    "karve-nagar": "Karve Nagar",
+    "shivaji-nagar": "Shivaji Nagar",
+    "bhugaon": "Bhugaon",
+    "senapati-bapat-road": "Senapati Bapat Road",
+    "yerwada": "Yerawada",
+    "kalyani-nagar": "Kalyani Nagar",
+    "pashan": "Pashan",
+    "bund-garden": "Bund Garden",
+    "sus": "Susgaon",
+    "erandwane": "Erandwane",
+    "mg-road": "MG Road",
+    "mundhwa": "Mundhwa",
+    "pune-university": "Pune University",
+    "jm-road": "JM Road",
+    "sadashiv-peth": "Sadashiv Peth",
+    "kharadi": "Kharadi",
+    "ravet": "Ravet",
+    "yerawada": "Yerawada",
+    "nigdi": "Nigdi",
+    "katraj": "Katraj",
+    "bibvewadi": "Bibvewadi",
+    "bibewadi": "Bibewadi",
+    "wadgaon-sheri": "Wadgaon Sheri",
+    "wadgaon": "Wadgaon",
+    "kondhwa": "Kondhwa",
+    "lohegaon": "Lohegaon",
+    "dhanori": "Dhanori",
+    "pimple-nilakh": "Pimple Nilakh",
+    "shukrawar-peth": "Shukrawar Peth",
+    "narhe": "Narhe",
+    "dehu-road": "Dehu Road",
+    "nibm-road": "NIBM Road",
+    "balewadi": "Balewadi",
+    "sinhgad-road": "Sinhgad Road",
+    "model-colony": "Model Colony",
+    "saluknhe-vihar-road": "Salunkhe Vihar",
+    "lonavala": "Lonavala",
+    "fatima-nagar": "Fatima Nagar",
+    "vishrantwadi": "Vishrantwadi",
+    "satara-road": "Satara Road",
+    "dhole-patil-road": "Dhole Patil Road",
+    "akurdi": "Akurdi",
+    "tilak-road": "Tilak Road",
+    "shivapur": "Shivapur",
+    "east-street": "East Street",
+    "law-college-road": "Law College Road",
+    "chandan-nagar": "Chandan Nagar",
+    "wanowrie": "Wanowrie",
+    "dange-chowk": "Dange Chowk",
+    "warje": "Warje",
+    "khadki": "Khadki",
+    "rasta-peth": "Rasta Peth",
+    "salunkhe-vihar-road": "Salunkhe Vihar Road",
+    "old-mumbai-pune-highway": "Old Mumbai Pune Highway",
+    "parvati": "Parvati",
+    "bhosari": "Bhosari",
+    "wagholi": "Wagholi",
+    "ghorpadi": "Ghorpadi",
+    "talawade": "Talawade",
+    "pimple-gurav": "Pimple Gurav",
+    "budhwar-peth": "Budhwar Peth",
+    "kanji-mahalunge": "Kanji Mahalunge",
+}
+
+PUNE_SLUG_PATTERN = r'zomato\.com/pune/([^/?#]+)'
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+class AhoCorasick:
+    """Multi-pattern substring matcher over a fixed set of patterns."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[str]] = [[]]
+        for pattern in patterns:
+            state = 0
+            for char in pattern:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._out[state].append(pattern)
+
+        # Breadth-first, so every fail target is finished before it is used.
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, target in self._goto[state].items():
+                queue.append(target)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[target] = self._goto[fallback].get(char, 0)
+                self._out[target] = self._out[target] + self._out[self._fail[target]]
+
+    def find_all(self, text: str) -> List[Tuple[int, str]]:
+        """Return ``(start, pattern)`` for every occurrence of every pattern in ``text``."""
+        matches = []
+        state = 0
+        for end, char in enumerate(text, 1):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for pattern in self._out[state]:
+                matches.append((end - len(pattern), pattern))
+        return matches
+
+
+class AreaClassifier:
+    """Map URLs to areas by slug lookup, falling back to Aho-Corasick over free text.
+
+    A Zomato URL's ``zomato.com/pune/<slug>`` segment is extracted once and
+    its hyphen-separated suffixes are looked up in ``area_map`` from the
+    longest down, so "wadgaon-sheri" wins over "wadgaon" and "sus" only
+    matches as a whole word. Anything else is scanned with one automaton
+    pass; the longest whole-word match wins, the rightmost on a tie.
+    Results never depend on the order of ``area_map``.
+    """
+
+    def __init__(self, area_map: Optional[Dict[str, str]] = None):
+        self.area_map = dict(AREA_MAP if area_map is None else area_map)
+        self._matcher = AhoCorasick(self.area_map)
+
+    def classify_slug(self, slug: str) -> str:
+        tokens = slug.lower().split('-')
+        for start in range(len(tokens)):
+            area = self.area_map.get('-'.join(tokens[start:]))
+            if area is not None:
+                return area
+        return self.classify_text(slug)
+
+    def classify_text(self, text: str) -> str:
+        normalized = '-' + _NON_ALNUM.sub('-', text.lower()).strip('-') + '-'
+        best = None
+        for start, pattern in self._matcher.find_all(normalized):
+            end = start + len(pattern)
+            if normalized[start - 1] != '-' or normalized[end] != '-':
+                continue
+            if best is None or (len(pattern), start) > (len(best[1]), best[0]):
+                best = (start, pattern)
+        return self.area_map[best[1]] if best else OTHER_AREA
+
+    def classify_url(self, url: str) -> str:
+        match = re.search(PUNE_SLUG_PATTERN, url)
+        return self.classify_slug(match.group(1)) if match else self.classify_text(url)
+
+    def classify_urls(self, urls: pd.Series) -> pd.Series:
+        """Classify a whole column; each distinct URL is classified once.
+
+        Menu tables repeat a restaurant's URL on every dish, so the column is
+        factorised first and the slug extraction runs over the distinct URLs.
+        """
+        codes, uniques = pd.factorize(urls.astype(str))
+        distinct = pd.Series(uniques, dtype=object)
+        slugs = distinct.str.extract(PUNE_SLUG_PATTERN, expand=False)
+        areas = [self.classify_text(url) if pd.isna(slug) else self.classify_slug(slug)
+                 for url, slug in zip(distinct, slugs)]
+        areas = np.array(areas + [OTHER_AREA], dtype=object)
+        # Missing URLs factorise to -1, which picks the trailing OTHER_AREA.
+        return pd.Series(areas[codes], index=urls.index, name='Area')
+
+
+def classify_urls(urls: pd.Series) -> pd.Series:
+    """Classify ``urls`` with the default ``AREA_MAP``."""
+    return AreaClassifier().classify_urls(urls)
@@ -0,0 +1,220 @@
+# File: backend/asgi.py
+"""ASGI entry point serving the same API as app.py, with orjson responses.
+
+Handlers share the query code in ``queries.py`` and the hot-reloaded
+``Dataset`` with the Flask app. The one difference is serialisation:
+sampled rows go from their positions straight to JSON bytes, one column
+at a time, without ``DataFrame.to_dict`` and numpy scalars in between.
+Bodies match Flask's except for missing values such as a NaN rating:
+orjson writes them as null, which is valid JSON, where Flask's jsonify
+writes a bare NaN.
+
+Most queries are short numpy calls, so their handlers run on the event
+loop and one worker interleaves many keep-alive connections. Ranked
+recommendations and filtered facet counts can work over every matching
+row when their result is not cached yet, so those run in the thread pool.
+
+Needs the packages in requirements-asgi.txt. Run from the backend directory with:
+    uvicorn asgi:app --port 8000
+"""
+import os
+from typing import List, Sequence
+
+import numpy as np
+import orjson
+import pandas as pd
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+import queries
+from dataset import Dataset, open_datasets
+from metrics import METRICS, PROMETHEUS_CONTENT_TYPE, SERVER_TIMING, Spans
+from queries import EMPTY_DATA_ERROR, QueryError
+
+# Flask's jsonify sorts keys; do the same so both modes order fields alike.
+# NaN has no JSON form: orjson writes null where jsonify writes NaN.
+JSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY
+RELOAD_TOKEN = os.environ.get('RELOAD_TOKEN')
+
+datasets = open_datasets()
+
+
+def column_lists(df: pd.DataFrame, positions: np.ndarray) -> List[list]:
+    """The values of every column at ``positions`` as lists of Python scalars."""
+    columns = []
+    for column in df.columns:
+        values = df[column].iloc[positions]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype(object)
+        columns.append(values.tolist())
+    return columns
+
+
+def records(df: pd.DataFrame, positions: np.ndarray) -> List[dict]:
+    """Rows at ``positions`` as records, like ``df.iloc[positions].to_dict(orient='records')``."""
+    names = df.columns.tolist()
+    return [dict(zip(names, row)) for row in zip(*column_lists(df, positions))]
+
+
+def split_records(df: pd.DataFrame, samples: Sequence[np.ndarray]) -> List[List[dict]]:
+    """Records for each array in ``samples``, converted in one pass."""
+    rows = records(df, np.concatenate(samples)) if samples else []
+    results, start = [], 0
+    for positions in samples:
+        results.append(rows[start:start + len(positions)])
+        start += len(positions)
+    return results
+
+
+def json_response(content, data_set: Dataset, status_code: int = 200) -> Response:
+    body = content if isinstance(content, bytes) else orjson.dumps(content, option=JSON_OPTIONS)
+    headers = {'X-Data-Version': data_set.version} if data_set.version else None
+    return Response(body, status_code=status_code, headers=headers, media_type='application/json')
+
+
+def error_response(message: str, data_set: Dataset, status_code: int) -> Response:
+    return json_response({"error": message}, data_set, status_code)
+
+
+async def json_body(request: Request):
+    """The request body parsed as JSON; a QueryError if it is not JSON."""
+    try:
+        return orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        raise QueryError("Request body is not valid JSON.") from None
+
+
+def timed(route: str, handler):
+    """Wrap ``handler`` to time it under ``route``; it can mark stages on ``request.state.spans``.
+
+    A handler that raises is recorded as a 500.
+    """
+    async def endpoint(request: Request) -> Response:
+        spans = request.state.spans = Spans(route)
+        status_code = 500
+        try:
+            response = await handler(request)
+            status_code = response.status_code
+        finally:
+            total = spans.total()
+            METRICS.record(spans, status_code, total)
+        if SERVER_TIMING:
+            response.headers['Server-Timing'] = spans.server_timing(total)
+        return response
+    return endpoint
+
+
+async def recommend(request: Request) -> Response:
+    data_set = datasets.current
+    if data_set.empty:
+        return error_response(EMPTY_DATA_ERROR, data_set, 500)
+    spans = request.state.spans
+    try:
+        data = await json_body(request)
+        if isinstance(data, dict) and data.get('mode') == 'ranked':
+            # A query's first ranked request builds its alias table over every matching row.
+            positions = await run_in_threadpool(queries.recommend, data_set, data, spans)
+        else:
+            positions = queries.recommend(data_set, data, spans)
+    except QueryError as e:
+        return error_response(str(e), data_set, 400)
+    response = json_response(records(data_set.df, positions), data_set)
+    spans.mark('serialize')
+    return response
+
+
+async def recommend_batch(request: Request) -> Response:
+    data_set = datasets.current
+    if data_set.empty:
+        return error_response(EMPTY_DATA_ERROR, data_set, 500)
+    try:
+        samples = queries.recommend_batch(data_set, await json_body(request))
+    except QueryError as e:
+        return error_response(str(e), data_set, 400)
+    return json_response(split_records(data_set.df, samples), data_set)
+
+
+async def facets(request: Request) -> Response:
+    data_set = datasets.current
+    if data_set.empty:
+        return error_response(EMPTY_DATA_ERROR, data_set, 500)
+    conditional = await run_in_threadpool(queries.facets, data_set, request.query_params)
+    if conditional is None:
+        return json_response(data_set.facets.unfiltered_json.encode('utf-8'), data_set)
+    return json_response(conditional, data_set)
+
+
+async def search(request: Request) -> Response:
+    data_set = datasets.current
+    if data_set.empty:
+        return error_response(EMPTY_DATA_ERROR, data_set, 500)
+    try:
+        return json_response(queries.search(data_set, request.query_params), data_set)
+    except QueryError as e:
+        return error_response(str(e), data_set, 400)
+
+
+async def top_restaurants(request: Request) -> Response:
+    data_set = datasets.current
+    if data_set.empty:
+        return error_response(EMPTY_DATA_ERROR, data_set, 500)
+    try:
+        return json_response(queries.restaurants(data_set, request.query_params), data_set)
+    except QueryError as e:
+        return error_response(str(e), data_set, 400)
+
+
+async def top_areas(request: Request) -> Response:
+    data_set = datasets.current
+    if data_set.empty:
+        return error_response(EMPTY_DATA_ERROR, data_set, 500)
+    try:
+        return json_response(queries.areas(data_set, request.query_params), data_set)
+    except QueryError as e:
+        return error_response(str(e), data_set, 400)
+
+
+async def cache_stats(request: Request) -> Response:
+    data_set = datasets.current
+    return json_response(dict(data_set.filter_cache.stats(), ranked=data_set.ranked_cache.stats()), data_set)
+
+
+async def metrics(request: Request) -> Response:
+    return Response(METRICS.render(), headers={'Content-Type': PROMETHEUS_CONTENT_TYPE})
+
+
+async def reload_data(request: Request) -> Response:
+    data_set = datasets.current
+    if RELOAD_TOKEN and request.headers.get('X-Reload-Token') != RELOAD_TOKEN:
+        return error_response("Invalid reload token.", data_set, 403)
+    started = datasets.reload()
+    return json_response(dict(datasets.status(), started=started), data_set, 202)
+
+
+async def data_status(request: Request) -> Response:
+    return json_response(datasets.status(), datasets.current)
+
+
+ROUTES = [
+    ('/api/recommend', recommend, 'POST'),
+    ('/api/recommend/batch', recommend_batch, 'POST'),
+    ('/api/facets', facets, 'GET'),
+    ('/api/search', search, 'GET'),
+    ('/api/restaurants', top_restaurants, 'GET'),
+    ('/api/areas', top_areas, 'GET'),
+    ('/api/cache/stats', cache_stats, 'GET'),
+    ('/api/metrics', metrics, 'GET'),
+    ('/api/admin/reload', reload_data, 'POST'),
+    ('/api/admin/data', data_status, 'GET'),
+]
+
+app = Starlette(
+    routes=[Route(path, timed(path, handler), methods=[method]) for path, handler, method in ROUTES],
+    middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'],
+                           expose_headers=['X-Data-Version'])],
+)
@@ -0,0 +1,141 @@
+# File: backend/bench/bench_backends.py
+"""Throughput and memory of the scraper fetch backends over captured pages.
+
+Writes generated listing pages to a temporary directory (or uses --captured
+DIR) and times each backend over all of them in a fresh process, reporting
+pages/sec and the peak RSS of that process plus everything it started
+(chromedriver and Chrome for Selenium). Pass --selenium to include the
+browser path; it needs Chrome installed.
+
+Run from the backend directory:  python -m bench.bench_backends [--pages 100]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from bench.fixtures import write_listing_fixtures
+
+SAMPLE_INTERVAL = 0.05
+
+
+def _children(pid: int):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+
+
+def _rss_kb(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def tree_rss_mb(pid: int) -> float:
+    """Resident memory of ``pid`` and all its descendants, in MB (Linux /proc)."""
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        total += _rss_kb(current)
+        stack.extend(_children(current))
+    return total / 1024
+
+
+class PeakRss:
+    """Samples the process tree's RSS in a background thread and keeps the peak."""
+
+    def __init__(self):
+        self.peak = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, tree_rss_mb(os.getpid()))
+            self._stop.wait(SAMPLE_INTERVAL)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, tree_rss_mb(os.getpid()))
+
+
+def run_backend(name: str, directory: str) -> dict:
+    """Scrape every page in ``directory`` with one fetcher; runs in the child process."""
+    from fetchers import HtmlFetcher, SeleniumFetcher, captured_pages
+
+    factories = {
+        "html": HtmlFetcher,
+        "html-stdlib": lambda: HtmlFetcher(parser="html.parser"),
+        "selenium": SeleniumFetcher,
+    }
+    pages = captured_pages(directory)
+    with PeakRss() as rss:
+        start = time.perf_counter()
+        fetcher = factories[name]()
+        records = 0
+        try:
+            for page in pages:
+                records += len(fetcher.fetch(page))
+        finally:
+            fetcher.close()
+        elapsed = time.perf_counter() - start
+    return {"backend": name, "pages": len(pages), "records": records, "seconds": round(elapsed, 3),
+            "pages_per_sec": round(len(pages) / elapsed, 1), "peak_rss_mb": round(rss.peak, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--per-page", type=int, default=40)
+    parser.add_argument("--captured", metavar="DIR", help="benchmark over saved pages instead of generated ones")
+    parser.add_argument("--selenium", action="store_true", help="include the headless Chrome backend")
+    parser.add_argument("--child", nargs=2, metavar=("BACKEND", "DIR"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        import logging
+        logging.getLogger().setLevel(logging.WARNING)
+        print(json.dumps(run_backend(*args.child)))
+        return
+
+    backends = ["html", "html-stdlib"] + (["selenium"] if args.selenium else [])
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = args.captured
+        if directory is None:
+            directory = tmp
+            slugs = [f"area-{i}" for i in range(args.pages)]
+            write_listing_fixtures(directory, slugs, args.per_page, overlap=0, state_every=4)
+        results = []
+        for backend in backends:
+            child = subprocess.run([sys.executable, "-m", "bench.bench_backends", "--child", backend, directory],
+                                   capture_output=True, text=True)
+            if child.returncode:
+                print(f"{backend}: failed\n{child.stderr.strip()}")
+                continue
+            results.append(json.loads(child.stdout.strip().splitlines()[-1]))
+
+    print(f"{'backend':<12} {'pages':>6} {'records':>8} {'pages/sec':>10} {'peak RSS MB':>12}")
+    for r in results:
+        print(f"{r['backend']:<12} {r['pages']:>6} {r['records']:>8} {r['pages_per_sec']:>10} {r['peak_rss_mb']:>12}")
+    if len({r["records"] for r in results}) > 1:
+        raise SystemExit("Backends disagree on the number of records")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# File: backend/bench/bench_cleaning.py
+"""Compare the shared cleaning pipeline with the old strip-and-dropna price cleaning.
+
+Builds a menu-shaped table of raw strings (prices in the shapes the
+scrapers produce, plus ratings and rating counts) and cleans it both ways.
+
+Run from the backend directory:  python -m bench.bench_cleaning [--rows 1000000]
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from bench.common import synthetic_menu
+from cleaning import clean_frame
+from menu_loader import CRITICAL_COLUMNS
+
+def old_clean(df: pd.DataFrame) -> pd.DataFrame:
+    """The cleaning load_menu_csv used to do: four dropna passes around a digit-stripping regex."""
+    df = df.copy()
+    df.dropna(subset=['Price'], inplace=True)
+    df['Price'] = df['Price'].astype(str).str.replace(r'[^\d.]', '', regex=True)
+    df.loc[df['Price'] == '', 'Price'] = pd.NA
+    df['Price'] = pd.to_numeric(df['Price'], errors='coerce')
+    df.dropna(subset=['Price'], inplace=True)
+    df.dropna(subset=['Item_Name', 'Restaurant_Name', 'Food Type', 'Cuisine'], inplace=True)
+    return df
+
+
+def new_clean(df: pd.DataFrame):
+    df, report = clean_frame(df)
+    keep = df[CRITICAL_COLUMNS].notna().all(axis=1).to_numpy()
+    return df[keep], report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    raw = synthetic_menu(args.rows, raw=True)
+    print(f"{args.rows:,} rows, {raw['Price'].nunique():,} distinct price strings")
+
+    start = time.perf_counter()
+    old = old_clean(raw)
+    old_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    new, report = new_clean(raw)
+    new_seconds = time.perf_counter() - start
+
+    print(f"old price-only cleaning     {old_seconds:8.2f} s   {len(old):,} rows kept")
+    print(f"shared pipeline (3 fields)  {new_seconds:8.2f} s   {len(new):,} rows kept")
+    for line in report.lines():
+        print(f"  {line}")
+    common = old.index.intersection(new.index)
+    differing = int((old.loc[common, 'Price'] != new.loc[common, 'Price']).sum())
+    print(f"prices the two disagree on: {differing:,} (the old regex reads '4.2 / ₹300' as 4.23 and 'Rs. 450' as 0.45)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+# File: backend/bench/bench_extraction.py
+"""Compare per-element card extraction with the bulk execute_script path.
+
+By default the page is served by a simulated WebDriver that charges a fixed
+latency per remote call (what chromedriver costs per round trip); pass
+--selenium to drive a real headless Chrome over a file:// copy of the page.
+
+Run from the backend directory:  python -m bench.bench_extraction [--cards 500]
+"""
+import argparse
+import json
+import logging
+import os
+import tempfile
+import time
+
+from bench.fixtures import listing_html, restaurant
+from fetchers import _CardParser
+import scraping_updated as scraper
+
+
+class _SimulatedElement:
+    def __init__(self, driver, text, headings, hrefs):
+        self._driver, self._text, self._headings, self._hrefs = driver, text, headings, hrefs
+        self.tag_name = "div"
+
+    @property
+    def text(self):
+        self._driver.round_trip()
+        return self._text.strip()
+
+    def find_elements(self, by, selector):
+        self._driver.round_trip()
+        if selector == "a[href]":
+            return [_SimulatedElement(self._driver, "", [], [href]) for href in self._hrefs]
+        return [_SimulatedElement(self._driver, heading, [], []) for heading in self._headings]
+
+    def get_attribute(self, name):
+        self._driver.round_trip()
+        return self._hrefs[0] if name == "href" and self._hrefs else None
+
+
+class SimulatedDriver:
+    """Serves one saved page; every WebDriver call costs ``latency`` seconds."""
+
+    def __init__(self, html, latency):
+        parser = _CardParser()
+        parser.feed(html)
+        self.cards = parser.cards
+        self.latency = latency
+        self.calls = 0
+
+    def round_trip(self):
+        self.calls += 1
+        time.sleep(self.latency)
+
+    def find_elements(self, by, selector):
+        self.round_trip()
+        if selector != scraper.CARD_SELECTORS[0]:
+            return []
+        return [_SimulatedElement(self, *card) for card in self.cards]
+
+    def execute_script(self, script, selector, keywords, name_selector, start=0):
+        self.round_trip()
+        cards = self.cards if selector == scraper.CARD_SELECTORS[0] else []
+        return json.dumps({"total": len(cards),
+                           "cards": [{"text": text.strip(), "headings": [h.strip() for h in headings], "hrefs": hrefs}
+                                     for text, headings, hrefs in cards[start:]]})
+
+
+def element_path(driver):
+    elements, _ = scraper.find_restaurant_elements(driver)
+    records = [scraper.extract_restaurant_data(element) for element in elements]
+    return [r for r in records if r["Name"] != "N/A" and len(r["Name"]) > 2]
+
+
+def bulk_path(driver):
+    cards, _ = scraper.find_restaurant_cards(driver)
+    return scraper.parse_restaurant_cards(cards)
+
+
+def run(label, fn, driver):
+    start = time.perf_counter()
+    records = fn(driver)
+    elapsed = time.perf_counter() - start
+    calls = getattr(driver, "calls", None)
+    suffix = f", {calls} driver calls" if calls is not None else ""
+    print(f"{label:<12} {elapsed * 1000:10.1f} ms  {len(records)} records{suffix}")
+    if calls is not None:
+        driver.calls = 0
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="simulated cost of one driver call")
+    parser.add_argument("--page", help="saved listing page to use instead of a generated one")
+    parser.add_argument("--selenium", action="store_true", help="use a real headless Chrome")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    if args.page:
+        with open(args.page, encoding="utf-8") as f:
+            html = f.read()
+    else:
+        import random
+        rng = random.Random(0)
+        html = listing_html([restaurant(i, "baner", rng) for i in range(args.cards)])
+
+    if args.selenium:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "listing.html")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(html)
+            driver = scraper.init_driver(headless=True)
+            try:
+                driver.get("file://" + path)
+                old = run("element", element_path, driver)
+                new = run("bulk", bulk_path, driver)
+            finally:
+                driver.quit()
+    else:
+        driver = SimulatedDriver(html, args.latency_ms / 1000)
+        old = run("element", element_path, driver)
+        new = run("bulk", bulk_path, driver)
+
+    if [r["Name"] for r in old] != [r["Name"] for r in new]:
+        raise SystemExit("Element and bulk extraction disagree")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# File: backend/bench/bench_index.py
+"""Compare MenuIndex filtering and sampling against the old pandas path.
+
+Run from the backend directory:  python -m bench.bench_index
+"""
+import argparse
+
+import numpy as np
+
+from bench.common import base_menu, random_queries, scale, summarize, time_calls
+from filter_cache import FilterCache
+from menu_index import MenuIndex
+from ranking import MenuRanker
+
+
+def pandas_candidates(df, food_types, cuisines, min_price, max_price):
+    """The filtering that /api/recommend did before the index existed."""
+    filtered_df = df.copy()
+    if food_types: filtered_df = filtered_df[filtered_df['Food Type'].isin(food_types)]
+    if cuisines: filtered_df = filtered_df[filtered_df['Cuisine'].isin(cuisines)]
+    if min_price is not None: filtered_df = filtered_df[filtered_df['Price'] >= float(min_price)]
+    if max_price is not None: filtered_df = filtered_df[filtered_df['Price'] <= float(max_price)]
+    return filtered_df
+
+
+def index_candidates(index, food_types, cuisines, min_price, max_price):
+    return index.candidates({'Food Type': food_types, 'Cuisine': cuisines}, min_price, max_price)
+
+
+def pandas_sample(df, *query):
+    candidates = pandas_candidates(df, *query)
+    return candidates.sample(n=min(len(candidates), 5)).to_dict(orient='records')
+
+
+def index_sample(df, index, food_types, cuisines, min_price, max_price):
+    positions = index.sample({'Food Type': food_types, 'Cuisine': cuisines}, min_price, max_price, k=5)
+    return df.iloc[positions].to_dict(orient='records')
+
+
+def ranked_sample(df, ranker, cache, food_types, cuisines, min_price, max_price):
+    positions = ranker.sample({'Food Type': food_types, 'Cuisine': cuisines}, min_price, max_price, k=5,
+                              cache=cache)
+    return df.iloc[positions].to_dict(orient='records')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--queries', type=int, default=300)
+    parser.add_argument('--factors', type=int, nargs='+', default=[10, 100])
+    args = parser.parse_args()
+
+    base = base_menu()
+    for factor in args.factors:
+        df = scale(base, factor)
+        index = MenuIndex(df)
+        queries = [(q['foodTypes'], q['cuisines'], q['minPrice'], q['maxPrice'])
+                   for q in random_queries(df, args.queries)]
+
+        for q in queries[:50]:
+            expected = pandas_candidates(df, *q).index.to_numpy()
+            if not np.array_equal(expected, index_candidates(index, *q)):
+                raise SystemExit(f"Candidate mismatch for query {q}")
+
+        print(f"\n{len(df)} rows ({factor}x), {len(queries)} queries")
+        print(summarize('pandas copy + masks', time_calls(lambda *q: pandas_candidates(df, *q), queries)))
+        print(summarize('MenuIndex.candidates', time_calls(lambda *q: index_candidates(index, *q), queries)))
+        print(summarize('pandas filter + sample', time_calls(lambda *q: pandas_sample(df, *q), queries)))
+        print(summarize('MenuIndex.sample + rows', time_calls(lambda *q: index_sample(df, index, *q), queries)))
+
+        ranker, cache = MenuRanker(df, index), FilterCache(max_entries=len(queries))
+        print(summarize('ranked, alias table built', time_calls(lambda *q: ranked_sample(df, ranker, cache, *q),
+                                                                 queries)))
+        print(summarize('ranked, alias table cached', time_calls(lambda *q: ranked_sample(df, ranker, cache, *q),
+                                                                  queries)))
+
+
+if __name__ == '__main__':
+    main()
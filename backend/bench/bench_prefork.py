@@ -0,0 +1,190 @@
+# File: backend/bench/bench_prefork.py
+"""Check that prefork.py workers share the dataset: memory per extra worker and throughput.
+
+For each worker count, prefork.py is started on a generated table, twice:
+with the shared dataset, and with --no-share, where every worker loads its
+own copy. The keep-alive client from bench_serving drives /api/recommend,
+then every process's memory is read from /proc/<pid>/smaps_rollup.
+
+RSS counts shared pages in every process that touches them, so the
+memory measure is the total PSS (proportional set size) of the parent and
+its workers: it grows by what each extra worker costs in its own pages.
+The check fails, with exit status 1, when
+
+  - an extra shared-mode worker costs more than MAX_MEMORY_RATIO of what
+    an extra --no-share worker costs, or
+  - shared-mode throughput at N workers is below SCALING_FLOOR times the
+    single-worker rate times min(N, CPUs). On one CPU this only asks that
+    more workers do not slow the server down.
+
+Linux only. Run from the backend directory:
+    python -m bench.bench_prefork [--rows 1000000] [--workers 1 2 4] [--seconds 10]
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import pandas as pd
+
+from bench.bench_serving import BACKEND_DIR, free_port, run_load, wait_until_up
+from bench.common import random_queries
+from bench.generate import ensure_menu_csv
+from menu_loader import DATA_FILE_NAME, load_menu_csv, snapshot_path_for
+from snapshot import file_sha256, write_snapshot
+
+MODES = ('shared', 'copies')
+MAX_MEMORY_RATIO = 0.25
+SCALING_FLOOR = 0.7
+# Stop waiting for the workers' memory to settle after this long.
+SETTLE_TIMEOUT = 180.0
+DEFAULT_DATA_DIR = os.path.join(tempfile.gettempdir(), 'menu-bench')
+
+
+def prepare_data(rows: int, data_dir: str) -> str:
+    """A directory holding the generated table under the app's file name, with a fresh snapshot."""
+    source = ensure_menu_csv(rows, data_dir)
+    directory = os.path.join(data_dir, f'prefork_{rows}')
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, DATA_FILE_NAME)
+    if not os.path.exists(path):
+        os.symlink(source, path)
+    if not os.path.exists(snapshot_path_for(path)):
+        write_snapshot(load_menu_csv(path), snapshot_path_for(path), file_sha256(path))
+    return directory
+
+
+def children(pid: int) -> List[int]:
+    found = []
+    for entry in os.listdir('/proc'):
+        if entry.isdigit():
+            try:
+                with open(f'/proc/{entry}/stat') as f:
+                    # The command name is parenthesised and may contain spaces; the ppid follows it.
+                    if int(f.read().rsplit(')', 1)[1].split()[1]) == pid:
+                        found.append(int(entry))
+            except (OSError, IndexError, ValueError):
+                continue
+    return found
+
+
+def memory(pid: int) -> Dict[str, float]:
+    """Rss, Pss and private (unshared) memory of ``pid`` in MB."""
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        fields = dict(re.findall(r'^(\w+):\s+(\d+) kB', f.read(), re.MULTILINE))
+    kb = {name: int(value) for name, value in fields.items()}
+    return {'rss': kb['Rss'] / 1024, 'pss': kb['Pss'] / 1024,
+            'private': (kb['Private_Clean'] + kb['Private_Dirty']) / 1024}
+
+
+def process_memory(parent: int) -> dict:
+    workers = [memory(pid) for pid in children(parent)]
+    total = memory(parent)['pss'] + sum(worker['pss'] for worker in workers)
+    return {'total_pss_mb': round(total, 1), 'workers': len(workers),
+            'worker_rss_mb': round(sum(w['rss'] for w in workers) / max(len(workers), 1), 1),
+            'worker_private_mb': round(sum(w['private'] for w in workers) / max(len(workers), 1), 1)}
+
+
+def settle(parent: int, workers: int) -> dict:
+    """Wait until all workers exist and the total PSS holds still for a second; return it."""
+    deadline = time.monotonic() + SETTLE_TIMEOUT
+    last = None
+    while time.monotonic() < deadline:
+        current = process_memory(parent)
+        if (current['workers'] == workers and last is not None
+                and abs(current['total_pss_mb'] - last['total_pss_mb']) < 0.01 * last['total_pss_mb']):
+            return current
+        last = current
+        time.sleep(1.0)
+    return last
+
+
+def run_server(mode: str, workers: int, data_dir: str, bodies: List[bytes], args) -> dict:
+    port = free_port()
+    command = [sys.executable, 'prefork.py', '--workers', str(workers), '--port', str(port), '--no-access-log']
+    if mode == 'copies':
+        command.append('--no-share')
+    env = dict(os.environ, MENU_DATA_DIR=data_dir, DATA_WATCH_INTERVAL='0')
+    started = time.perf_counter()
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL)
+    url = f'http://127.0.0.1:{port}'
+    try:
+        wait_until_up(url, process)
+        # Every worker has to have loaded (in copies mode) and served before memory is read.
+        asyncio.run(run_load(url, bodies, max(4, 2 * workers), args.warmup))
+        settle(process.pid, workers)
+        ready = time.perf_counter() - started
+        result = asyncio.run(run_load(url, bodies, max(4, 2 * workers), args.seconds))
+        measured = process_memory(process.pid)
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait()
+    return dict(measured, rps=round(result['rps'], 1), errors=result['errors'], ready_s=round(ready, 1))
+
+
+def per_extra_worker(results: Dict[int, dict]) -> float:
+    fewest, most = min(results), max(results)
+    return (results[most]['total_pss_mb'] - results[fewest]['total_pss_mb']) / (most - fewest)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--warmup', type=float, default=3.0)
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help='where generated tables are cached')
+    parser.add_argument('--output', help='write the results as JSON here')
+    args = parser.parse_args()
+    if len(args.workers) < 2:
+        parser.error('give at least two worker counts')
+
+    data_dir = prepare_data(args.rows, args.data_dir)
+    df = pd.read_csv(os.path.join(data_dir, DATA_FILE_NAME), usecols=['Food Type', 'Cuisine'])
+    bodies = [json.dumps(query).encode() for query in random_queries(df, 500)]
+    cpus = os.cpu_count() or 1
+
+    results = {mode: {} for mode in MODES}
+    for mode in MODES:
+        for workers in sorted(args.workers):
+            r = results[mode][workers] = run_server(mode, workers, data_dir, bodies, args)
+            print(f"{mode:<7} {workers:>2} workers  {r['rps']:8,.0f} req/s  total PSS {r['total_pss_mb']:8.1f} MB  "
+                  f"per worker: RSS {r['worker_rss_mb']:7.1f} MB, private {r['worker_private_mb']:7.1f} MB  "
+                  f"(ready in {r['ready_s']:.0f} s, {r['errors']} errors)")
+
+    failures = []
+    shared_extra, copies_extra = per_extra_worker(results['shared']), per_extra_worker(results['copies'])
+    print(f"\nPSS per extra worker: shared {shared_extra:.1f} MB, copies {copies_extra:.1f} MB "
+          f"(limit {MAX_MEMORY_RATIO:.0%} of copies)")
+    if shared_extra > MAX_MEMORY_RATIO * copies_extra:
+        failures.append(f"an extra shared worker costs {shared_extra:.1f} MB, "
+                        f"over {MAX_MEMORY_RATIO:.0%} of the {copies_extra:.1f} MB of an extra copy")
+
+    shared = results['shared']
+    fewest = min(shared)
+    for workers, r in sorted(shared.items()):
+        expected = SCALING_FLOOR * shared[fewest]['rps'] * min(workers, cpus) / min(fewest, cpus)
+        print(f"shared  {workers:>2} workers  {r['rps']:8,.0f} req/s, floor {expected:8,.0f} ({cpus} CPUs)")
+        if r['rps'] < expected:
+            failures.append(f"{workers} workers served {r['rps']:,.0f} req/s, below the floor of {expected:,.0f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'rows': args.rows, 'cpus': cpus, 'results': results, 'failures': failures}, f, indent=2)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK: extra workers share the dataset and throughput holds up.")
+
+
+if __name__ == '__main__':
+    main()
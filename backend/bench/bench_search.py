@@ -0,0 +1,59 @@
+# File: backend/bench/bench_search.py
+"""Time /api/search's index against a pandas str.contains scan.
+
+Builds a synthetic menu with one distinct dish name per few rows, then
+replays autocomplete keystrokes (every prefix of a name) and misspelt queries.
+
+Run from the backend directory:  python -m bench.bench_search [--rows 1000000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from bench.common import summarize, synthetic_menu, time_calls
+from menu_index import MenuIndex
+from search_index import MenuSearch
+
+
+def typo(word: str, rng) -> str:
+    i = int(rng.integers(1, len(word)))
+    return word[:i] + word[i + 1:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--queries', type=int, default=300)
+    args = parser.parse_args()
+
+    df = synthetic_menu(args.rows, dish_names=args.rows // 2)
+    index = MenuIndex(df)
+    start = time.perf_counter()
+    search = MenuSearch(df, index)
+    print(f"{args.rows:,} rows, {len(search.names):,} distinct names, "
+          f"index built in {time.perf_counter() - start:.2f} s")
+
+    rng = np.random.default_rng(1)
+    targets = df['Item_Name'].sample(args.queries // 10, random_state=1).str.lower().tolist()
+    keystrokes = [(name[:n],) for name in targets for n in range(2, min(len(name), 12) + 1)][:args.queries]
+    typos = [(' '.join(typo(word, rng) if len(word) > 4 else word for word in name.split()),)
+             for name in targets]
+    filtered = [(query, {'Cuisine': ['Chinese', 'Cafe']}, None, 400.0) for (query,) in keystrokes]
+
+    def contains(query):
+        mask = df['Item_Name'].str.contains(query, case=False, regex=False)
+        return df.loc[mask, 'Item_Name'].value_counts().head(10)
+
+    print(summarize('search index, keystrokes', time_calls(search.search, keystrokes)))
+    print(summarize('search index, typos', time_calls(search.search, typos)))
+    print(summarize('search index, filtered', time_calls(search.search, filtered)))
+    print(summarize('pandas str.contains', time_calls(contains, keystrokes[:20])))
+
+    found = sum(any(r['name'].lower() == name for r in search.search(query))
+                for (query,), name in zip(typos, targets))
+    print(f"misspelt queries whose intended dish is in the top 10: {found}/{len(typos)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+# File: backend/bench/bench_serving.py
+"""Load-test the Flask and ASGI entry points: requests/sec and latency percentiles.
+
+A stdlib asyncio client keeps ``--connections`` HTTP/1.1 keep-alive
+connections busy for ``--seconds`` per server, replaying recommend
+bodies drawn from the loaded table. A server that closes the connection
+after a response is reconnected, so the reconnects are part of its time.
+
+By default both servers are started here on free ports: Flask on its
+threaded development server (which closes every connection after one
+response), ASGI as a single uvicorn worker. Pass --flask-url/--asgi-url
+to test servers that are already running instead, e.g. Flask under gunicorn.
+
+Run from the backend directory:  python -m bench.bench_serving [--seconds 10] [--connections 32]
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from bench.common import base_menu, random_queries, summarize
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FLASK_SERVER = "import app; app.app.run(port={port}, threaded=True)"
+STARTUP_TIMEOUT = 120.0
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(kind: str, port: int) -> subprocess.Popen:
+    if kind == 'flask':
+        command = [sys.executable, '-c', FLASK_SERVER.format(port=port)]
+    else:
+        command = [sys.executable, '-m', 'uvicorn', 'asgi:app', '--port', str(port), '--workers', '1',
+                   '--log-level', 'warning', '--no-access-log']
+    env = dict(os.environ, DATA_WATCH_INTERVAL='0')
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_until_up(url: str, process: Optional[subprocess.Popen]) -> None:
+    parts = urlsplit(url)
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"server for {url} exited with code {process.returncode}")
+        try:
+            socket.create_connection((parts.hostname, parts.port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.25)
+    raise RuntimeError(f"server for {url} did not start within {STARTUP_TIMEOUT:.0f} s")
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection, reopened when the server closes it."""
+
+    def __init__(self, host: str, port: int):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+        self.reconnects = 0
+
+    async def _open(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.reconnects += 1
+
+    async def post(self, path: str, body: bytes) -> int:
+        """Send one POST and read the whole response; return its status."""
+        if self.writer is None:
+            await self._open()
+        head = (f"POST {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n").encode()
+        self.writer.write(head + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            # The server closed an idle connection; retry once on a fresh one.
+            self.close()
+            return await self.post(path, body)
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        if 'content-length' in headers:
+            await self.reader.readexactly(int(headers['content-length']))
+        elif headers.get('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        else:
+            await self.reader.read()
+            headers['connection'] = 'close'
+        if headers.get('connection', '').lower() == 'close':
+            self.close()
+        return int(status_line.split()[1])
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+async def run_load(url: str, bodies: List[bytes], connections: int, seconds: float) -> dict:
+    parts = urlsplit(url)
+    latencies, errors = [], 0
+    pool = [Connection(parts.hostname, parts.port) for _ in range(connections)]
+    deadline = time.perf_counter() + seconds
+
+    async def worker(connection: Connection, offset: int):
+        nonlocal errors
+        i = offset
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                status = await connection.post('/api/recommend', bodies[i % len(bodies)])
+            except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+                connection.close()
+                status = 0
+            latencies.append(time.perf_counter() - start)
+            errors += status != 200
+            i += connections
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(connection, n) for n, connection in enumerate(pool)))
+    elapsed = time.perf_counter() - start
+    for connection in pool:
+        connection.close()
+    return {'requests': len(latencies), 'rps': len(latencies) / elapsed, 'errors': errors,
+            'connections_opened': sum(connection.reconnects for connection in pool),
+            'latencies': np.array(latencies) * 1e6}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--connections', type=int, default=32)
+    parser.add_argument('--flask-url', help='test a running Flask server instead of starting one')
+    parser.add_argument('--asgi-url', help='test a running ASGI server instead of starting one')
+    parser.add_argument('--only', choices=('flask', 'asgi'), help='test one mode only')
+    args = parser.parse_args()
+
+    df = base_menu()
+    bodies = [json.dumps(query).encode() for query in random_queries(df, 500)]
+    urls = {'flask': args.flask_url, 'asgi': args.asgi_url}
+    for kind in ('flask', 'asgi'):
+        if args.only and kind != args.only:
+            continue
+        process = None
+        url = urls[kind]
+        if url is None:
+            url = f"http://127.0.0.1:{free_port()}"
+            process = start_server(kind, urlsplit(url).port)
+        try:
+            wait_until_up(url, process)
+            result = asyncio.run(run_load(url, bodies, args.connections, args.seconds))
+        except RuntimeError as e:
+            print(f"{kind:5}  skipped: {e}")
+            continue
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+        print(summarize(f"{kind}, {args.connections} connections", result['latencies']))
+        print(f"{kind:5}  {result['rps']:,.0f} requests/s, {result['requests']:,} requests, "
+              f"{result['errors']} errors, {result['connections_opened']} connections opened")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+# File: backend/bench/common.py
+"""Shared helpers for the benchmark scripts in this package."""
+import re
+import time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from area_classifier import AREA_MAP
+
+FOOD_TYPES = np.array(['Veg', 'Non-Veg', 'Egg'], dtype=object)
+CUISINES = [
+    'North Indian', 'Chinese', 'Fast Food', 'Beverages', 'South Indian', 'Maharashtrian', 'Biryani',
+    'Desserts', 'Street Food', 'Italian', 'Pizza', 'Cafe', 'Continental', 'Mughlai', 'Bakery',
+    'Burger', 'Rolls', 'Momos', 'Sandwich', 'Shake', 'Ice Cream', 'Asian', 'Seafood', 'Kebab',
+    'Healthy Food', 'Salad', 'Mithai', 'Thai', 'Mexican', 'Japanese', 'Sushi', 'Korean', 'Lebanese',
+    'Tea', 'Coffee', 'Juices', 'Pasta', 'Goan', 'Kerala', 'Bengali',
+]
+AREAS = sorted(set(AREA_MAP.values()))
+DISH_WORDS = [
+    'paneer', 'butter', 'masala', 'chicken', 'tikka', 'dal', 'makhani', 'veg', 'biryani', 'mutton',
+    'hyderabadi', 'dum', 'aloo', 'gobi', 'palak', 'kadai', 'tandoori', 'roti', 'naan', 'garlic',
+    'fried', 'rice', 'noodles', 'schezwan', 'manchurian', 'chilli', 'spring', 'roll', 'momos', 'soup',
+    'pizza', 'margherita', 'farmhouse', 'pasta', 'alfredo', 'arrabbiata', 'burger', 'cheese', 'fries',
+    'sandwich', 'club', 'grilled', 'cold', 'coffee', 'chai', 'lassi', 'mango', 'shake', 'brownie',
+    'sizzler', 'kulfi', 'gulab', 'jamun', 'misal', 'pav', 'vada', 'bhaji', 'thali', 'dosa', 'idli',
+]
+# 'Sushi' and 'Campus' hold area slugs ('sus', 'camp') inside longer words.
+NAME_WORDS = ['Spice', 'House', 'Garden', 'Kitchen', 'Cafe', 'Tandoor', 'Grill', 'Express', 'Corner',
+              'Bistro', 'Dhaba', 'Biryani', 'Delight', 'Junction', 'Bowl', 'Table', 'Point', 'Palace',
+              'Sushi', 'Campus']
+# Average dishes per restaurant, and distinct dish names per table (capped by the rows).
+MENU_SIZE = 80
+DISH_NAMES = 20_000
+VEG_ONLY_SHARE = 0.3
+# Median price of a restaurant tier and the spreads of tiers and of dishes within one.
+PRICE_MEDIAN, TIER_SIGMA, DISH_SIGMA = 220.0, 0.55, 0.45
+PRICE_RANGE = (20, 6000)
+# Shapes of the raw price, rating and rating-count text the scrapers write, and the share left empty.
+PRICE_SHAPES = ['₹{:,} for two', '{}', '₹{}', 'Rs. {}', '{}.5', '4.2 / ₹{}', '{}/-', '{} INR', 'Price: {}',
+                'approx {} per head']
+RATINGS = np.array(['4.2', '3.9', 'NEW', '4.5', '-'], dtype=object)
+RATING_COUNTS = np.array(['87', '1.2k', '3.4k ratings', '1,204', 'N/A', '450'], dtype=object)
+RAW_MISSING_SHARE = 0.03
+
+
+def zipf_weights(n: int, exponent: float = 1.1) -> np.ndarray:
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+def _slug(text: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def synthetic_menu(rows: int, seed: int = 0, dish_names: Optional[int] = None, unlisted_share: float = 0.0,
+                   raw: bool = False) -> pd.DataFrame:
+    """Return a menu table of ``rows`` dishes shaped like the scraped Pune data.
+
+    Rows are dishes of restaurants whose menu sizes, areas and cuisines
+    follow Zipf-like skews: a few areas and cuisines hold most restaurants,
+    and a few restaurants have very long menus. A share of restaurants is
+    pure veg. Prices are lognormal per restaurant tier and per dish,
+    rounded to five rupees. Dish names are drawn from ``dish_names``
+    distinct names (default DISH_NAMES) composed of DISH_WORDS.
+
+    Restaurant URLs carry an area slug the classifier knows, except for an
+    ``unlisted_share`` of restaurants. With ``raw``, Price is text in one
+    of PRICE_SHAPES, some of it missing, and Rating and Rating Count
+    columns of scraped text are added, as the scrapers write them.
+    """
+    rng = np.random.default_rng(seed)
+    n_restaurants = max(rows // MENU_SIZE, 10)
+
+    # Restaurants: skewed menu sizes, Zipf areas and primary cuisines, some pure veg.
+    menu_weights = rng.lognormal(0.0, 0.8, size=n_restaurants)
+    restaurant = rng.choice(n_restaurants, size=rows, p=menu_weights / menu_weights.sum())
+    area_of = rng.choice(len(AREAS), size=n_restaurants, p=zipf_weights(len(AREAS), 0.9))
+    cuisine_weights = zipf_weights(len(CUISINES))
+    primary_cuisine = rng.choice(len(CUISINES), size=n_restaurants, p=cuisine_weights)
+    veg_only = rng.random(n_restaurants) < VEG_ONLY_SHARE
+    tier = rng.lognormal(np.log(PRICE_MEDIAN), TIER_SIGMA, size=n_restaurants)
+
+    # Dishes: 60% in the restaurant's primary cuisine, the rest across all cuisines.
+    cuisine = np.where(rng.random(rows) < 0.6, primary_cuisine[restaurant],
+                       rng.choice(len(CUISINES), size=rows, p=cuisine_weights))
+    food_type = np.where(veg_only[restaurant], 0, rng.choice(3, size=rows, p=[0.5, 0.4, 0.1]))
+    price = tier[restaurant] * rng.lognormal(0.0, DISH_SIGMA, size=rows)
+    price = np.clip(np.round(price / 5) * 5, *PRICE_RANGE)
+
+    words = np.array(DISH_WORDS, dtype=object)
+    n_dishes = min(dish_names or DISH_NAMES, rows)
+    lengths = rng.integers(2, 4, size=n_dishes)
+    picks = rng.integers(0, len(words), size=(n_dishes, 3))
+    dishes = np.array([' '.join(words[p[:n]]).title() for p, n in zip(picks, lengths)], dtype=object)
+    dish = rng.choice(n_dishes, size=rows, p=zipf_weights(n_dishes, 0.8))
+
+    name_words = np.array(NAME_WORDS, dtype=object)
+    first = rng.integers(0, len(name_words), size=n_restaurants)
+    second = rng.integers(0, len(name_words), size=n_restaurants)
+    names = np.array([f"{name_words[a]} {name_words[b]} {i}" for i, (a, b) in enumerate(zip(first, second))],
+                     dtype=object)
+    # Each area is named in URLs by one of its slugs.
+    slugs_of = {area: [slug for slug, name in AREA_MAP.items() if name == area] for area in AREAS}
+    slug_picks = rng.random(n_restaurants)
+    unlisted = rng.random(n_restaurants) < unlisted_share
+    urls = np.array([
+        f"https://www.zomato.com/pune/{_slug(name)}/info" if hidden else
+        f"https://www.zomato.com/pune/{_slug(name)}-{slugs[int(pick * len(slugs))]}/order"
+        for name, slugs, pick, hidden in zip(names, (slugs_of[AREAS[a]] for a in area_of), slug_picks, unlisted)
+    ], dtype=object)
+    areas = np.array(AREAS, dtype=object)
+
+    df = pd.DataFrame({
+        'Restaurant_Name': names[restaurant],
+        'URL': urls[restaurant],
+        'Item_Name': dishes[dish],
+        'Price': price,
+        'Food Type': FOOD_TYPES[food_type],
+        'Cuisine': np.array(CUISINES, dtype=object)[cuisine],
+        'Area': areas[area_of[restaurant]],
+    })
+    if raw:
+        shapes = rng.integers(0, len(PRICE_SHAPES), size=rows)
+        text = [PRICE_SHAPES[s].format(int(p)) for s, p in zip(shapes, price)]
+        df['Price'] = np.where(rng.random(rows) < RAW_MISSING_SHARE, None, np.array(text, dtype=object))
+        df['Rating'] = RATINGS[rng.integers(0, len(RATINGS), size=rows)]
+        df['Rating Count'] = RATING_COUNTS[rng.integers(0, len(RATING_COUNTS), size=rows)]
+    return df
+
+
+def base_menu(fallback_rows: int = 5000) -> pd.DataFrame:
+    """Return the app's loaded table, or a synthetic one if no data file is present."""
+    import app
+    df = app.datasets.current.df
+    if not df.empty:
+        return df.reset_index(drop=True)
+    print(f"No menu data loaded; using {fallback_rows} synthetic rows as the base table.")
+    return synthetic_menu(fallback_rows)
+
+
+def scale(df: pd.DataFrame, factor: int) -> pd.DataFrame:
+    """Repeat ``df`` ``factor`` times."""
+    return pd.concat([df] * factor, ignore_index=True)
+
+
+def random_queries(df: pd.DataFrame, count: int, seed: int = 0):
+    """Yield request-shaped filter dicts drawn from the values present in ``df``."""
+    rng = np.random.default_rng(seed)
+    food_types = df['Food Type'].unique().tolist()
+    cuisines = df['Cuisine'].unique().tolist()
+    for _ in range(count):
+        low = float(rng.choice([0, 100, 200, 300]))
+        yield {
+            'foodTypes': list(rng.choice(food_types, size=rng.integers(0, 2), replace=False)),
+            'cuisines': list(rng.choice(cuisines, size=rng.integers(0, 4), replace=False)),
+            'minPrice': low,
+            'maxPrice': low + float(rng.choice([200, 500, 1000])),
+        }
+
+
+def time_calls(fn, args_list):
+    """Call ``fn(*args)`` for each entry and return the latencies in microseconds."""
+    latencies = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    return np.array(latencies)
+
+
+def summarize(label: str, latencies_us: np.ndarray) -> str:
+    p50, p99 = np.percentile(latencies_us, [50, 99])
+    return f"{label:<28} p50 {p50:10.1f} us   p99 {p99:10.1f} us"
@@ -0,0 +1,95 @@
+# File: backend/bench/fixtures.py
+"""Synthetic Zomato-style listing pages for running the scrapers offline."""
+import html
+import json
+import os
+import random
+from typing import Dict, List
+
+CUISINE_LINES = [
+    "North Indian, Chinese", "South Indian, Street Food", "Pizza, Italian, Fast Food",
+    "Biryani, Mughlai", "Cafe, Desserts, Beverages", "Maharashtrian, Thai",
+]
+
+
+def restaurant(i: int, area_slug: str, rng: random.Random) -> Dict:
+    name = f"{rng.choice(['Spice', 'Tandoor', 'Biryani', 'Cafe', 'Grill'])} House {i}"
+    area = area_slug.replace("-", " ").title()
+    return {
+        "name": name,
+        "url": f"https://www.zomato.com/pune/{name.lower().replace(' ', '-')}-{area_slug}/order",
+        "rating": f"{rng.uniform(3.0, 4.9):.1f}",
+        "count": rng.choice(["120", "1.2k", "3.4k", "87"]),
+        "cuisine": rng.choice(CUISINE_LINES),
+        "price": f"₹{rng.randrange(200, 2000, 50):,} for two",
+        "area": area,
+        "distance": f"{rng.uniform(0.3, 9.0):.1f} km",
+    }
+
+
+def card_html(r: Dict) -> str:
+    e = html.escape
+    return (
+        '<div data-testid="restaurant-card" class="sc-1mo3ldo-0">'
+        f'<a href="{e(r["url"])}"><h4>{e(r["name"])}</h4></a>'
+        f'<div><span>{r["rating"]}</span><span>{r["count"]} ratings</span></div>'
+        f'<p>{e(r["cuisine"])}</p><p>{e(r["price"])}</p>'
+        f'<p>{e(r["area"])}, Pune · {r["distance"]}</p><p>Delivery available</p>'
+        '</div>'
+    )
+
+
+def listing_html(restaurants: List[Dict]) -> str:
+    cards = "\n".join(card_html(r) for r in restaurants)
+    return f"<!doctype html><html><head><meta charset='utf-8'><title>Pune</title></head><body>{cards}</body></html>"
+
+
+def state_result(r: Dict) -> Dict:
+    """One search result as it appears in the page's embedded ``__PRELOADED_STATE__``."""
+    rating, votes = r["rating"], r["count"]
+    return {
+        "type": "restaurant",
+        "info": {
+            "name": r["name"],
+            "rating": {"aggregate_rating": rating, "votes": votes},
+            "cuisine": [{"name": name.strip()} for name in r["cuisine"].split(",")],
+            "cft": {"text": r["price"]},
+            "locality": {"name": r["area"]},
+        },
+        "order": {"actionInfo": {"clickUrl": r["url"].replace("https://www.zomato.com", "")}},
+        "distance": r["distance"],
+        "isDeliveryAvailable": True,
+    }
+
+
+def listing_state_html(restaurants: List[Dict]) -> str:
+    """A client-rendered page: no cards in the markup, results only in the embedded state."""
+    state = {"pages": {"search": {"sections": {"SECTION_SEARCH_RESULT": [state_result(r) for r in restaurants]}}}}
+    literal = json.dumps(json.dumps(state)).replace("</", "<\\/")
+    return ("<!doctype html><html><head><meta charset='utf-8'><title>Pune</title></head><body>"
+            f"<div id='root'></div><script>window.__PRELOADED_STATE__ = JSON.parse({literal});</script>"
+            "</body></html>")
+
+
+def write_listing_fixtures(directory: str, area_slugs: List[str], per_area: int = 40,
+                           overlap: int = 5, seed: int = 0, state_every: int = 0) -> int:
+    """Write ``<slug>.html`` per area; neighbouring pages share ``overlap`` restaurants.
+
+    With ``state_every`` every n-th page carries its results only as
+    embedded JSON state. Returns the number of distinct restaurants across
+    all pages.
+    """
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    pages = []
+    next_id = 0
+    for slug in area_slugs:
+        page = [restaurant(next_id + j, slug, rng) for j in range(per_area)]
+        next_id += per_area
+        pages.append(page)
+    for i, page in enumerate(pages):
+        shared = pages[i - 1][:overlap] if i else []
+        with open(os.path.join(directory, f"{area_slugs[i]}.html"), "w", encoding="utf-8") as f:
+            render = listing_state_html if state_every and i % state_every == state_every - 1 else listing_html
+            f.write(render(page + shared))
+    return next_id
@@ -0,0 +1,41 @@
+# File: backend/bench/generate.py
+"""Write synthetic menu tables (bench.common.synthetic_menu) to CSV, at any size.
+
+The columns are those of Zomato_Menu_Classified_with_Area.csv. Everything
+is built with numpy, so 10M rows take seconds, plus the time to write the CSV.
+
+Run from the backend directory:  python -m bench.generate 1000000 menu_1m.csv [--seed 0]
+"""
+import argparse
+import os
+
+from bench.common import synthetic_menu
+
+
+def ensure_menu_csv(rows: int, directory: str, seed: int = 0) -> str:
+    """Path of the generated ``rows``-row CSV in ``directory``, writing it on first use."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"menu_{rows}_{seed}.csv")
+    if not os.path.exists(path):
+        partial = path + '.partial'
+        synthetic_menu(rows, seed).to_csv(partial, index=False)
+        os.replace(partial, path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('rows', type=int)
+    parser.add_argument('output')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    df = synthetic_menu(args.rows, args.seed)
+    df.to_csv(args.output, index=False)
+    print(f"{len(df):,} rows, {df['Restaurant_Name'].nunique():,} restaurants, "
+          f"{df['Item_Name'].nunique():,} dishes, {df['Cuisine'].nunique()} cuisines, "
+          f"{df['Area'].nunique()} areas; price median {df['Price'].median():.0f}, "
+          f"p99 {df['Price'].quantile(0.99):.0f}, max {df['Price'].max():.0f} -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+# File: backend/bench/suite.py
+"""Benchmark suite for the recommend path at several table sizes, with a regression check.
+
+For each size, a generated table (bench/generate.py, cached on disk) is
+loaded cold --load-repeats times from the CSV, then as often from a
+freshly compiled snapshot; the median of each is reported. The loaded dataset is then installed in the Flask app, and these
+scenarios go through Flask's test client:
+
+    filter_heavy  several cuisines, areas and food types in a narrow price band
+    broad         no filters or one wide price range
+    batch         /api/recommend/batch with BATCH_SIZE queries per request
+
+Results are written as JSON. With a baseline (by default bench/baseline.json),
+every latency and load time is compared against it, and the run exits
+with status 1 when one is more than --tolerance slower (--load-tolerance
+for load times), and slower by more than a noise floor in milliseconds.
+
+Run from the backend directory:
+    python -m bench.suite [--sizes 10k 100k 1m] [--output results.json]
+    python -m bench.suite --sizes 10k 100k --save-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# The suite swaps datasets itself; keep the app from watching its own files.
+os.environ.setdefault('DATA_WATCH_INTERVAL', '0')
+
+from bench.generate import ensure_menu_csv
+from dataset import DatasetManager
+from menu_loader import load_menu_csv, snapshot_path_for
+from metrics import METRICS
+from snapshot import file_sha256, write_snapshot
+
+SIZES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000, '10m': 10_000_000}
+DEFAULT_SIZES = ('10k', '100k', '1m')
+SCENARIOS = ('filter_heavy', 'broad', 'batch')
+BATCH_SIZE = 20
+DEFAULT_REQUESTS = 500
+DEFAULT_TOLERANCE = 0.25
+# Differences below this many milliseconds are noise, whatever the ratio.
+NOISE_FLOOR_MS = 0.05
+# Load times swing with disk and allocator state far more than request latencies do.
+DEFAULT_LOAD_REPEATS = 3
+DEFAULT_LOAD_TOLERANCE = 0.5
+LOAD_NOISE_FLOOR_MS = 50.0
+LOADS = ('cold_load_csv', 'cold_load_snapshot')
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+DEFAULT_DATA_DIR = os.path.join(tempfile.gettempdir(), 'menu-bench')
+
+
+def filter_heavy_queries(df: pd.DataFrame, count: int, rng) -> list:
+    cuisines = df['Cuisine'].unique().tolist()
+    areas = df['Area'].unique().tolist()
+    food_types = df['Food Type'].unique().tolist()
+    queries = []
+    for _ in range(count):
+        low = float(rng.choice([50, 100, 150, 200, 300, 500]))
+        queries.append({
+            'foodTypes': rng.choice(food_types, size=rng.integers(1, 3), replace=False).tolist(),
+            'cuisines': rng.choice(cuisines, size=rng.integers(3, 7), replace=False).tolist(),
+            'areas': rng.choice(areas, size=rng.integers(2, 5), replace=False).tolist(),
+            'minPrice': low,
+            'maxPrice': low + float(rng.choice([50, 100, 200])),
+        })
+    return queries
+
+
+def broad_queries(count: int, rng) -> list:
+    shapes = [{}, {'minPrice': 0, 'maxPrice': 10_000}, {'foodTypes': ['Veg', 'Non-Veg', 'Egg']}]
+    return [dict(shapes[i % len(shapes)], seed=int(rng.integers(1 << 31))) for i in range(count)]
+
+
+def latency_summary(latencies: np.ndarray) -> dict:
+    p50, p95, p99 = np.percentile(latencies * 1000, [50, 95, 99])
+    return {'p50_ms': round(float(p50), 4), 'p95_ms': round(float(p95), 4), 'p99_ms': round(float(p99), 4),
+            'mean_ms': round(float(latencies.mean() * 1000), 4),
+            'requests_per_s': round(float(len(latencies) / latencies.sum()), 1)}
+
+
+def run_requests(client, path: str, bodies: list) -> np.ndarray:
+    latencies = np.empty(len(bodies))
+    for i, body in enumerate(bodies):
+        start = time.perf_counter()
+        response = client.post(path, json=body)
+        latencies[i] = time.perf_counter() - start
+        if response.status_code != 200:
+            raise RuntimeError(f"{path} answered {response.status_code}: {response.get_data(as_text=True)[:200]}")
+    return latencies
+
+
+def cold_load(path: str, repeats: int) -> tuple:
+    """Load ``path`` ``repeats`` times from the CSV, then from a snapshot; return the last manager and timings.
+
+    Each load's time is reported under ``runs``; ``seconds`` is their
+    median, and ``phases`` are those of the median run.
+    """
+    snapshot = snapshot_path_for(path)
+    timings = {}
+    for source in ('csv', 'snapshot'):
+        runs = []
+        for _ in range(repeats):
+            if source == 'csv' and os.path.exists(snapshot):
+                os.remove(snapshot)
+            manager = DatasetManager(path)
+            start = time.perf_counter()
+            manager.load()
+            runs.append((time.perf_counter() - start, dict(METRICS.load_phases)))
+        if source == 'csv':
+            write_snapshot(load_menu_csv(path), snapshot, file_sha256(path))
+        seconds = statistics.median(seconds for seconds, _ in runs)
+        _, phases = min(runs, key=lambda run: abs(run[0] - seconds))
+        timings[f'cold_load_{source}'] = {
+            'seconds': round(seconds, 4),
+            'runs': [round(seconds, 4) for seconds, _ in runs],
+            'phases': {phase: round(value, 4) for phase, value in phases.items()},
+        }
+    return manager, timings
+
+
+def run_size(label: str, rows: int, args) -> dict:
+    import app
+
+    path = ensure_menu_csv(rows, args.data_dir, args.seed)
+    manager, results = cold_load(path, args.load_repeats)
+    app.datasets = manager
+    df = manager.current.df
+    client = app.app.test_client()
+    rng = np.random.default_rng(args.seed)
+
+    bodies = {
+        'filter_heavy': filter_heavy_queries(df, args.requests, rng),
+        'broad': broad_queries(args.requests, rng),
+        'batch': [{'queries': filter_heavy_queries(df, BATCH_SIZE, rng), 'seed': i}
+                  for i in range(max(args.requests // BATCH_SIZE, 10))],
+    }
+    for scenario in SCENARIOS:
+        path = '/api/recommend/batch' if scenario == 'batch' else '/api/recommend'
+        run_requests(client, path, bodies[scenario][:args.warmup])
+        results[scenario] = latency_summary(run_requests(client, path, bodies[scenario]))
+    results['filter_cache'] = manager.current.filter_cache.stats()
+    results['rows_loaded'] = len(df)
+    print_size(label, results)
+    return results
+
+
+def print_size(label: str, results: dict) -> None:
+    for key in LOADS:
+        runs = ', '.join(f"{seconds:.3f}" for seconds in results[key]['runs'])
+        print(f"{label:>5}  {key:<20} {results[key]['seconds']:10.3f} s  (median of {runs})")
+    for scenario in SCENARIOS:
+        r = results[scenario]
+        print(f"{label:>5}  {scenario:<20} p50 {r['p50_ms']:8.3f} ms  p99 {r['p99_ms']:8.3f} ms  "
+              f"{r['requests_per_s']:10,.0f} req/s")
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=BENCH_DIR, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+            'platform': platform.platform(), 'cpus': os.cpu_count(), 'commit': commit,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+
+def compared_metrics(results: dict):
+    """Yield ``(size, name, value_ms)`` for every metric the regression check covers."""
+    for size, scenarios in results.items():
+        for key in LOADS:
+            if key in scenarios:
+                yield size, key, scenarios[key]['seconds'] * 1000
+        for scenario in SCENARIOS:
+            if scenario in scenarios:
+                yield size, f'{scenario}.p50', scenarios[scenario]['p50_ms']
+                yield size, f'{scenario}.p99', scenarios[scenario]['p99_ms']
+
+
+def compare(results: dict, baseline: dict, tolerance: float, load_tolerance: float = DEFAULT_LOAD_TOLERANCE) -> list:
+    """Print current vs baseline for the metrics both have; return the regressions."""
+    old = {(size, name): value for size, name, value in compared_metrics(baseline['results'])}
+    regressions = []
+    print(f"\nAgainst baseline from {baseline['environment'].get('timestamp')} "
+          f"(commit {baseline['environment'].get('commit')}), tolerance {tolerance:.0%}, "
+          f"{load_tolerance:.0%} for loads:")
+    for size, name, value in compared_metrics(results):
+        if (size, name) not in old:
+            continue
+        before = old[(size, name)]
+        ratio = value / before if before else float('inf')
+        limit, floor = (load_tolerance, LOAD_NOISE_FLOOR_MS) if name in LOADS else (tolerance, NOISE_FLOOR_MS)
+        regressed = ratio > 1 + limit and value - before > floor
+        flag = 'REGRESSION' if regressed else ''
+        print(f"{size:>5}  {name:<20} {before:12.3f} -> {value:12.3f} ms  x{ratio:5.2f}  {flag}")
+        if regressed:
+            regressions.append({'size': size, 'metric': name, 'baseline_ms': before, 'current_ms': value})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', choices=SIZES, default=list(DEFAULT_SIZES))
+    parser.add_argument('--requests', type=int, default=DEFAULT_REQUESTS, help='requests per scenario')
+    parser.add_argument('--warmup', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help='where generated tables are cached')
+    parser.add_argument('--output', help='write the results as JSON here')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the baseline')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--load-repeats', type=int, default=DEFAULT_LOAD_REPEATS, help='cold loads per source')
+    parser.add_argument('--load-tolerance', type=float, default=DEFAULT_LOAD_TOLERANCE)
+    args = parser.parse_args()
+
+    report = {'environment': environment(),
+              'config': {'requests': args.requests, 'seed': args.seed, 'batch_size': BATCH_SIZE,
+                         'load_repeats': args.load_repeats},
+              'results': {label: run_size(label, SIZES[label], args) for label in args.sizes}}
+
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            report['regressions'] = compare(report['results'], json.load(f), args.tolerance, args.load_tolerance)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+    if report.get('regressions'):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
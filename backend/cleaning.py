@@ -0,0 +1,177 @@
+# File: backend/cleaning.py
+"""Vectorised parsing of scraped price, rating and rating-count text into numbers.
+
+Each field has one regular expression whose named groups are the parse
+rules, tried in one pass: the group that matched names the rule that
+accepted a value. Values no rule accepts are rejected with a reason
+(``missing``, ``unparseable`` or ``out_of_range``), and every column's
+accept/reject counts are collected in a ``CleaningReport``. Columns are
+factorised first, so each distinct string is parsed once however often it
+repeats.
+
+Clean a scraped file from the command line with:
+    python cleaning.py pune_zomato_restaurants_updated.csv cleaned.csv
+"""
+import re
+import sys
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+MISSING_TOKENS = {'', 'n/a', 'na', 'nan', 'none', 'null', '-', '--'}
+MULTIPLIERS = {'k': 1e3, 'm': 1e6}
+
+# "₹2,000 for two", "Rs. 450", "4.2 / ₹300" (the first amount after a
+# currency sign wins), "250/-", "250 INR", "Price: 250" or a bare number
+# such as "1,200" or "747.5". Text none of these match falls back to its
+# first number (FIRST_NUMBER_PATTERN).
+AMOUNT = r'\d[\d,]*(?:\.\d+)?'
+PRICE_PATTERN = re.compile(
+    rf'(?:₹|\brs\.?|\binr\b)\s*(?P<currency>{AMOUNT})'
+    rf'|(?P<suffixed>{AMOUNT})\s*(?:/-|inr\b|rs\b\.?)'
+    rf'|^price\s*[:=-]?\s*(?P<labelled>{AMOUNT})'
+    rf'|^(?P<plain>{AMOUNT})$',
+    re.IGNORECASE)
+FIRST_NUMBER_PATTERN = re.compile(rf'(?P<first_number>{AMOUNT})')
+PRICE_RULES = ('currency', 'suffixed', 'labelled', 'plain')
+# "4.2", "4", "4.2/5"
+RATING_PATTERN = re.compile(r'^(?P<score>\d(?:\.\d+)?)\s*(?:/\s*5)?$')
+RATING_RANGE = (0.0, 5.0)
+# "87", "1,204 ratings", "1.2k", "(3.4K+ reviews)"
+COUNT_PATTERN = re.compile(
+    r'^\(?(?:(?P<suffixed>\d+(?:\.\d+)?)\s*(?P<unit>[km])|(?P<plain>\d[\d,]*))\+?'
+    r'\s*(?:ratings?|reviews?|votes?)?\)?$',
+    re.IGNORECASE)
+
+# Column -> field kind, for the columns the scrapers and the menu CSV carry.
+CLEAN_COLUMNS = {'Price': 'price', 'Rating': 'rating', 'Rating Count': 'count'}
+REJECTIONS = ('missing', 'unparseable', 'out_of_range')
+
+
+def _parse_price(text: pd.Series) -> Tuple[np.ndarray, pd.Series]:
+    parts = text.str.extract(PRICE_PATTERN)
+    amount = parts['currency'].fillna(parts['suffixed']).fillna(parts['labelled']).fillna(parts['plain'])
+    rules = pd.Series(np.select([parts[rule].notna() for rule in PRICE_RULES], PRICE_RULES, 'unparseable'),
+                      index=text.index, dtype=object)
+    fallback = amount.isna()
+    if fallback.any():
+        first = text[fallback].str.extract(FIRST_NUMBER_PATTERN)['first_number']
+        amount = amount.fillna(first)
+        rules[fallback & amount.notna()] = 'first_number'
+    values = pd.to_numeric(amount.str.replace(',', '', regex=False), errors='coerce')
+    return values.to_numpy(dtype=np.float64, copy=True), rules
+
+
+def _parse_rating(text: pd.Series) -> Tuple[np.ndarray, pd.Series]:
+    score = text.str.extract(RATING_PATTERN)['score']
+    values = pd.to_numeric(score, errors='coerce').to_numpy(dtype=np.float64, copy=True)
+    low, high = RATING_RANGE
+    in_range = (values >= low) & (values <= high)
+    rules = pd.Series(np.where(score.isna(), 'unparseable', np.where(in_range, 'score', 'out_of_range')),
+                      index=text.index)
+    values[~in_range] = np.nan
+    return values, rules
+
+
+def _parse_count(text: pd.Series) -> Tuple[np.ndarray, pd.Series]:
+    parts = text.str.extract(COUNT_PATTERN)
+    plain = pd.to_numeric(parts['plain'].str.replace(',', '', regex=False), errors='coerce')
+    unit = parts['unit'].str.lower().map(MULTIPLIERS)
+    suffixed = (pd.to_numeric(parts['suffixed'], errors='coerce') * unit).round()
+    values = plain.fillna(suffixed).to_numpy(dtype=np.float64, copy=True)
+    rules = pd.Series(np.where(parts['suffixed'].notna(), 'suffixed',
+                               np.where(parts['plain'].notna(), 'plain', 'unparseable')), index=text.index)
+    return values, rules
+
+
+PARSERS = {'price': _parse_price, 'rating': _parse_rating, 'count': _parse_count}
+
+
+def parse_column(series: pd.Series, kind: str) -> Tuple[pd.Series, Dict[str, int]]:
+    """Parse ``series`` as a ``kind`` field (see ``PARSERS``).
+
+    Returns the float64 values (NaN where rejected) and the number of rows
+    each rule accepted or each rejection reason turned down.
+    """
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        values = series.astype(np.float64)
+        counts = {'missing': int(values.isna().sum())}
+        if kind == 'rating':
+            out_of_range = ~values.between(*RATING_RANGE) & values.notna()
+            counts['out_of_range'] = int(out_of_range.sum())
+            values = values.mask(out_of_range)
+        counts['numeric'] = len(values) - sum(counts.values())
+        return values, {label: n for label, n in counts.items() if n}
+
+    codes, uniques = pd.factorize(series)
+    text = pd.Series(uniques, dtype=object).astype(str).str.strip()
+    values, rules = PARSERS[kind](text)
+    rules[text.str.lower().isin(MISSING_TOKENS)] = 'missing'
+    values[(rules == 'missing').to_numpy()] = np.nan
+
+    # Rows missing outright factorise to -1, which picks the trailing slot.
+    values = np.append(values, np.nan)[codes]
+    labels, label_of_unique = np.unique(np.append(rules.to_numpy(dtype=object), 'missing').astype(str),
+                                        return_inverse=True)
+    row_counts = np.bincount(label_of_unique.reshape(-1)[codes], minlength=len(labels))
+    counts = {label: int(n) for label, n in zip(labels, row_counts) if n}
+    return pd.Series(values, index=series.index, name=series.name), counts
+
+
+class CleaningReport:
+    """Per-column counts of the rows each parse rule accepted or rejected."""
+
+    def __init__(self):
+        self.counts: Dict[str, Dict[str, int]] = {}
+
+    def accepted(self, column: str) -> int:
+        return sum(n for label, n in self.counts.get(column, {}).items() if label not in REJECTIONS)
+
+    def rejected(self, column: str) -> Dict[str, int]:
+        return {label: n for label, n in self.counts.get(column, {}).items() if label in REJECTIONS}
+
+    def lines(self):
+        for column, counts in self.counts.items():
+            rules = ', '.join(f"{label} {n:,}" for label, n in counts.items() if label not in REJECTIONS)
+            rejected = ', '.join(f"{label} {n:,}" for label, n in self.rejected(column).items()) or 'none'
+            yield f"{column}: {self.accepted(column):,} parsed ({rules or 'no rule matched'}); rejected: {rejected}"
+
+    def as_dict(self) -> Dict[str, Dict[str, int]]:
+        return {column: dict(counts) for column, counts in self.counts.items()}
+
+
+def clean_frame(df: pd.DataFrame, columns: Optional[Dict[str, str]] = None) -> Tuple[pd.DataFrame, CleaningReport]:
+    """Return ``df`` with each column in ``columns`` (default ``CLEAN_COLUMNS``) parsed to numbers.
+
+    Columns not present are skipped. Rows are never dropped here; rejected
+    values become NaN, and callers decide which columns a row needs.
+    Rating counts come back as nullable integers.
+    """
+    report = CleaningReport()
+    parsed = {}
+    for column, kind in (columns or CLEAN_COLUMNS).items():
+        if column not in df.columns:
+            continue
+        values, report.counts[column] = parse_column(df[column], kind)
+        # A numeric count column may hold fractions ("12.5"); Int64 only takes whole numbers.
+        parsed[column] = values.round().astype('Int64') if kind == 'count' else values
+    return df.assign(**parsed) if parsed else df, report
+
+
+def clean_file(source: str, target: str) -> CleaningReport:
+    """Clean a scraped .csv or .jsonl file into the CSV ``target``."""
+    if source.endswith('.jsonl'):
+        raw = pd.read_json(source, lines=True, dtype=False)
+    else:
+        raw = pd.read_csv(source, dtype=str, keep_default_na=False)
+    cleaned, report = clean_frame(raw)
+    cleaned.to_csv(target, index=False)
+    return report
+
+
+if __name__ == '__main__':
+    cleaning_report = clean_file(sys.argv[1], sys.argv[2])
+    for line in cleaning_report.lines():
+        print(f"--- LOG: {line}")
+    print(f"--- LOG: Wrote cleaned rows to {sys.argv[2]}")
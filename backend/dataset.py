@@ -0,0 +1,207 @@
+# File: backend/dataset.py
+"""Hot-reloadable menu data: the table and its derived indexes as one swappable unit.
+
+A ``Dataset`` holds one loaded table with everything built from it, and
+is never changed after construction. ``DatasetManager.current`` points at
+the live one. A reload builds a complete new ``Dataset`` in a background
+thread and then replaces that pointer in one assignment. A request that
+read ``current`` once keeps a consistent table and indexes until it
+finishes, even if a swap happens meanwhile.
+"""
+import os
+import threading
+import time
+from typing import Optional
+
+import pandas as pd
+
+from aggregates import MenuAggregates
+from facets import MenuFacets
+from filter_cache import FilterCache
+from menu_index import FILTER_COLUMNS, OPTIONAL_FILTER_COLUMNS, MenuIndex
+from menu_loader import DATA_FILE_NAME, RATINGS_FILE_NAME, load_menu, load_restaurant_ratings, snapshot_path_for
+from metrics import METRICS, Spans
+from ranking import MenuRanker
+from search_index import MenuSearch
+
+# Seconds between checks of the data files for a new snapshot; 0 disables watching.
+WATCH_INTERVAL_ENV_VAR = 'DATA_WATCH_INTERVAL'
+DEFAULT_WATCH_INTERVAL = 10.0
+# Directory holding the data files, when not the backend directory.
+DATA_DIR_ENV_VAR = 'MENU_DATA_DIR'
+
+
+class Dataset:
+    """One version of the menu table with its index, facets, ranker, search index, aggregates and caches.
+
+    An empty ``df`` (the data failed to load) leaves the derived objects as None.
+    ``previous`` is the dataset this one replaces; its aggregates are reused
+    for restaurants whose rows did not change.
+    """
+
+    def __init__(self, df: pd.DataFrame, version: Optional[str], ratings: Optional[pd.DataFrame] = None,
+                 spans: Optional[Spans] = None, previous: Optional['Dataset'] = None):
+        spans = spans if spans is not None else Spans('load')
+        self.df = df
+        self.version = version
+        self.loaded_at = time.time()
+        # Filtering goes through this index instead of scanning a copy of df per request.
+        index_columns = FILTER_COLUMNS + tuple(column for column in OPTIONAL_FILTER_COLUMNS if column in df.columns)
+        self.index = MenuIndex(df, columns=index_columns, version=version) if not df.empty else None
+        spans.mark('index')
+        self.facets = MenuFacets(df, self.index) if self.index is not None else None
+        spans.mark('facets')
+        # Ranked mode: per-row quality precomputed here, alias tables cached per filter.
+        self.ranker = MenuRanker(df, self.index, ratings) if self.index is not None else None
+        spans.mark('ranker')
+        # Word-prefix and typo-tolerant name index for /api/search.
+        self.search = MenuSearch(df, self.index) if self.index is not None else None
+        spans.mark('search_index')
+        # Per-restaurant, per-area and per-(area, cuisine) tables for /api/restaurants and /api/areas.
+        previous_aggregates = previous.aggregates if previous is not None else None
+        self.aggregates = MenuAggregates(df, previous_aggregates) if self.index is not None else None
+        spans.mark('aggregates')
+        # Per-version caches, so requests still on an old version never evict the new one's entries.
+        self.filter_cache = FilterCache(max_entries=int(os.environ.get('FILTER_CACHE_SIZE', 256)))
+        self.ranked_cache = FilterCache(max_entries=int(os.environ.get('RANKED_CACHE_SIZE', 64)))
+
+    @property
+    def empty(self) -> bool:
+        return self.df.empty
+
+    def describe(self) -> dict:
+        return {'version': self.version, 'rows': len(self.df), 'loaded_at': self.loaded_at}
+
+
+def _signature(path: str):
+    """Cheap change marker for ``path``: ``(mtime_ns, size)``, or None if it is absent."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class DatasetManager:
+    """Owns the live ``Dataset`` and replaces it when the data files change.
+
+    Changes are noticed by polling the CSV's and the snapshot's mtime and
+    size (``start_watching``) or requested directly (``reload``). Either
+    way, the new table is loaded and indexed in a background thread. A
+    table with the same content hash as the live one is not swapped in,
+    and a failed load leaves the live dataset in place.
+    """
+
+    def __init__(self, data_path: str, ratings_path: Optional[str] = None):
+        self.data_path = data_path
+        self.ratings_path = ratings_path
+        self.current = Dataset(pd.DataFrame(), None)
+        self.swaps = 0
+        self.failures = 0
+        self.last_error = None
+        self._signatures = None
+        self._lock = threading.Lock()
+        self._loader = None
+        self._reload_delegate = None
+        self._watcher = None
+        self._stop = threading.Event()
+
+    def _watched_signatures(self) -> tuple:
+        return _signature(self.data_path), _signature(snapshot_path_for(self.data_path))
+
+    def load(self) -> Dataset:
+        """Load and index the data files and swap the result in if its version is new."""
+        signatures = self._watched_signatures()
+        spans = Spans('load')
+        try:
+            df, version = load_menu(self.data_path, spans)
+            print(f"--- LOG: FINAL DATA READY with {len(df)} rows.")
+            if version is not None and version == self.current.version:
+                print(f"--- LOG: Data version {version[:12]} is already live; nothing to swap.")
+                self._signatures = signatures
+                return self.current
+            ratings = load_restaurant_ratings(self.ratings_path) if self.ratings_path else None
+            spans.mark('ratings')
+            dataset = Dataset(df, version, ratings, spans, previous=self.current)
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            print(f"--- LOG: FATAL ERROR - An exception occurred during data loading: {e}")
+            self._signatures = signatures
+            return self.current
+        # The swap: one reference assignment, so readers see the old or the new dataset, never a mix.
+        self.current = dataset
+        METRICS.record_load(spans)
+        self._signatures = signatures
+        self.swaps += 1
+        self.last_error = None
+        print(f"--- LOG: Data version {str(version)[:12]} live with {len(df)} rows, "
+              f"built in {spans.total() * 1000:.1f} ms")
+        return dataset
+
+    def reload(self) -> bool:
+        """Start a background load unless one is already running; return whether one started."""
+        if self._reload_delegate is not None:
+            return self._reload_delegate()
+        with self._lock:
+            if self.loading:
+                return False
+            self._loader = threading.Thread(target=self.load, name='dataset-reload', daemon=True)
+            self._loader.start()
+            return True
+
+    def delegate_reloads(self, request_reload) -> None:
+        """Hand reload requests to ``request_reload`` instead of loading in this process.
+
+        A forked worker uses this to leave loading to its parent (see prefork.py).
+        """
+        self._reload_delegate = request_reload
+
+    @property
+    def loading(self) -> bool:
+        return self._loader is not None and self._loader.is_alive()
+
+    def changed(self) -> bool:
+        """Whether the data files differ from the ones last loaded."""
+        return self._watched_signatures() != self._signatures
+
+    def start_watching(self, interval: Optional[float] = None) -> None:
+        """Poll the data files every ``interval`` seconds and reload when they change."""
+        if interval is None:
+            interval = watch_interval()
+        if interval <= 0 or self._watcher is not None:
+            return
+
+        def watch():
+            while not self._stop.wait(interval):
+                if not self.loading and self.changed():
+                    print(f"--- LOG: Change detected in {self.data_path}; reloading.")
+                    self.reload()
+
+        self._watcher = threading.Thread(target=watch, name='dataset-watch', daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        self._stop.set()
+
+    def status(self) -> dict:
+        return dict(self.current.describe(), loading=self.loading, swaps=self.swaps,
+                    failures=self.failures, last_error=self.last_error)
+
+
+def watch_interval() -> float:
+    """Seconds between checks of the data files, from $DATA_WATCH_INTERVAL; 0 or less turns watching off."""
+    return float(os.environ.get(WATCH_INTERVAL_ENV_VAR, DEFAULT_WATCH_INTERVAL))
+
+
+def open_datasets(directory: Optional[str] = None, watch: bool = True) -> DatasetManager:
+    """Load the menu and ratings files in ``directory`` and watch them.
+
+    ``directory`` defaults to $MENU_DATA_DIR, then to the backend directory.
+    """
+    directory = directory or os.environ.get(DATA_DIR_ENV_VAR) or os.path.dirname(os.path.abspath(__file__))
+    manager = DatasetManager(os.path.join(directory, DATA_FILE_NAME), os.path.join(directory, RATINGS_FILE_NAME))
+    manager.load()
+    if watch:
+        manager.start_watching()
+    return manager
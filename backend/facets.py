@@ -0,0 +1,72 @@
+# File: backend/facets.py
+"""Facet counts and price statistics for the filter UI, precomputed at load time."""
+import json
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+from menu_index import FILTER_PARAMS, MenuIndex
+
+
+def _price_stats(prices: pd.Series) -> dict:
+    if prices.empty:
+        return {'min': None, 'median': None, 'max': None}
+    return {'min': float(prices.min()), 'median': float(prices.median()), 'max': float(prices.max())}
+
+
+class MenuFacets:
+    """Per-value counts and price statistics for each facet column.
+
+    Everything unconditional is computed once from ``df``; the unfiltered
+    response is even kept pre-serialised. Conditional counts are summed
+    from the index's per-cell match counts, so a filtered request costs a
+    few array operations over the cells, not a pass over the rows.
+    """
+
+    def __init__(self, df: pd.DataFrame, index: MenuIndex):
+        self.index = index
+        self.params = {param: column for param, column in FILTER_PARAMS.items() if column in index.columns}
+        self.values: Dict[str, list] = {}
+        self.facets: Dict[str, list] = {}
+        has_price = index.has_price
+        for param, column in self.params.items():
+            by_code = sorted(index.codes[column].items(), key=lambda item: item[1])
+            self.values[column] = [value for value, _ in by_code]
+            entries = []
+            groups = df.groupby(column, observed=True, sort=False)
+            sizes = groups.size()
+            for value in self.values[column]:
+                entry = {'value': value, 'count': int(sizes.get(value, 0))}
+                if has_price:
+                    stats = _price_stats(groups.get_group(value)['Price'])
+                    entry.update(minPrice=stats['min'], medianPrice=stats['median'], maxPrice=stats['max'])
+                entries.append(entry)
+            entries.sort(key=lambda entry: -entry['count'])
+            self.facets[param] = entries
+
+        self.summary = {'total': len(df)}
+        if has_price:
+            self.summary['price'] = _price_stats(df['Price'])
+        self.unfiltered_json = json.dumps(dict(self.summary, facets=self.facets))
+
+    def conditional(self, filters: Dict[str, Sequence], min_price=None, max_price=None) -> dict:
+        """Return facet counts under ``filters`` (table column -> wanted values).
+
+        Each facet's counts apply every filter except the facet's own, so the
+        UI can show how many dishes each further choice would add. Price
+        statistics per value stay those of the whole table.
+        """
+        _, counts = self.index.cell_counts(filters, min_price, max_price)
+        result = {'total': int(counts.sum()), 'facets': {}}
+        for param, column in self.params.items():
+            others = {other: wanted for other, wanted in filters.items() if other != column}
+            cells, counts = self.index.cell_counts(others, min_price, max_price)
+            codes = self.index.cell_codes[cells, self.index.columns.index(column)]
+            known = codes >= 0
+            per_code = np.bincount(codes[known], weights=counts[known], minlength=len(self.values[column]))
+            result['facets'][param] = [
+                dict(entry, count=int(per_code[self.index.codes[column][entry['value']]]))
+                for entry in self.facets[param]
+            ]
+        return result
@@ -0,0 +1,315 @@
+import json
+import logging
+import os
+import re
+import urllib.request
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+from urllib.request import pathname2url
+
+from scraping_updated import init_driver, parse_restaurant_card, scrape_restaurants
+
+try:
+    import lxml.html
+except ImportError:  # the stdlib parser is used instead
+    lxml = None
+
+# ─── Configuration ──────────────────────────────────────────────────────────────
+# Cards the HTML backend recognises; the first entries of the Selenium selector list.
+CARD_TEST_IDS = ("restaurant-card", "res-card")
+BLOCK_TAGS = {"div", "p", "h1", "h2", "h3", "h4", "h5", "h6", "li", "section", "article", "br", "span"}
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+# Start tags that close an open <p>.
+P_CLOSING_TAGS = BLOCK_TAGS - {"br", "span"} | {"ul", "ol", "table", "form", "header", "footer", "nav"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "wbr"}
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/121.0.0.0 Safari/537.36",
+    "Accept-Language": "en-IN,en;q=0.9",
+}
+SITE_ROOT = "https://www.zomato.com"
+CAPTURED_EXTENSIONS = (".html", ".htm")
+
+# window.__PRELOADED_STATE__ = JSON.parse("...") or = {...}
+STATE_RE = re.compile(r'__PRELOADED_STATE__\s*=\s*(JSON\.parse\()?')
+
+Card = Tuple[str, List[str], List[str]]
+
+
+# ─── Card extraction from HTML ──────────────────────────────────────────────────
+# Every extractor returns (text, headings, hrefs) per card, the arguments of
+# parse_restaurant_card, with block elements on their own lines the way
+# innerText lays them out in the browser.
+
+class _CardParser(HTMLParser):
+    """Collects (text, headings, hrefs) for every restaurant card in a page.
+
+    Open elements inside a card are kept on a stack. An end tag closes its
+    nearest open match and everything opened after it, and one with no open
+    match is ignored, so an unclosed ``<p>`` or a stray ``</div>`` does not
+    end a card early or late. A block start tag closes an open ``<p>``, as
+    HTML (and lxml) does.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.cards: List[Card] = []
+        self._open: List[str] = []
+        self._text: List[str] = []
+        self._headings: List[str] = []
+        self._hrefs: List[str] = []
+        self._heading_depth = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if not self._open:
+            if attrs.get("data-testid") in CARD_TEST_IDS and tag not in VOID_TAGS:
+                self._open = [tag]
+                self._text, self._headings, self._hrefs = [], [], []
+                if tag == "a" and attrs.get("href"):
+                    self._hrefs.append(attrs["href"])
+            return
+        if tag in P_CLOSING_TAGS and self._open[-1] == "p" and len(self._open) > 1:
+            self._close(len(self._open) - 1)
+        if tag in BLOCK_TAGS:
+            self._text.append("\n")
+        if tag == "a" and attrs.get("href"):
+            self._hrefs.append(attrs["href"])
+        if tag in HEADING_TAGS and self._heading_depth is None:
+            self._headings.append("")
+            self._heading_depth = len(self._open)
+        if tag not in VOID_TAGS:
+            self._open.append(tag)
+
+    def handle_endtag(self, tag):
+        if tag in self._open:
+            self._close(len(self._open) - 1 - self._open[::-1].index(tag))
+
+    def _close(self, depth: int):
+        """Close the open elements from ``depth`` up, innermost first."""
+        while len(self._open) > depth:
+            if self._open.pop() in BLOCK_TAGS:
+                self._text.append("\n")
+            if self._heading_depth is not None and len(self._open) == self._heading_depth:
+                self._heading_depth = None
+        if not self._open:
+            self.cards.append(("".join(self._text), self._headings, self._hrefs))
+
+    def handle_data(self, data):
+        if self._open:
+            self._text.append(data)
+            if self._heading_depth is not None:
+                self._headings[-1] += data
+
+
+def _stdlib_cards(html: str) -> List[Card]:
+    parser = _CardParser()
+    parser.feed(html)
+    parser.close()
+    return parser.cards
+
+
+def _lxml_text(element, parts: List[str]):
+    for child in element:
+        if not isinstance(child.tag, str):  # comments and processing instructions
+            if child.tail:
+                parts.append(child.tail)
+            continue
+        block = child.tag in BLOCK_TAGS
+        if block:
+            parts.append("\n")
+        if child.text:
+            parts.append(child.text)
+        _lxml_text(child, parts)
+        if block:
+            parts.append("\n")
+        if child.tail:
+            parts.append(child.tail)
+
+
+_IS_CARD = " or ".join(f"@data-testid='{test_id}'" for test_id in CARD_TEST_IDS)
+_CARD_XPATH = f"//*[{_IS_CARD}][not(ancestor::*[{_IS_CARD}])]"
+
+
+def _lxml_cards(html: str) -> List[Card]:
+    if not html.strip():
+        return []
+    cards = []
+    for card in lxml.html.fromstring(html).xpath(_CARD_XPATH):
+        parts = [card.text or ""]
+        _lxml_text(card, parts)
+        headings = [heading.text_content() for heading in card.iter(*HEADING_TAGS)]
+        hrefs = [link.get("href") for link in card.iter("a") if link.get("href")]
+        cards.append(("".join(parts), headings, hrefs))
+    return cards
+
+
+def _load_state(html: str):
+    """Return the page's embedded ``__PRELOADED_STATE__`` object, or None."""
+    match = STATE_RE.search(html)
+    if not match:
+        return None
+    decoder = json.JSONDecoder()
+    try:
+        value, _ = decoder.raw_decode(html, match.end())
+        # JSON.parse("...") wraps the state in a string literal
+        return json.loads(value) if match.group(1) and isinstance(value, str) else value
+    except ValueError as e:
+        logging.debug(f"Unreadable embedded state: {e}")
+        return None
+
+
+def _first_text(value, keys) -> Optional[str]:
+    """First non-empty string stored under one of ``keys`` anywhere inside ``value``."""
+    stack = [value]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key in keys:
+                if isinstance(node.get(key), str) and node[key]:
+                    return node[key]
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    return None
+
+
+def _state_card(item: Dict) -> Card:
+    """Lay out one state result the way its rendered card reads."""
+    info = item["info"]
+    rating = info.get("rating") if isinstance(info.get("rating"), dict) else {}
+    lines = []
+    if rating.get("aggregate_rating"):
+        lines.append(str(rating["aggregate_rating"]))
+    if rating.get("votes"):
+        lines.append(f"{rating['votes']} ratings")
+    cuisines = [c.get("name", "") for c in info.get("cuisine") or [] if isinstance(c, dict)]
+    if cuisines:
+        lines.append(", ".join(cuisines))
+    if isinstance(info.get("cft"), dict) and info["cft"].get("text"):
+        lines.append(info["cft"]["text"])
+    if isinstance(info.get("locality"), dict) and info["locality"].get("name"):
+        distance = item.get("distance")
+        lines.append(f"{info['locality']['name']}, Pune" + (f" · {distance}" if distance else ""))
+    if item.get("isDeliveryAvailable") or item.get("order"):
+        lines.append("Delivery available")
+    url = _first_text({k: v for k, v in item.items() if k != "info"}, ("clickUrl", "url")) or info.get("url")
+    # State URLs are site paths, whatever host served the page
+    return "\n".join(lines), [info["name"]], [urljoin(SITE_ROOT, url)] if url else []
+
+
+def _state_cards(html: str) -> List[Card]:
+    """Cards for every restaurant result in the embedded JSON state."""
+    state = _load_state(html)
+    cards = []
+    stack = [state]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            info = node.get("info")
+            if isinstance(info, dict) and isinstance(info.get("name"), str) and (
+                    "cuisine" in info or "cft" in info or "rating" in info):
+                cards.append(_state_card(node))
+                continue
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    return cards
+
+
+def extract_cards(html: str, parser: Optional[str] = None) -> List[Card]:
+    """Return ``(text, headings, hrefs)`` for each restaurant card in ``html``.
+
+    Rendered cards are read with lxml when it is installed (``parser="html.parser"``
+    forces the stdlib parser); pages that render client-side and only ship
+    their results as embedded JSON state are read from that state instead.
+    """
+    use_lxml = lxml is not None and parser != "html.parser"
+    cards = _lxml_cards(html) if use_lxml else _stdlib_cards(html)
+    return cards or _state_cards(html)
+
+
+# ─── Fetchers ───────────────────────────────────────────────────────────────────
+# A fetcher turns one listing URL into restaurant records (dicts with the
+# FIELDNAMES keys) and is created once per worker process by a picklable,
+# module-level factory. close() is called when the worker exits.
+
+class SeleniumFetcher:
+    """Scrapes listings with one long-lived headless Chrome per worker."""
+
+    def __init__(self, headless: bool = True):
+        self.driver = init_driver(headless=headless)
+
+    def fetch(self, url: str) -> List[Dict]:
+        if os.path.exists(url):
+            url = "file://" + pathname2url(os.path.abspath(url))
+        # Raise on failure, so a listing that did not finish is not marked done.
+        return scrape_restaurants(url, driver=self.driver, raise_errors=True)
+
+    def close(self):
+        self.driver.quit()
+
+
+class HtmlFetcher:
+    """Fetches listing HTML with a plain GET (or reads a saved file) and parses it without a browser.
+
+    Only sees what the server renders or embeds as JSON state, so a live
+    infinite-scroll listing yields its first page of results. With
+    ``selenium_fallback`` a page that yields no cards is re-scraped in a
+    headless Chrome, which is started on first need and then kept.
+    """
+
+    def __init__(self, timeout: float = 30, selenium_fallback: bool = False, parser: Optional[str] = None):
+        self.timeout = timeout
+        self.selenium_fallback = selenium_fallback
+        self.parser = parser
+        self._selenium: Optional[SeleniumFetcher] = None
+
+    def read(self, url: str) -> str:
+        """Return the HTML at ``url``: an http(s) URL, a file:// URL or a local path."""
+        scheme = urlparse(url).scheme
+        if scheme in ("http", "https"):
+            request = urllib.request.Request(url, headers=HTTP_HEADERS)
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                charset = response.headers.get_content_charset() or "utf-8"
+                return response.read().decode(charset, errors="replace")
+        if scheme == "file":
+            with urllib.request.urlopen(url) as response:
+                return response.read().decode("utf-8", errors="replace")
+        with open(url, encoding="utf-8", errors="replace") as f:
+            return f.read()
+
+    def fetch(self, url: str) -> List[Dict]:
+        base = url if urlparse(url).scheme in ("http", "https") else SITE_ROOT
+        records = []
+        for text, headings, hrefs in extract_cards(self.read(url), self.parser):
+            record = parse_restaurant_card(text, headings, [urljoin(base, href) for href in hrefs])
+            if record["Name"] != "N/A" and len(record["Name"]) > 2:
+                records.append(record)
+        if not records and self.selenium_fallback:
+            logging.info(f"No cards in the HTML of {url}, falling back to Selenium")
+            if self._selenium is None:
+                self._selenium = SeleniumFetcher()
+            records = self._selenium.fetch(url)
+        return records
+
+    def close(self):
+        if self._selenium is not None:
+            self._selenium.close()
+
+
+class AutoFetcher(HtmlFetcher):
+    """HtmlFetcher that falls back to Selenium for pages it cannot read."""
+
+    def __init__(self, timeout: float = 30):
+        super().__init__(timeout, selenium_fallback=True)
+
+
+FETCHERS = {"selenium": SeleniumFetcher, "html": HtmlFetcher, "auto": AutoFetcher}
+
+
+def captured_pages(directory: str) -> List[str]:
+    """Paths of the saved listing pages in ``directory``, sorted."""
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                  if name.lower().endswith(CAPTURED_EXTENSIONS))
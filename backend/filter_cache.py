@@ -0,0 +1,65 @@
+# File: backend/filter_cache.py
+"""Bounded LRU cache of resolved filter results for /api/recommend."""
+import threading
+from collections import OrderedDict
+
+
+class FilterCache:
+    """LRU map from a normalised query key to its candidate positions.
+
+    Entries hold the candidate blocks from ``MenuIndex.resolve`` rather than
+    sampled rows, so every hit still draws a fresh random sample. All
+    entries are dropped when a lookup arrives for a different data version.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, version, key, compute):
+        """Return the entry for ``key`` under ``version``, computing it on a miss."""
+        with self._lock:
+            if version != self.version:
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self.version = version
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = compute()
+        if self.max_entries <= 0:
+            return value
+        with self._lock:
+            if version == self.version:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'version': self.version,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
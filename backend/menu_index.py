@@ -0,0 +1,262 @@
+# File: backend/menu_index.py
+"""Inverted index over the cleaned menu table, built once at load time."""
+import math
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+FILTER_COLUMNS = ('Food Type', 'Cuisine')
+# Indexed as well when the loaded table has them.
+OPTIONAL_FILTER_COLUMNS = ('Area',)
+# Request parameter name -> filtered column.
+FILTER_PARAMS = {'foodTypes': 'Food Type', 'cuisines': 'Cuisine', 'areas': 'Area'}
+
+
+class MenuIndex:
+    """Posting lists per categorical value plus price-ordered row positions.
+
+    Rows are grouped into cells, one per distinct combination of the filter
+    columns. ``positions`` holds every row position ordered by (cell, price),
+    so each cell is a contiguous, price-sorted block. A column's posting list
+    for a value is the sorted array of cell ids carrying that value; a query
+    unions the lists of the requested values, intersects across columns and
+    resolves the price range inside each selected cell by binary search.
+    Nothing proportional to the table is copied per query.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: Sequence[str] = FILTER_COLUMNS,
+                 price_column: str = 'Price', version: str = ''):
+        self.columns = tuple(columns)
+        self.version = version
+        self.size = len(df)
+        self.has_price = price_column in df.columns
+
+        codes = []
+        self.codes: Dict[str, Dict[object, int]] = {}
+        for column in self.columns:
+            column_codes, uniques = pd.factorize(df[column])
+            codes.append(column_codes)
+            self.codes[column] = {value: code for code, value in enumerate(uniques)}
+
+        if self.has_price:
+            prices = df[price_column].to_numpy(dtype=np.float64)
+        else:
+            prices = np.zeros(self.size)
+        # Distinct prices; a row's rank in this array orders it exactly like
+        # its price does, and keeps the composite sort key an integer.
+        self.price_values, price_rank = np.unique(prices, return_inverse=True)
+
+        if codes:
+            cell_keys, cell_of_row = np.unique(np.stack(codes, axis=1), axis=0, return_inverse=True)
+        else:
+            cell_keys, cell_of_row = np.empty((1, 0), dtype=np.intp), np.zeros(self.size, dtype=np.intp)
+        cell_of_row = cell_of_row.reshape(-1)
+        self.cell_codes = cell_keys
+        self.n_cells = len(cell_keys)
+
+        order = np.lexsort((price_rank, cell_of_row))
+        self.positions = order.astype(np.int32)
+        self._stride = max(len(self.price_values), 1)
+        self._keys = cell_of_row[order].astype(np.int64) * self._stride + price_rank[order]
+        # The same key per row in table order, for testing given rows against a query.
+        self.row_keys = np.empty(self.size, dtype=np.int64)
+        self.row_keys[order] = self._keys
+        self.cell_bounds = np.concatenate(
+            ([0], np.cumsum(np.bincount(cell_of_row, minlength=self.n_cells)))
+        ).astype(np.int64)
+
+        self.postings: Dict[str, Dict[int, np.ndarray]] = {}
+        for i, column in enumerate(self.columns):
+            self.postings[column] = {
+                code: np.flatnonzero(self.cell_codes[:, i] == code)
+                for code in self.codes[column].values()
+            }
+
+    def query_key(self, filters: Dict[str, Sequence], min_price=None, max_price=None) -> tuple:
+        """Return a hashable key that is equal for any two queries with the same matches.
+
+        Requested values are replaced by their sorted codes (unknown values
+        dropped) and price bounds by the price-rank window they select.
+        """
+        column_codes = []
+        for column, wanted in sorted(filters.items()):
+            if not wanted:
+                continue
+            # A column that is not indexed has no rows with the wanted values.
+            known = self.codes.get(column, {})
+            column_codes.append((column, tuple(sorted({known[value] for value in wanted if value in known}))))
+        return tuple(column_codes), self.price_ranks(min_price, max_price)
+
+    def price_ranks(self, min_price=None, max_price=None) -> tuple:
+        """Return the ``[lo, hi)`` window of price ranks inside the bounds."""
+        lo_rank, hi_rank = 0, self._stride
+        if self.has_price:
+            if min_price is not None:
+                min_price = float(min_price)
+                if math.isnan(min_price):
+                    return 0, 0
+                lo_rank = int(np.searchsorted(self.price_values, min_price, side='left'))
+            if max_price is not None:
+                max_price = float(max_price)
+                if math.isnan(max_price):
+                    return 0, 0
+                hi_rank = int(np.searchsorted(self.price_values, max_price, side='right'))
+        if hi_rank <= lo_rank:
+            return 0, 0
+        return lo_rank, hi_rank
+
+    def select_cells(self, filters: Dict[str, Sequence]) -> np.ndarray:
+        """Return the sorted ids of cells matching every non-empty filter."""
+        return self._select_cells(self.query_key(filters)[0])
+
+    def _select_cells(self, column_codes: tuple) -> np.ndarray:
+        cells = None
+        for column, codes in column_codes:
+            lists = [self.postings[column][code] for code in codes]
+            # Values of one column never share a cell, so the union is a concatenation.
+            matched = np.sort(np.concatenate(lists)) if lists else np.empty(0, dtype=np.intp)
+            cells = matched if cells is None else np.intersect1d(cells, matched, assume_unique=True)
+        if cells is None:
+            return np.arange(self.n_cells)
+        return cells
+
+    def cell_ranges(self, cells: np.ndarray, min_price=None, max_price=None):
+        """Return ``(lo, hi)`` offsets into ``positions`` for each cell in ``cells``."""
+        return self._cell_ranges(cells, self.price_ranks(min_price, max_price))
+
+    def _cell_ranges(self, cells: np.ndarray, ranks: tuple):
+        lo_rank, hi_rank = ranks
+        if lo_rank == 0 and hi_rank == self._stride:
+            return self.cell_bounds[cells], self.cell_bounds[cells + 1]
+        base = cells.astype(np.int64) * self._stride
+        lo = np.searchsorted(self._keys, base + lo_rank, side='left')
+        hi = np.searchsorted(self._keys, base + hi_rank, side='left')
+        return lo, hi
+
+    def resolve(self, filters: Dict[str, Sequence], min_price=None, max_price=None,
+                cache=None):
+        """Return the ``(lo, hi)`` blocks of ``positions`` holding every match.
+
+        With a ``FilterCache`` the blocks are looked up by ``query_key`` and
+        only computed on a miss.
+        """
+        key = self.query_key(filters, min_price, max_price)
+        if cache is None:
+            return self._ranges_for_key(key)
+        return cache.get_or_compute(self.version, key, lambda: self._ranges_for_key(key))
+
+    def _ranges_for_key(self, key: tuple):
+        lo, hi = self._cell_ranges(self._select_cells(key[0]), key[1])
+        lo.setflags(write=False)
+        hi.setflags(write=False)
+        return lo, hi
+
+    def cell_counts(self, filters: Dict[str, Sequence], min_price=None, max_price=None):
+        """Return ``(cells, counts)``: the matching cells and their number of matches."""
+        key = self.query_key(filters, min_price, max_price)
+        cells = self._select_cells(key[0])
+        lo, hi = self._cell_ranges(cells, key[1])
+        return cells, hi - lo
+
+    def row_matcher(self, filters: Dict[str, Sequence], min_price=None, max_price=None):
+        """Return a function mapping an array of row positions to a mask of those that match.
+
+        Costs O(cells) to set up and O(len(rows)) per call, for callers that
+        only need to test a few rows rather than collect every match.
+        """
+        column_codes, (lo_rank, hi_rank) = self.query_key(filters, min_price, max_price)
+        selected = np.zeros(self.n_cells, dtype=bool)
+        selected[self._select_cells(column_codes)] = True
+
+        def matches(rows: np.ndarray) -> np.ndarray:
+            cells, ranks = np.divmod(self.row_keys[rows], self._stride)
+            return selected[cells] & (ranks >= lo_rank) & (ranks < hi_rank)
+        return matches
+
+    def candidates(self, filters: Dict[str, Sequence], min_price=None,
+                   max_price=None, cache=None) -> np.ndarray:
+        """Return the sorted row positions matching ``filters`` and the price range."""
+        lo, hi = self.resolve(filters, min_price, max_price, cache)
+        return np.sort(self.positions[_expand_ranges(lo, hi)])
+
+    def count(self, filters: Dict[str, Sequence], min_price=None, max_price=None,
+              cache=None) -> int:
+        """Return how many rows match, without collecting them."""
+        lo, hi = self.resolve(filters, min_price, max_price, cache)
+        return int((hi - lo).sum())
+
+    def sample(self, filters: Dict[str, Sequence], min_price=None, max_price=None,
+               k: int = 5, seed: Optional[int] = None, cache=None) -> np.ndarray:
+        """Return up to ``k`` distinct matching row positions drawn uniformly.
+
+        Draws ranks in ``[0, count)`` and maps each rank to its cell block by
+        a binary search over the cumulative block sizes, so the cost is
+        O(k + cells) whatever the number of matches.
+        """
+        lo, hi = self.resolve(filters, min_price, max_price, cache)
+        return self.sample_ranges(lo, hi, k, seed)
+
+    def sample_ranges(self, lo: np.ndarray, hi: np.ndarray, k: int = 5,
+                      seed: Optional[int] = None) -> np.ndarray:
+        """``sample`` for blocks already returned by ``resolve``."""
+        return self._sample_ranges(lo, hi, k, np.random.default_rng(seed))
+
+    def sample_batch(self, queries: Sequence, seed: Optional[int] = None, cache=None) -> list:
+        """Sample for many ``(filters, min_price, max_price, k)`` queries at once.
+
+        Queries that share a categorical predicate share its cell selection,
+        and queries that also share price bounds share the range lookup, so
+        each distinct predicate is evaluated once per batch. Returns one
+        position array per query, in order.
+        """
+        rng = np.random.default_rng(seed)
+        cells_by_key = {}
+        ranges_by_key = {}
+        results = []
+        for filters, min_price, max_price, k in queries:
+            key = self.query_key(filters, min_price, max_price)
+            if key not in ranges_by_key:
+                if cache is not None:
+                    ranges_by_key[key] = cache.get_or_compute(
+                        self.version, key, lambda: self._ranges_for_key(key))
+                else:
+                    if key[0] not in cells_by_key:
+                        cells_by_key[key[0]] = self._select_cells(key[0])
+                    ranges_by_key[key] = self._cell_ranges(cells_by_key[key[0]], key[1])
+            lo, hi = ranges_by_key[key]
+            results.append(self._sample_ranges(lo, hi, k, rng))
+        return results
+
+    def _sample_ranges(self, lo: np.ndarray, hi: np.ndarray, k: int,
+                       rng: np.random.Generator) -> np.ndarray:
+        lengths = hi - lo
+        ends = np.cumsum(lengths)
+        total = int(ends[-1]) if len(ends) else 0
+        ranks = _floyd_sample(total, min(k, total), rng)
+        blocks = np.searchsorted(ends, ranks, side='right')
+        return self.positions[lo[blocks] + ranks - (ends[blocks] - lengths[blocks])]
+
+
+def _expand_ranges(lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """Concatenate ``arange(lo[i], hi[i])`` for every i without a Python loop."""
+    lengths = hi - lo
+    total = int(lengths.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    keep = lengths > 0
+    lo, lengths = lo[keep], lengths[keep]
+    starts = np.cumsum(lengths) - lengths
+    return np.repeat(lo - starts, lengths) + np.arange(total)
+
+
+def _floyd_sample(n: int, k: int, rng: np.random.Generator) -> np.ndarray:
+    """Return ``k`` distinct integers from ``range(n)`` in random order, in O(k)."""
+    chosen = set()
+    picks = []
+    for j in range(n - k, n):
+        t = int(rng.integers(0, j + 1))
+        pick = j if t in chosen else t
+        chosen.add(pick)
+        picks.append(pick)
+    return rng.permutation(np.array(picks, dtype=np.int64))
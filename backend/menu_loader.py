@@ -0,0 +1,158 @@
+# File: backend/menu_loader.py
+"""Loading and cleaning of the menu table served by the API."""
+import os
+import time
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from area_classifier import classify_urls
+from cleaning import CLEAN_COLUMNS, clean_frame
+from metrics import Spans
+from snapshot import file_sha256, read_snapshot
+
+DATA_FILE_NAME = 'Zomato_Menu_Classified_with_Area.csv'
+# Scraped restaurant listing whose ratings feed the ranked recommendations.
+RATINGS_FILE_NAME = 'pune_zomato_restaurants_updated.csv'
+# Columns the API cannot work without; always kept by the projection.
+REQUIRED_COLUMNS = ['Item_Name', 'Restaurant_Name', 'Food Type', 'Cuisine', 'Price']
+# Rows missing any of these are dropped while loading.
+CRITICAL_COLUMNS = ['Price', 'Item_Name', 'Restaurant_Name', 'Food Type', 'Cuisine']
+# Comma-separated list of extra columns to keep in memory. Unset keeps every
+# column, which is what /api/recommend returns today.
+PROJECTION_ENV_VAR = 'MENU_COLUMNS'
+# Text columns with at most this share of distinct values become categoricals.
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+
+def snapshot_path_for(csv_path: str) -> str:
+    """Return where the compiled snapshot of ``csv_path`` lives."""
+    return os.path.splitext(csv_path)[0] + '.snapshot'
+
+
+def load_menu_csv(file_path: str, spans: Optional[Spans] = None) -> pd.DataFrame:
+    """Read the menu CSV, parse prices and drop rows missing critical data."""
+    print(f"--- LOG: Attempting to load data from: {file_path}")
+    df = pd.read_csv(file_path)
+    if spans is not None:
+        spans.mark('read_csv')
+    print(f"--- LOG: CSV file loaded. Initial row count: {len(df)}")
+    print(f"--- LOG: Columns found: {df.columns.tolist()}")
+
+    # Parse prices with the shared cleaning rules, then drop every row that
+    # lacks a usable price or a critical column with a single filter.
+    if 'Price' in df.columns:
+        df, report = clean_frame(df, {'Price': CLEAN_COLUMNS['Price']})
+        for line in report.lines():
+            print(f"--- LOG: {line}")
+    else:
+        print("--- LOG: WARNING - 'Price' column not found.")
+
+    critical = [column for column in CRITICAL_COLUMNS if column != 'Price' or 'Price' in df.columns]
+    keep = df[critical].notna().all(axis=1).to_numpy()
+    print(f"--- LOG: Dropped {int((~keep).sum())} rows due to a missing price or missing critical data.")
+    if not keep.all():
+        df = df[keep]
+    print(f"--- LOG: Rows after cleaning: {len(df)}")
+    if spans is not None:
+        spans.mark('clean')
+    return df
+
+
+def load_restaurant_ratings(file_path: str) -> Optional[pd.DataFrame]:
+    """Read scraped restaurant ratings, keyed like the menu table, or None if absent."""
+    if not os.path.exists(file_path):
+        print(f"--- LOG: No restaurant ratings at {file_path}; ranked mode weighs price only.")
+        return None
+    ratings = pd.read_csv(file_path, dtype=str, keep_default_na=False)
+    ratings = ratings.rename(columns={'Name': 'Restaurant_Name'})
+    keep = [column for column in ('Restaurant_Name', 'URL', 'Rating', 'Rating Count') if column in ratings.columns]
+    print(f"--- LOG: Loaded ratings for {len(ratings)} restaurants from {file_path}")
+    return ratings[keep]
+
+
+def projection_from_env() -> Optional[list]:
+    """Return the column projection configured in the environment, if any."""
+    value = os.environ.get(PROJECTION_ENV_VAR, '').strip()
+    if not value:
+        return None
+    return [column.strip() for column in value.split(',') if column.strip()]
+
+
+def slim_menu(df: pd.DataFrame, projection: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Return a compact copy of ``df`` that serialises to the same records.
+
+    Keeps only ``projection`` (plus the required columns) when given,
+    converts low-cardinality text columns to categoricals and stores prices
+    as float32 when every price survives the round trip exactly.
+    """
+    before = df.memory_usage(index=False, deep=True)
+    if projection is not None:
+        keep = set(projection) | set(REQUIRED_COLUMNS)
+        df = df[[column for column in df.columns if column in keep]]
+    df = df.reset_index(drop=True)
+
+    slim = {}
+    for column in df.columns:
+        series = df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            slim[column] = series
+        elif pd.api.types.is_float_dtype(series) and series.dtype != np.float32:
+            values = series.to_numpy()
+            as_float32 = values.astype(np.float32)
+            lossless = np.array_equal(as_float32.astype(values.dtype), values, equal_nan=True)
+            slim[column] = pd.Series(as_float32) if lossless else series
+        elif not pd.api.types.is_numeric_dtype(series) and len(series) and \
+                series.nunique(dropna=True) <= CATEGORY_MAX_UNIQUE_RATIO * len(series):
+            slim[column] = series.astype('category')
+        else:
+            slim[column] = series
+    df = pd.DataFrame(slim)
+
+    after = df.memory_usage(index=False, deep=True)
+    print("--- LOG: Memory per column (bytes before -> after):")
+    for column in before.index:
+        now = f"{after[column]:,}" if column in after.index else "dropped"
+        print(f"--- LOG:   {column}: {before[column]:,} -> {now}")
+    print(f"--- LOG: Total: {before.sum():,} -> {after.sum():,} bytes")
+    return df
+
+
+def load_menu(file_path: str, spans: Optional[Spans] = None) -> Tuple[pd.DataFrame, str]:
+    """Load the cleaned menu table, preferring a fresh snapshot over the CSV.
+
+    The snapshot is used when it exists and was compiled from a CSV with the
+    same content hash (or the CSV itself is absent); otherwise the CSV is
+    parsed and cleaned as usual. Returns the table and its data version, the
+    SHA-256 of the source CSV. Each phase is marked on ``spans`` when given.
+    """
+    start = time.perf_counter()
+    spans = spans if spans is not None else Spans('load')
+    snapshot_path = snapshot_path_for(file_path)
+    df = None
+    version = file_sha256(file_path) if os.path.exists(file_path) else None
+    spans.mark('hash')
+    if os.path.exists(snapshot_path):
+        try:
+            header, snapshot_df = read_snapshot(snapshot_path)
+            if version is not None and header['source_sha256'] != version:
+                print(f"--- LOG: Snapshot {snapshot_path} is stale; falling back to CSV.")
+            else:
+                df = snapshot_df
+                version = header['source_sha256']
+                source = 'snapshot'
+                spans.mark('read_snapshot')
+        except (OSError, ValueError, KeyError) as e:
+            print(f"--- LOG: Could not read snapshot {snapshot_path} ({e}); falling back to CSV.")
+    if df is None:
+        df = load_menu_csv(file_path, spans)
+        source = 'CSV'
+    if 'Area' not in df.columns and 'URL' in df.columns:
+        df['Area'] = classify_urls(df['URL'])
+        print("--- LOG: Derived 'Area' from restaurant URLs.")
+        spans.mark('classify_area')
+    df = slim_menu(df, projection_from_env())
+    spans.mark('slim')
+    print(f"--- LOG: Menu data loaded from {source} in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return df, version
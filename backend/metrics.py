@@ -0,0 +1,178 @@
+# File: backend/metrics.py
+"""Request-stage timing histograms and load-phase timings in Prometheus text format.
+
+A request carries a ``Spans``: each ``mark(stage)`` records the time since
+the previous mark, so one stage costs one ``perf_counter`` call and a
+tuple append. When the request ends, ``Metrics.record`` appends its
+durations to their histograms under one lock acquisition; bucketing is
+done later with numpy, a batch at a time. The load phases of the live
+dataset are kept as gauges.
+"""
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Upper bounds, in seconds, of the latency histogram buckets (plus +Inf).
+LATENCY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5)
+BUCKET_BOUNDS = np.array(LATENCY_BUCKETS)
+BUCKET_LABEL = 'le="{}"'
+# Samples a histogram holds before they are bucketed.
+FOLD_EVERY = 4096
+METRIC_PREFIX = 'menu'
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+# Set to 1 to send a Server-Timing header with each response's stages.
+SERVER_TIMING_ENV_VAR = 'SERVER_TIMING'
+SERVER_TIMING = os.environ.get(SERVER_TIMING_ENV_VAR, '') not in ('', '0')
+
+
+class Spans:
+    """Durations of the consecutive stages of one request or load, in seconds."""
+
+    __slots__ = ('name', 'start', 'stages', '_last')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = self._last = time.perf_counter()
+        self.stages: List[Tuple[str, float]] = []
+
+    def mark(self, stage: str) -> None:
+        """End ``stage``: it took the time since the previous mark (or the start)."""
+        now = time.perf_counter()
+        self.stages.append((stage, now - self._last))
+        self._last = now
+
+    def total(self) -> float:
+        return time.perf_counter() - self.start
+
+    def server_timing(self, total: Optional[float] = None) -> str:
+        """The stages as a Server-Timing header value, in milliseconds."""
+        parts = [f"{stage};dur={seconds * 1000:.3f}" for stage, seconds in self.stages]
+        if total is not None:
+            parts.append(f"total;dur={total * 1000:.3f}")
+        return ', '.join(parts)
+
+
+class Histogram:
+    """Bucket counts with a running sum and count, folded in from pending samples.
+
+    ``pending`` takes raw samples with a plain list append on the request
+    path; they are bucketed with numpy in batches of ``FOLD_EVERY`` and
+    whenever the metrics are rendered.
+    """
+
+    __slots__ = ('counts', 'sum', 'count', 'pending')
+
+    def __init__(self):
+        self.counts = np.zeros(len(LATENCY_BUCKETS) + 1, dtype=np.int64)
+        self.sum = 0.0
+        self.count = 0
+        self.pending: List[float] = []
+
+    def fold(self) -> None:
+        if not self.pending:
+            return
+        values = np.array(self.pending)
+        self.pending = []
+        self.counts += np.bincount(np.searchsorted(BUCKET_BOUNDS, values, side='left'),
+                                   minlength=len(self.counts))
+        self.sum += float(values.sum())
+        self.count += len(values)
+
+
+def _labels(pairs: Tuple[Tuple[str, str], ...], extra: str = '') -> str:
+    text = ','.join(f'{name}="{value}"' for name, value in pairs)
+    if extra:
+        text = f"{text},{extra}" if text else extra
+    return f"{{{text}}}" if text else ''
+
+
+class Metrics:
+    """Per-route request and per-stage histograms, request counts by status, load-phase gauges."""
+
+    def __init__(self):
+        self.requests: Dict[str, Histogram] = {}
+        self.stages: Dict[Tuple[str, str], Histogram] = {}
+        self.statuses: Dict[Tuple[str, int], int] = {}
+        self.load_phases: Dict[str, float] = {}
+        self.loads = 0
+        self._lock = threading.Lock()
+
+    def record(self, spans: Spans, status: int, total: Optional[float] = None) -> None:
+        """Add one finished request: its total time and each of its stages."""
+        if total is None:
+            total = spans.total()
+        route = spans.name
+        with self._lock:
+            histogram = self.requests.get(route)
+            if histogram is None:
+                histogram = self.requests[route] = Histogram()
+            histogram.pending.append(total)
+            for stage, seconds in spans.stages:
+                key = (route, stage)
+                if key not in self.stages:
+                    self.stages[key] = Histogram()
+                self.stages[key].pending.append(seconds)
+            key = (route, status)
+            self.statuses[key] = self.statuses.get(key, 0) + 1
+            if len(histogram.pending) >= FOLD_EVERY:
+                self._fold()
+
+    def _fold(self) -> None:
+        for histogram in self.requests.values():
+            histogram.fold()
+        for histogram in self.stages.values():
+            histogram.fold()
+
+    def record_load(self, spans: Spans) -> None:
+        """Replace the load-phase gauges with the phases of the load that just finished."""
+        with self._lock:
+            self.load_phases = dict(spans.stages)
+            self.load_phases['total'] = spans.total()
+            self.loads += 1
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            self._fold()
+            requests = {route: (h.counts.tolist(), h.sum, h.count) for route, h in self.requests.items()}
+            stages = {key: (h.counts.tolist(), h.sum, h.count) for key, h in self.stages.items()}
+            statuses = dict(self.statuses)
+            load_phases = dict(self.load_phases)
+            loads = self.loads
+
+        lines = []
+        _render_histograms(lines, f'{METRIC_PREFIX}_request_seconds', 'Time to answer a request.',
+                           {(('route', route),): value for route, value in sorted(requests.items())})
+        _render_histograms(lines, f'{METRIC_PREFIX}_stage_seconds', 'Time spent in each stage of a request.',
+                           {(('route', route), ('stage', stage)): value
+                            for (route, stage), value in sorted(stages.items())})
+        name = f'{METRIC_PREFIX}_requests_total'
+        lines += [f'# HELP {name} Requests answered, by route and status.', f'# TYPE {name} counter']
+        lines += [f'{name}{_labels((("route", route), ("status", str(status))))} {count}'
+                  for (route, status), count in sorted(statuses.items())]
+        name = f'{METRIC_PREFIX}_load_phase_seconds'
+        lines += [f'# HELP {name} Duration of each phase of the last dataset load.', f'# TYPE {name} gauge']
+        lines += [f'{name}{_labels((("phase", phase),))} {seconds:.6f}' for phase, seconds in load_phases.items()]
+        name = f'{METRIC_PREFIX}_loads_total'
+        lines += [f'# HELP {name} Dataset loads completed.', f'# TYPE {name} counter', f'{name} {loads}']
+        return '\n'.join(lines) + '\n'
+
+
+def _render_histograms(lines: List[str], name: str, help_text: str, series: dict) -> None:
+    lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+    for labels, (counts, total, count) in series.items():
+        cumulative = 0
+        for bound, n in zip(LATENCY_BUCKETS, counts):
+            cumulative += n
+            lines.append(f'{name}_bucket{_labels(labels, BUCKET_LABEL.format(bound))} {cumulative}')
+        lines.append(f'{name}_bucket{_labels(labels, BUCKET_LABEL.format("+Inf"))} {count}')
+        lines.append(f'{name}_sum{_labels(labels)} {total:.6f}')
+        lines.append(f'{name}_count{_labels(labels)} {count}')
+
+
+# Process-wide registry shared by the Flask and ASGI entry points.
+METRICS = Metrics()
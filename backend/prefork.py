@@ -0,0 +1,227 @@
+# File: backend/prefork.py
+"""Pre-forking server: load and index the menu once, share it, fork the workers.
+
+    python prefork.py --workers 4 --port 5000
+
+The parent imports the Flask app, which loads the dataset. It then moves
+the dataset's arrays into a read-only shared mapping (shared_dataset.py)
+and forks ``--workers`` processes that serve the app from one listening
+socket. Workers never load data, so an extra worker costs its Python
+objects and request state, not another copy of the table and indexes.
+
+Reloads happen in the parent. It checks the data files from its own
+loop every $DATA_WATCH_INTERVAL seconds, with no watcher thread, since a
+thread running at fork time would leave its locks held in the children.
+A worker answering POST /api/admin/reload passes the request on with SIGHUP.
+The parent loads on its main thread, so no worker is forked while a load
+is under way. Once a new version is live, it is shared and a new
+generation of workers is forked from it. The old workers get SIGTERM,
+finish the request in hand and exit. A worker that dies is replaced.
+
+With ``--no-share``, each worker instead imports the app and loads its
+own copy after the fork, as gunicorn does without preloading.
+bench/bench_prefork.py compares the two modes.
+
+Metrics are kept per process: /api/metrics reports the counts of the
+worker that answers it, not of the whole server.
+"""
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+import traceback
+
+from werkzeug.serving import make_server
+
+from dataset import WATCH_INTERVAL_ENV_VAR, watch_interval
+from shared_dataset import share_dataset
+
+DEFAULT_WORKERS = os.cpu_count() or 1
+POLL_INTERVAL = 0.5
+# Seconds a retired worker gets to finish its request before it is killed.
+GRACEFUL_TIMEOUT = 30.0
+
+
+class PreforkServer:
+    """The parent process: owns the listening socket, the shared dataset and the workers."""
+
+    def __init__(self, listener: socket.socket, workers: int = DEFAULT_WORKERS, share: bool = True,
+                 access_log: bool = True):
+        self.listener = listener
+        self.worker_count = workers
+        self.share = share
+        self.access_log = access_log
+        # The app module; imported in the parent only when the dataset is shared.
+        self.app = None
+        self.workers = set()
+        # pid -> time after which a worker of an older generation is killed.
+        self.retiring = {}
+        # datasets.swaps when the live workers were forked.
+        self.generation = None
+        self.reload_requested = False
+        self.stopping = False
+        self.watch_interval = watch_interval()
+
+    def _share_current(self) -> None:
+        datasets = self.app.datasets
+        if not datasets.current.empty:
+            share_dataset(datasets.current)
+        # Keep the workers' garbage collector from writing to every inherited object.
+        gc.collect()
+        gc.freeze()
+        self.generation = datasets.swaps
+
+    def _spawn(self) -> int:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                self._serve()
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                os._exit(code)
+        return pid
+
+    def _serve(self) -> None:
+        """Worker body: serve requests on the inherited socket until SIGTERM."""
+        for sig in (signal.SIGHUP, signal.SIGCHLD):
+            signal.signal(sig, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        if self.app is None:
+            import app
+        else:
+            app = self.app
+            parent = os.getppid()
+            app.datasets.delegate_reloads(lambda: os.kill(parent, signal.SIGHUP) or True)
+        if not self.access_log:
+            logging.getLogger('werkzeug').setLevel(logging.WARNING)
+        host, port = self.listener.getsockname()[:2]
+        server = make_server(host, port, app.app, fd=self.listener.fileno())
+        # shutdown() waits for serve_forever() to return, so it must run on another thread.
+        signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown, daemon=True).start())
+        server.serve_forever()
+
+    def _kill(self, pid: int, sig: int) -> None:
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
+
+    def _reap(self) -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            self.retiring.pop(pid, None)
+            if pid in self.workers:
+                self.workers.discard(pid)
+                if not self.stopping:
+                    print(f"--- LOG: Worker {pid} exited with status {status}; starting a replacement.")
+                    self.workers.add(self._spawn())
+        now = time.monotonic()
+        for pid, deadline in list(self.retiring.items()):
+            if now > deadline:
+                self._kill(pid, signal.SIGKILL)
+
+    def _roll(self) -> None:
+        """Fork a generation of workers from the new dataset and retire the old one."""
+        self._share_current()
+        old = self.workers
+        self.workers = {self._spawn() for _ in range(self.worker_count)}
+        deadline = time.monotonic() + GRACEFUL_TIMEOUT
+        for pid in old:
+            self._kill(pid, signal.SIGTERM)
+            self.retiring[pid] = deadline
+        print(f"--- LOG: Data version {str(self.app.datasets.current.version)[:12]} handed to workers "
+              f"{sorted(self.workers)}; retiring {sorted(old)}")
+
+    def _reload(self) -> None:
+        """Load the data files here, with no loader thread, and roll the workers if a new version went live."""
+        self.app.datasets.load()
+        if self.app.datasets.swaps != self.generation:
+            self._roll()
+
+    def _request_reload(self, *_) -> None:
+        self.reload_requested = True
+
+    def _stop(self, *_) -> None:
+        self.stopping = True
+
+    def _import_app(self):
+        """Import the app, loading the dataset without starting its watcher thread."""
+        configured = os.environ.get(WATCH_INTERVAL_ENV_VAR)
+        os.environ[WATCH_INTERVAL_ENV_VAR] = '0'
+        try:
+            import app
+        finally:
+            if configured is None:
+                del os.environ[WATCH_INTERVAL_ENV_VAR]
+            else:
+                os.environ[WATCH_INTERVAL_ENV_VAR] = configured
+        return app
+
+    def run(self) -> None:
+        if self.share:
+            self.app = self._import_app()
+            self._share_current()
+        signal.signal(signal.SIGHUP, self._request_reload)
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        self.workers = {self._spawn() for _ in range(self.worker_count)}
+        host, port = self.listener.getsockname()[:2]
+        print(f"--- LOG: Serving on http://{host}:{port} with {self.worker_count} workers "
+              f"({'shared dataset' if self.share else 'one dataset per worker'}), pids {sorted(self.workers)}")
+
+        next_check = time.monotonic() + self.watch_interval
+        while not self.stopping:
+            time.sleep(POLL_INTERVAL)
+            self._reap()
+            if self.app is None or self.stopping:
+                continue
+            datasets = self.app.datasets
+            if self.watch_interval > 0 and time.monotonic() >= next_check:
+                next_check = time.monotonic() + self.watch_interval
+                if datasets.changed():
+                    print(f"--- LOG: Change detected in {datasets.data_path}; reloading.")
+                    self.reload_requested = True
+            if self.reload_requested:
+                self.reload_requested = False
+                self._reload()
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        """Stop every worker, letting each finish its request for up to GRACEFUL_TIMEOUT."""
+        deadline = time.monotonic() + GRACEFUL_TIMEOUT
+        for pid in self.workers | set(self.retiring):
+            self._kill(pid, signal.SIGTERM)
+            self.retiring[pid] = min(self.retiring.get(pid, deadline), deadline)
+        self.workers = set()
+        while self.retiring:
+            self._reap()
+            time.sleep(0.05)
+        self.listener.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--no-share', action='store_true', help='let each worker load its own copy of the data')
+    parser.add_argument('--no-access-log', action='store_true')
+    args = parser.parse_args()
+    listener = socket.create_server((args.host, args.port), backlog=1024)
+    PreforkServer(listener, args.workers, share=not args.no_share, access_log=not args.no_access_log).run()
+
+
+if __name__ == '__main__':
+    main()
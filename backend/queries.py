@@ -0,0 +1,174 @@
+# File: backend/queries.py
+"""Request parsing and query execution shared by the Flask and ASGI entry points.
+
+Handlers pass in the request body or query-string mapping (anything with
+``get`` and ``getlist``) and the ``Dataset`` they read once per request.
+They get back row positions or plain results, and turn ``QueryError``
+into a 400 response.
+"""
+from typing import List, Optional
+
+import numpy as np
+
+from aggregates import AREA_SORTS, DESCENDING_SORTS, RESTAURANT_SORTS
+from dataset import Dataset
+from menu_index import FILTER_PARAMS
+from metrics import Spans
+
+DEFAULT_RECOMMENDATION_COUNT = 5
+RECOMMENDATION_MODES = ('uniform', 'ranked')
+MAX_BATCH_QUERIES = 100
+MAX_BATCH_COUNT = 50
+DEFAULT_SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 50
+DEFAULT_AGGREGATE_LIMIT = 10
+MAX_AGGREGATE_LIMIT = 100
+EMPTY_DATA_ERROR = "Server data is empty or not loaded correctly."
+
+
+class QueryError(ValueError):
+    """A request the API rejects with a 400 and this message."""
+
+
+def parse_filters(data):
+    """Return ``(filters, min_price, max_price)`` from a recommend request body.
+
+    Each filter must be a list of strings and each price bound a number or
+    null; anything else is a QueryError.
+    """
+    if not isinstance(data, dict):
+        raise QueryError("Expected a JSON object.")
+    filters = {}
+    for param, column in FILTER_PARAMS.items():
+        wanted = data.get(param)
+        if wanted is None:
+            wanted = []
+        if not isinstance(wanted, list) or not all(isinstance(value, str) for value in wanted):
+            raise QueryError(f"'{param}' must be a list of strings.")
+        filters[column] = wanted
+    bounds = []
+    for param in ('minPrice', 'maxPrice'):
+        bound = data.get(param)
+        if bound is not None and (isinstance(bound, bool) or not isinstance(bound, (int, float))):
+            raise QueryError(f"'{param}' must be a number or null.")
+        bounds.append(bound)
+    return (filters, *bounds)
+
+
+def _number_arg(args, name: str, kind, default=None):
+    """``args[name]`` converted with ``kind``, or ``default`` if absent or malformed."""
+    try:
+        return kind(args.get(name))
+    except (TypeError, ValueError):
+        return default
+
+
+def filter_args(args, params=FILTER_PARAMS):
+    """Return ``(filters, min_price, max_price)`` from query-string arguments."""
+    filters = {column: args.getlist(param) for param, column in params.items() if args.getlist(param)}
+    return filters, _number_arg(args, 'minPrice', float), _number_arg(args, 'maxPrice', float)
+
+
+def _seed(data) -> Optional[int]:
+    """The body's ``seed``: absent, or a non-negative integer."""
+    seed = data.get('seed')
+    if seed is not None and (isinstance(seed, bool) or not isinstance(seed, int) or seed < 0):
+        raise QueryError("'seed' must be a non-negative integer.")
+    return seed
+
+
+def _mark(spans: Optional[Spans], stage: str) -> None:
+    if spans is not None:
+        spans.mark(stage)
+
+
+def recommend(data_set: Dataset, data, spans: Optional[Spans] = None) -> np.ndarray:
+    """Row positions for a /api/recommend body, marking the parse, filter and sample stages."""
+    filters, min_price, max_price = parse_filters(data)
+    seed = _seed(data)
+    mode = data.get('mode', 'uniform')
+    if mode not in RECOMMENDATION_MODES:
+        raise QueryError(f"'mode' must be one of {', '.join(RECOMMENDATION_MODES)}.")
+    _mark(spans, 'parse')
+    if mode == 'ranked':
+        # Weighted by rating and price fit, at most one dish per restaurant.
+        table = data_set.ranker.alias_table(filters, min_price, max_price, cache=data_set.ranked_cache)
+        _mark(spans, 'filter')
+        positions = data_set.ranker.draw(table, DEFAULT_RECOMMENDATION_COUNT, seed)
+    else:
+        lo, hi = data_set.index.resolve(filters, min_price, max_price, cache=data_set.filter_cache)
+        _mark(spans, 'filter')
+        positions = data_set.index.sample_ranges(lo, hi, DEFAULT_RECOMMENDATION_COUNT, seed)
+    _mark(spans, 'sample')
+    return positions
+
+
+def recommend_batch(data_set: Dataset, data) -> List[np.ndarray]:
+    """Row positions per query for a /api/recommend/batch body, in request order."""
+    seed = None
+    if isinstance(data, dict):
+        seed = _seed(data)
+        data = data.get('queries')
+    if not isinstance(data, list) or not all(isinstance(query, dict) for query in data):
+        raise QueryError("Expected a list of filter objects.")
+    if len(data) > MAX_BATCH_QUERIES:
+        raise QueryError(f"At most {MAX_BATCH_QUERIES} queries per batch.")
+
+    queries = []
+    for query in data:
+        count = query.get('count', DEFAULT_RECOMMENDATION_COUNT)
+        if not isinstance(count, int) or not 0 <= count <= MAX_BATCH_COUNT:
+            raise QueryError(f"'count' must be an integer between 0 and {MAX_BATCH_COUNT}.")
+        queries.append(parse_filters(query) + (count,))
+    return data_set.index.sample_batch(queries, seed=seed, cache=data_set.filter_cache)
+
+
+def facets(data_set: Dataset, args) -> Optional[dict]:
+    """Conditional facet counts for the query string, or None when it has no filters.
+
+    With no filters the caller sends the precomputed ``data_set.facets.unfiltered_json``.
+    """
+    filters, min_price, max_price = filter_args(args, data_set.facets.params)
+    if not filters and min_price is None and max_price is None:
+        return None
+    return data_set.facets.conditional(filters, min_price, max_price)
+
+
+def search(data_set: Dataset, args) -> dict:
+    """The /api/search response for the query string."""
+    query = args.get('q', '')
+    limit = _number_arg(args, 'limit', int, DEFAULT_SEARCH_LIMIT)
+    if not 1 <= limit <= MAX_SEARCH_LIMIT:
+        raise QueryError(f"'limit' must be between 1 and {MAX_SEARCH_LIMIT}.")
+    filters, min_price, max_price = filter_args(args)
+    results = data_set.search.search(query, filters, min_price, max_price, limit=limit)
+    return {'query': query, 'results': results}
+
+
+def _ranking_args(args, sorts, default_sort: str):
+    """Return ``(sort, descending, limit)`` for the /api/restaurants and /api/areas query strings."""
+    sort = args.get('sort', default_sort)
+    if sort not in sorts:
+        raise QueryError(f"'sort' must be one of {', '.join(sorts)}.")
+    order = args.get('order', 'desc' if sort in DESCENDING_SORTS else 'asc')
+    if order not in ('asc', 'desc'):
+        raise QueryError("'order' must be asc or desc.")
+    limit = _number_arg(args, 'limit', int, DEFAULT_AGGREGATE_LIMIT)
+    if not 1 <= limit <= MAX_AGGREGATE_LIMIT:
+        raise QueryError(f"'limit' must be between 1 and {MAX_AGGREGATE_LIMIT}.")
+    return sort, order == 'desc', limit
+
+
+def restaurants(data_set: Dataset, args) -> dict:
+    """The /api/restaurants response: restaurants matching the filters, top ``limit`` by ``sort``."""
+    sort, descending, limit = _ranking_args(args, RESTAURANT_SORTS, 'medianPrice')
+    filters, _, _ = filter_args(args)
+    return data_set.aggregates.top_restaurants(filters, sort, descending, limit)
+
+
+def areas(data_set: Dataset, args) -> dict:
+    """The /api/areas response: areas, or (area, cuisine) cells for ``cuisines``, top ``limit`` by ``sort``."""
+    if not data_set.aggregates.has_area:
+        raise QueryError("The loaded data has no areas.")
+    sort, descending, limit = _ranking_args(args, AREA_SORTS, 'dishes')
+    return data_set.aggregates.top_areas(args.getlist('cuisines'), sort, descending, limit)
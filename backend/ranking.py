@@ -0,0 +1,176 @@
+# File: backend/ranking.py
+"""Ranked recommendations: weighted, one-dish-per-restaurant sampling.
+
+Each row's weight is its restaurant's quality (a rating shrunk towards the
+table mean by how few ratings it has) times how close its price is to the
+middle of the requested price range. Per filter, the candidates' weights
+are turned into a Walker alias table once and cached, after which every
+draw costs O(1).
+"""
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from cleaning import parse_column
+from menu_index import MenuIndex, _expand_ranges
+
+# Ratings count as this many votes of the table-wide mean rating, so a 5.0
+# from three people does not outrank a 4.4 from three thousand.
+PRIOR_VOTES = 50
+# Votes assumed for a rating whose count was not scraped.
+UNKNOWN_VOTES = PRIOR_VOTES
+RATING_SCALE = 5.0
+# Share of a row's weight that does not depend on its price; the rest
+# falls linearly from the middle of the price range to its ends.
+PRICE_WEIGHT_FLOOR = 0.25
+# Draws allowed per requested dish before giving up on finding more
+# distinct restaurants.
+DRAWS_PER_PICK = 32
+RANKED_CACHE_TAG = 'ranked'
+
+
+def build_alias(weights: np.ndarray):
+    """Return ``(prob, alias)``, the alias table for ``weights`` by Vose's construction.
+
+    Columns left over when one worklist runs out (all of them when the
+    weights are equal) only differ from 1 by rounding and keep prob 1.
+    """
+    n = len(weights)
+    total = float(np.sum(weights))
+    if not total > 0:
+        return np.ones(n), np.arange(n)
+    # Plain lists: the loop touches one element at a time, which numpy scalars make several times slower.
+    scaled = (np.asarray(weights, dtype=np.float64) * (n / total)).tolist()
+    prob = [1.0] * n
+    alias = list(range(n))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        column, donor = small.pop(), large[-1]
+        prob[column] = scaled[column]
+        alias[column] = donor
+        scaled[donor] = (scaled[donor] + scaled[column]) - 1.0
+        if scaled[donor] < 1.0:
+            small.append(large.pop())
+    return np.array(prob), np.array(alias, dtype=np.intp)
+
+
+class AliasTable:
+    """Candidate positions of one filter with their alias table."""
+
+    def __init__(self, positions: np.ndarray, weights: np.ndarray, restaurants: int):
+        self.positions = positions
+        self.restaurants = restaurants
+        if len(positions):
+            self.prob, self.alias = build_alias(weights)
+        else:
+            self.prob, self.alias = np.ones(0), np.zeros(0, dtype=np.intp)
+
+    def draw(self, size: int, rng: np.random.Generator) -> np.ndarray:
+        """Draw ``size`` candidate offsets in proportion to their weights."""
+        columns = rng.integers(0, len(self.prob), size=size)
+        keep = rng.random(size) < self.prob[columns]
+        return np.where(keep, columns, self.alias[columns])
+
+
+class MenuRanker:
+    """Precomputed per-row quality and price columns plus cached alias tables.
+
+    ``ratings`` optionally supplies restaurant ratings for tables that do not
+    carry them: a frame with ``Rating`` and ``Rating Count`` plus a ``URL``
+    or ``Restaurant_Name`` column to join on.
+    """
+
+    def __init__(self, df: pd.DataFrame, index: MenuIndex, ratings: Optional[pd.DataFrame] = None):
+        self.index = index
+        self.restaurant_codes, _ = pd.factorize(df['Restaurant_Name'])
+        self.prices = df['Price'].to_numpy(dtype=np.float64) if index.has_price else np.zeros(len(df))
+
+        rating, votes = _row_ratings(df, ratings)
+        rated = ~np.isnan(rating)
+        votes = np.where(rated, np.nan_to_num(votes, nan=UNKNOWN_VOTES), 0.0)
+        mean = float(np.average(rating[rated], weights=votes[rated] + 1)) if rated.any() else RATING_SCALE / 2
+        shrunk = (np.nan_to_num(rating) * votes + mean * PRIOR_VOTES) / (votes + PRIOR_VOTES)
+        self.quality = (shrunk / RATING_SCALE).astype(np.float64)
+        self.rated_rows = int(rated.sum())
+
+    def alias_table(self, filters: Dict[str, Sequence], min_price=None, max_price=None,
+                    cache=None) -> AliasTable:
+        """Return the alias table over the rows matching the query, cached per query."""
+        # The weights centre on the raw bounds, so they are part of the key, not just the rank window.
+        bounds = tuple(float(bound) if bound is not None else None for bound in (min_price, max_price))
+        key = self.index.query_key(filters, min_price, max_price) + (bounds, RANKED_CACHE_TAG)
+        compute = lambda: self._build(key, min_price, max_price)
+        if cache is None:
+            return compute()
+        return cache.get_or_compute(self.index.version, key, compute)
+
+    def _build(self, key: tuple, min_price, max_price) -> AliasTable:
+        lo, hi = self.index._ranges_for_key(key[:2])
+        positions = self.index.positions[_expand_ranges(lo, hi)]
+        if not len(positions):
+            return AliasTable(positions, np.zeros(0), 0)
+        prices = self.prices[positions]
+        low = float(min_price) if min_price is not None else float(prices.min())
+        high = float(max_price) if max_price is not None else float(prices.max())
+        middle, half_width = (low + high) / 2, (high - low) / 2
+        if half_width > 0:
+            closeness = np.clip(1.0 - np.abs(prices - middle) / half_width, 0.0, 1.0)
+        else:
+            closeness = np.ones(len(positions))
+        weights = self.quality[positions] * (PRICE_WEIGHT_FLOOR + (1 - PRICE_WEIGHT_FLOOR) * closeness)
+        restaurants = len(np.unique(self.restaurant_codes[positions]))
+        return AliasTable(positions, weights, restaurants)
+
+    def sample(self, filters: Dict[str, Sequence], min_price=None, max_price=None,
+               k: int = 5, seed: Optional[int] = None, cache=None) -> np.ndarray:
+        """Return up to ``k`` weighted draws, at most one per restaurant, best-weighted first.
+
+        Draws come in rounds of ``k`` from the alias table and a dish is
+        kept only if its restaurant has not been picked yet, so the cost is
+        O(k) per round whatever the number of candidates.
+        """
+        return self.draw(self.alias_table(filters, min_price, max_price, cache), k, seed)
+
+    def draw(self, table: AliasTable, k: int = 5, seed: Optional[int] = None) -> np.ndarray:
+        """``sample`` for a table already returned by ``alias_table``."""
+        wanted = min(k, table.restaurants)
+        rng = np.random.default_rng(seed)
+        picked, seen = [], set()
+        draws = 0
+        while len(picked) < wanted and draws < DRAWS_PER_PICK * wanted:
+            for offset in table.draw(wanted, rng):
+                restaurant = self.restaurant_codes[table.positions[offset]]
+                if restaurant not in seen:
+                    seen.add(restaurant)
+                    picked.append(table.positions[offset])
+                    if len(picked) == wanted:
+                        break
+            draws += wanted
+        picked = np.array(picked, dtype=np.int64)
+        return picked[np.argsort(-self.quality[picked], kind='stable')]
+
+
+def _row_ratings(df: pd.DataFrame, ratings: Optional[pd.DataFrame]):
+    """Return per-row ``(rating, votes)`` float arrays, NaN where unknown."""
+    if 'Rating' in df.columns:
+        source, rows = df, None
+    elif ratings is not None and len(ratings):
+        join = 'URL' if 'URL' in df.columns and 'URL' in ratings.columns else 'Restaurant_Name'
+        keys = ratings[join].astype(str).str.strip().str.lower()
+        source = ratings.assign(_key=keys).drop_duplicates('_key', keep='last')
+        rows = pd.Index(source['_key']).get_indexer(df[join].astype(str).str.strip().str.lower())
+    else:
+        nan = np.full(len(df), np.nan)
+        return nan, nan.copy()
+
+    rating = parse_column(source['Rating'], 'rating')[0].to_numpy(dtype=np.float64)
+    if 'Rating Count' in source.columns:
+        votes = parse_column(source['Rating Count'], 'count')[0].to_numpy(dtype=np.float64)
+    else:
+        votes = np.full(len(source), np.nan)
+    if rows is None:
+        return rating, votes
+    # Rows without a matching restaurant index -1, which picks the trailing NaN.
+    return np.append(rating, np.nan)[rows], np.append(votes, np.nan)[rows]
@@ -0,0 +1,197 @@
+import csv
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+from scraping_updated import FIELDNAMES
+
+# ─── Configuration ──────────────────────────────────────────────────────────────
+FSYNC_EVERY_RECORDS = 50
+FSYNC_EVERY_SECONDS = 10.0
+
+
+def dedupe_key(record: Dict) -> str:
+    """Restaurant URL when known, otherwise name plus area."""
+    if record.get("URL", "N/A") != "N/A":
+        return record["URL"].rstrip("/").lower()
+    return f"{record['Name'].lower()}|{record['Area'].lower()}"
+
+
+def content_hash(record: Dict) -> str:
+    """Hash of the listing fields, used to spot restaurants whose card changed."""
+    payload = "\x1f".join(str(record.get(field, "")) for field in FIELDNAMES)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class ScrapeCheckpoint:
+    """Append-only log of restaurants (key + content hash) and finished listings.
+
+    Each line is a JSON object; later lines win, so updating a restaurant's
+    hash or finishing a listing is a single append. Loading replays the log.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.hashes: Dict[str, str] = {}
+        self.listings = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line from a crash
+                    if "listing" in entry:
+                        self.listings.add(entry["listing"])
+                    else:
+                        self.hashes[entry["key"]] = entry["hash"]
+        self._file = open(path, "a", encoding="utf-8")
+
+    def mark(self, key: str, digest: str):
+        self.hashes[key] = digest
+        self._file.write(json.dumps({"key": key, "hash": digest}) + "\n")
+
+    def mark_listing(self, url: str):
+        self.listings.add(url)
+        self._file.write(json.dumps({"listing": url}) + "\n")
+
+    def flush(self, fsync: bool = True):
+        self._file.flush()
+        if fsync:
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+class RecordSink:
+    """Streams scraped records to an append-only CSV or JSONL file with a checkpoint.
+
+    In the default resume mode a record is written only if its restaurant is
+    not in the checkpoint yet, so a restarted run picks up where the last one
+    stopped. In refresh mode a record is written when its content hash
+    differs from the one recorded by the previous run, which yields just the
+    new and changed restaurants; on close the output is rewritten with one
+    row per restaurant, the latest. Output and checkpoint are flushed and
+    fsynced every FSYNC_EVERY_RECORDS records or FSYNC_EVERY_SECONDS seconds.
+    """
+
+    def __init__(self, output_path: str, checkpoint_path: Optional[str] = None, refresh: bool = False):
+        self.output_path = output_path
+        self.refresh = refresh
+        self.jsonl = output_path.endswith(".jsonl")
+        self.checkpoint = ScrapeCheckpoint(checkpoint_path or output_path + ".checkpoint")
+        self.written = 0
+        self.skipped_seen = 0
+        self.skipped_unchanged = 0
+        self._run_keys = set()
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+        new_file = not os.path.exists(output_path) or os.path.getsize(output_path) == 0
+        self._file = open(output_path, "a", newline="", encoding="utf-8")
+        if not self.jsonl:
+            self._writer = csv.DictWriter(self._file, fieldnames=FIELDNAMES, extrasaction="ignore")
+            if new_file:
+                self._writer.writeheader()
+
+    def listing_done(self, url: str) -> bool:
+        """True if a previous resume-mode run finished this listing."""
+        return not self.refresh and url in self.checkpoint.listings
+
+    def mark_listing(self, url: str):
+        self.checkpoint.mark_listing(url)
+        self.flush()
+
+    def offer(self, record: Dict) -> bool:
+        """Write ``record`` unless the checkpoint says it is already covered."""
+        key = dedupe_key(record)
+        if key in self._run_keys:
+            self.skipped_seen += 1
+            return False
+        self._run_keys.add(key)
+        digest = content_hash(record)
+        previous = self.checkpoint.hashes.get(key)
+        if previous is not None and not self.refresh:
+            self.skipped_seen += 1
+            return False
+        if previous == digest:
+            self.skipped_unchanged += 1
+            return False
+
+        if self.jsonl:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            self._writer.writerow(record)
+        self.checkpoint.mark(key, digest)
+        self.written += 1
+        self._unsynced += 1
+        if self._unsynced >= FSYNC_EVERY_RECORDS or time.monotonic() - self._last_sync >= FSYNC_EVERY_SECONDS:
+            self.flush()
+        return True
+
+    def flush(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.checkpoint.flush()
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _read_records(self):
+        with open(self.output_path, newline="", encoding="utf-8") as f:
+            if not self.jsonl:
+                yield from csv.DictReader(f)
+                return
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue  # torn last line from a crash
+
+    def compact(self) -> int:
+        """Rewrite the output with one row per restaurant: the latest, where the first one stood.
+
+        Returns the number of superseded rows dropped.
+        """
+        latest: Dict[str, Dict] = {}
+        rows = 0
+        for record in self._read_records():
+            latest[dedupe_key(record)] = record
+            rows += 1
+        if rows == len(latest):
+            return 0
+        temporary = self.output_path + ".tmp"
+        with open(temporary, "w", newline="", encoding="utf-8") as f:
+            if self.jsonl:
+                for record in latest.values():
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            else:
+                writer = csv.DictWriter(f, fieldnames=FIELDNAMES, extrasaction="ignore")
+                writer.writeheader()
+                writer.writerows(latest.values())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.output_path)
+        return rows - len(latest)
+
+    def close(self):
+        self.flush()
+        self._file.close()
+        self.checkpoint.close()
+        if self.refresh:
+            # A changed restaurant was appended after its old row; drop the old one.
+            dropped = self.compact()
+            if dropped:
+                logging.info(f"Output {self.output_path}: replaced {dropped} superseded rows")
+        logging.info(f"Output {self.output_path}: {self.written} written, {self.skipped_seen} already seen, "
+                     f"{self.skipped_unchanged} unchanged")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,111 @@
+import argparse
+import logging
+import multiprocessing
+import os
+from multiprocessing.util import Finalize
+from typing import Callable, Iterable, List, Optional
+
+from area_classifier import AREA_MAP
+from cleaning import clean_file
+from fetchers import FETCHERS, SeleniumFetcher, captured_pages
+from scrape_output import RecordSink
+from scraping_updated import OUTPUT_CSV
+
+# ─── Configuration ──────────────────────────────────────────────────────────────
+AREA_LISTING_URL = "https://www.zomato.com/pune/{slug}-restaurants"
+DEFAULT_WORKERS = 4
+
+
+# ─── Worker process ─────────────────────────────────────────────────────────────
+_fetcher = None
+
+
+def _init_worker(fetcher_factory: Callable):
+    """Create this worker's fetcher (its pooled browser) once, and close it on exit."""
+    global _fetcher
+    _fetcher = fetcher_factory()
+    Finalize(_fetcher, _fetcher.close, exitpriority=10)
+
+
+def _scrape_listing(url: str):
+    try:
+        return url, _fetcher.fetch(url), None
+    except Exception as e:
+        return url, [], str(e)
+
+
+# ─── Parent process ─────────────────────────────────────────────────────────────
+def area_listing_urls(slugs: Optional[Iterable[str]] = None, template: str = AREA_LISTING_URL) -> List[str]:
+    """Return one listing URL per area slug (every AREA_MAP slug by default)."""
+    return [template.format(slug=slug) for slug in (AREA_MAP if slugs is None else slugs)]
+
+
+def scrape_areas(urls: List[str], output_path: str, workers: int = DEFAULT_WORKERS,
+                 fetcher_factory: Callable = SeleniumFetcher, refresh: bool = False) -> int:
+    """Scrape ``urls`` across ``workers`` processes and append unique restaurants to ``output_path``.
+
+    Each worker owns one fetcher for its lifetime, so browsers are started
+    once per worker rather than once per listing. Records are merged in the
+    parent, deduplicated by restaurant URL and streamed to a ``RecordSink``
+    as each listing finishes. Listings finished by an earlier run are
+    skipped unless ``refresh`` is set, in which case every listing is
+    re-scraped and only new or changed restaurants are written. Returns the
+    number of restaurants written.
+    """
+    with RecordSink(output_path, refresh=refresh) as sink:
+        pending = [url for url in urls if not sink.listing_done(url)]
+        if len(pending) < len(urls):
+            logging.info(f"Resuming: {len(urls) - len(pending)} listings already done")
+        if not pending:
+            return 0
+        pool = multiprocessing.Pool(processes=max(1, min(workers, len(pending))),
+                                    initializer=_init_worker, initargs=(fetcher_factory,))
+        try:
+            for done, (url, records, error) in enumerate(pool.imap_unordered(_scrape_listing, pending), 1):
+                if error:
+                    logging.error(f"[{done}/{len(pending)}] {url} failed: {error}")
+                    continue
+                new_records = sum(sink.offer(record) for record in records)
+                sink.mark_listing(url)
+                logging.info(f"[{done}/{len(pending)}] {url}: {len(records)} found, {new_records} written, "
+                             f"{sink.written} total")
+            pool.close()
+        except BaseException:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+        return sink.written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape Zomato area listings in parallel.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--output", default=OUTPUT_CSV)
+    parser.add_argument("--backend", choices=sorted(FETCHERS), default="selenium",
+                        help="html parses pages without a browser; auto adds a Selenium fallback")
+    parser.add_argument("--url-template", default=AREA_LISTING_URL,
+                        help="listing URL with a {slug} placeholder, e.g. http://127.0.0.1:8000/{slug}.html")
+    parser.add_argument("--areas", nargs="*", help="area slugs to scrape (default: all of AREA_MAP)")
+    parser.add_argument("--captured", metavar="DIR",
+                        help="scrape the saved .html pages in DIR instead of live listings")
+    parser.add_argument("--refresh", action="store_true",
+                        help="re-scrape every listing and write only new or changed restaurants")
+    parser.add_argument("--restart", action="store_true", help="discard earlier output and checkpoint first")
+    parser.add_argument("--clean", metavar="CSV",
+                        help="also write the output with price, rating and rating count parsed to numbers")
+    args = parser.parse_args()
+
+    if args.restart:
+        for path in (args.output, args.output + ".checkpoint"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    listing_urls = captured_pages(args.captured) if args.captured else area_listing_urls(args.areas, args.url_template)
+    logging.info(f"Scraping {len(listing_urls)} listings with {args.workers} {args.backend} workers...")
+    total = scrape_areas(listing_urls, args.output, args.workers, FETCHERS[args.backend], args.refresh)
+    logging.info(f"Scraping completed. Wrote {total} unique restaurants to {args.output}.")
+    if args.clean:
+        for line in clean_file(args.output, args.clean).lines():
+            logging.info(f"Cleaning: {line}")
+        logging.info(f"Cleaned output saved to {args.clean}")
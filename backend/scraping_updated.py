@@ -1,8 +1,11 @@
-import csv
+import json
 import logging
+import re
 import time
-from typing import List, Dict
+from contextlib import contextmanager
+from typing import Callable, List, Dict, Optional
 
+import pandas as pd
 from selenium import webdriver
 from selenium.common.exceptions import (
     NoSuchElementException,
@@ -11,17 +14,70 @@ from selenium.common.exceptions import (
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from webdriver_manager.chrome import ChromeDriverManager
 
+from cleaning import clean_file, clean_frame
+
 # ─── Configuration ──────────────────────────────────────────────────────────────
 CITY_RESTAURANTS_URL = "https://www.zomato.com/pune/restaurants"  # Changed to broader Pune area
 OUTPUT_CSV = "pune_zomato_restaurants_updated.csv"
-SCROLL_PAUSE = 4.0  # seconds - increased for better loading
 MAX_SCROLL_LOOPS = 800  # even higher limit to capture ~738 restaurants
 TIMEOUT = 30  # increased timeout
+# Adaptive waiting after each scroll: poll for more cards with exponential
+# backoff, give up on a scroll after SCROLL_WAIT_BUDGET seconds, or earlier
+# once the DOM has been quiet for DOM_QUIET_PERIOD seconds.
+SCROLL_WAIT_BUDGET = 8.0
+DOM_QUIET_PERIOD = 1.5
+INITIAL_POLL_INTERVAL = 0.1
+MAX_POLL_INTERVAL = 1.6
+NO_CHANGE_LIMIT = 6  # consecutive scrolls without new cards before the final check
+FINAL_CHECK_BUDGET = 20.0
+METRICS_JSON = "scrape_metrics.json"
+
+# Card selectors, tried in order until one matches restaurant-like elements
+CARD_SELECTORS = [
+    # Modern Zomato selectors
+    "div[data-testid='restaurant-card']",
+    "[data-testid='res-card']",
+    ".sc-1mo3ldo-0",
+    ".sc-1s0saks-17",
+    
+    # Generic restaurant card selectors
+    "div[class*='restaurant']",
+    "div[class*='card']",
+    "article",
+    "div[role='article']",
+    
+    # Fallback selectors
+    "a[href*='/restaurant/']",
+    "div.col-s-16",
+    ".res-card",
+    
+    # Very generic fallback
+    "div[class*='sc-']"
+]
+# Visible text of a card must contain one of these to count as a restaurant
+CARD_KEYWORDS = ['₹', 'cuisine', 'delivery', 'rating', 'min']
+NAME_SELECTOR = "h1, h2, h3, h4, h5, h6, a[href*='/restaurant/']"
+# "bulk" reads every card in one execute_script call; "element" walks WebElements
+EXTRACTION_MODE = "bulk"
+
+# ─── Card parsing rules ─────────────────────────────────────────────────────────
+RATING_RE = re.compile(r'\b([1-5]\.\d)\b')
+AREA_RE = re.compile(r'([A-Za-z\s]+),\s*Pune')
+RATING_COUNT_RE = re.compile(r'(\d+\.?\d*k?)\s*rating')
+AREA_HINTS = ('pune', 'baner', 'wakad', 'aundh', 'hinjawadi')
+CUISINE_INDICATORS = (
+    'north indian', 'south indian', 'chinese', 'italian', 'continental',
+    'pizza', 'biryani', 'kebab', 'seafood', 'desserts', 'beverages',
+    'mughlai', 'punjabi', 'gujarati', 'maharashtrian', 'bengali',
+    'asian', 'american', 'mexican', 'thai', 'japanese', 'korean',
+    'cafe', 'bakery', 'fast food', 'street food', 'bar food'
+)
+AVAILABILITY_KEYWORDS = ('delivery', 'dine', 'takeaway', 'pickup', 'open', 'closed', 'temporarily closed')
+FIELDNAMES = ["Name", "URL", "Area", "Cuisine", "Rating", "Rating Count", "Price", "Availability"]
 
 # ─── Logging Setup ──────────────────────────────────────────────────────────────
 logging.basicConfig(
@@ -51,29 +107,13 @@ def init_driver(headless: bool = False) -> webdriver.Chrome:
     return driver
 
 
-def find_restaurant_elements(driver):
-    """Try to find restaurant elements using various selectors."""
-    possible_selectors = [
-        # Modern Zomato selectors
-        "div[data-testid='restaurant-card']",
-        "[data-testid='res-card']",
-        ".sc-1mo3ldo-0",
-        ".sc-1s0saks-17",
-        
-        # Generic restaurant card selectors
-        "div[class*='restaurant']",
-        "div[class*='card']",
-        "article",
-        "div[role='article']",
-        
-        # Fallback selectors
-        "a[href*='/restaurant/']",
-        "div.col-s-16",
-        ".res-card",
-        
-        # Very generic fallback
-        "div[class*='sc-']"
-    ]
+def find_restaurant_elements(driver, preferred_selector: Optional[str] = None):
+    """Try to find restaurant elements using various selectors.
+
+    ``preferred_selector`` (the one that worked earlier in the run) is tried
+    first, so the full list is only walked until a selector is discovered.
+    """
+    possible_selectors = _selectors_to_try(preferred_selector)
     
     for selector in possible_selectors:
         try:
@@ -86,7 +126,7 @@ def find_restaurant_elements(driver):
                     try:
                         text = el.text.lower()
                         # Check if element contains restaurant-like content
-                        if any(keyword in text for keyword in ['₹', 'cuisine', 'delivery', 'rating', 'min']):
+                        if any(keyword in text for keyword in CARD_KEYWORDS):
                             restaurant_elements.append(el)
                     except:
                         continue
@@ -101,10 +141,95 @@ def find_restaurant_elements(driver):
     return [], None
 
 
+def _selectors_to_try(preferred_selector: Optional[str] = None) -> List[str]:
+    if not preferred_selector:
+        return list(CARD_SELECTORS)
+    return [preferred_selector] + [s for s in CARD_SELECTORS if s != preferred_selector]
+
+
+# Returns, as one JSON string, every keyword-matching card among the
+# elements matching arguments[0] from index arguments[3] on, plus the total
+# number of matching elements so the next call can start where this stopped.
+_BULK_CARDS_JS = """
+const keywords = arguments[1], nameSelector = arguments[2], cards = [];
+const all = document.querySelectorAll(arguments[0]);
+for (let i = arguments[3] || 0; i < all.length; i++) {
+    const el = all[i];
+    const text = el.innerText || '';
+    const lower = text.toLowerCase();
+    if (!keywords.some(k => lower.includes(k))) continue;
+    const heading = el.querySelector(nameSelector);
+    const link = el.querySelector('a[href]');
+    const hrefs = [];
+    if (el.tagName === 'A' && el.href) hrefs.push(el.href);
+    if (link) hrefs.push(link.href);
+    cards.push({text: text, headings: heading ? [heading.innerText] : [], hrefs: hrefs});
+}
+return JSON.stringify({total: all.length, cards: cards});
+"""
+
+
+def read_cards(driver, selector: str, start: int = 0):
+    """Return ``(cards, total)`` for elements ``start:`` of ``selector`` in one round trip."""
+    result = json.loads(driver.execute_script(_BULK_CARDS_JS, selector, CARD_KEYWORDS, NAME_SELECTOR, start))
+    return result["cards"], result["total"]
+
+
+def find_restaurant_cards(driver, preferred_selector: Optional[str] = None):
+    """Bulk counterpart of ``find_restaurant_elements``.
+
+    Returns ``(cards, selector)`` where each card is a dict with ``text``,
+    ``headings`` and ``hrefs``, read for all cards in one ``execute_script``
+    round trip per selector tried instead of several per element.
+    """
+    for selector in _selectors_to_try(preferred_selector):
+        try:
+            cards, _ = read_cards(driver, selector)
+        except Exception as e:
+            logging.debug(f"Selector {selector} failed: {e}")
+            continue
+        if cards:
+            logging.info(f"Found {len(cards)} restaurant-like cards with selector: {selector}")
+            return cards, selector
+    return [], None
+
+
+def parse_restaurant_cards(cards: List[Dict]) -> List[Dict]:
+    """Parse bulk-extracted cards, keeping those with a usable name."""
+    restaurants = []
+    for card in cards:
+        data = parse_restaurant_card(card["text"], card["headings"], card["hrefs"])
+        if data["Name"] != "N/A" and len(data["Name"]) > 2:
+            restaurants.append(data)
+    return restaurants
+
+
 def extract_restaurant_data(element) -> Dict:
     """Extract restaurant data from an element."""
+    try:
+        full_text = element.text
+        # Restaurant name is usually the first heading
+        name_elements = element.find_elements(By.CSS_SELECTOR, NAME_SELECTOR)
+        headings = [name_elements[0].text] if name_elements else []
+        links = element.find_elements(By.CSS_SELECTOR, "a[href]")
+        hrefs = [link.get_attribute("href") for link in links[:1]]
+        if element.tag_name == "a":
+            hrefs.insert(0, element.get_attribute("href"))
+    except Exception as e:
+        logging.error(f"Error extracting data: {e}")
+        return parse_restaurant_card("", [], [])
+    return parse_restaurant_card(full_text, headings, hrefs)
+
+
+def parse_restaurant_card(full_text: str, headings: List[str], hrefs: List[str]) -> Dict:
+    """Parse one card's visible text, heading texts and link hrefs into a record.
+
+    This is the contract every fetch backend feeds: the Selenium path reads
+    these three pieces from a live element, offline backends from HTML.
+    """
     data = {
         "Name": "N/A",
+        "URL": "N/A",
         "Area": "N/A", 
         "Cuisine": "N/A",
         "Rating": "N/A",
@@ -115,15 +240,20 @@ def extract_restaurant_data(element) -> Dict:
     
     try:
         # Get all text content
-        full_text = element.text.strip()
+        full_text = full_text.strip()
         lines = [line.strip() for line in full_text.split('\n') if line.strip()]
         
         # Extract restaurant name (usually the first heading)
-        name_elements = element.find_elements(By.CSS_SELECTOR, "h1, h2, h3, h4, h5, h6, a[href*='/restaurant/']")
-        if name_elements:
-            name = name_elements[0].text.strip()
+        if headings:
+            name = headings[0].strip()
             if name and len(name) > 1:
                 data["Name"] = name
+
+        # Restaurant page URL, used to deduplicate across listings
+        for href in hrefs:
+            if href:
+                data["URL"] = href.split('?')[0]
+                break
         
         # Parse lines to extract structured data
         for i, line in enumerate(lines):
@@ -131,8 +261,7 @@ def extract_restaurant_data(element) -> Dict:
             
             # Extract rating (look for decimal numbers between 1-5)
             if data["Rating"] == "N/A" and any(char.isdigit() for char in line):
-                import re
-                rating_match = re.search(r'\b([1-5]\.\d)\b', line)
+                rating_match = RATING_RE.search(line)
                 if rating_match:
                     data["Rating"] = rating_match.group(1)
             
@@ -141,23 +270,15 @@ def extract_restaurant_data(element) -> Dict:
                 data["Price"] = line.strip()
             
             # Extract area/location (lines containing city names and distance)
-            if any(city in line_lower for city in ['pune', 'baner', 'wakad', 'aundh', 'hinjawadi']):
+            if any(city in line_lower for city in AREA_HINTS):
                 if 'km' in line_lower or 'm' in line:
                     # This line likely contains area info
-                    area_match = re.search(r'([A-Za-z\s]+),\s*Pune', line)
+                    area_match = AREA_RE.search(line)
                     if area_match:
                         data["Area"] = area_match.group(1).strip()
             
             # Extract cuisine (look for common cuisine patterns)
-            cuisine_indicators = [
-                'north indian', 'south indian', 'chinese', 'italian', 'continental',
-                'pizza', 'biryani', 'kebab', 'seafood', 'desserts', 'beverages',
-                'mughlai', 'punjabi', 'gujarati', 'maharashtrian', 'bengali',
-                'asian', 'american', 'mexican', 'thai', 'japanese', 'korean',
-                'cafe', 'bakery', 'fast food', 'street food', 'bar food'
-            ]
-            
-            if data["Cuisine"] == "N/A" and any(cuisine in line_lower for cuisine in cuisine_indicators):
+            if data["Cuisine"] == "N/A" and any(cuisine in line_lower for cuisine in CUISINE_INDICATORS):
                 # Check if this line contains multiple cuisines (comma-separated)
                 if ',' in line and len(line) < 200:  # Reasonable length for cuisine list
                     # This might be a cuisine line
@@ -166,8 +287,7 @@ def extract_restaurant_data(element) -> Dict:
                         data["Cuisine"] = line.strip()
             
             # Extract availability info
-            availability_keywords = ['delivery', 'dine', 'takeaway', 'pickup', 'open', 'closed', 'temporarily closed']
-            if any(keyword in line_lower for keyword in availability_keywords):
+            if any(keyword in line_lower for keyword in AVAILABILITY_KEYWORDS):
                 if data["Availability"] == "N/A":
                     data["Availability"] = line.strip()
                 else:
@@ -177,8 +297,7 @@ def extract_restaurant_data(element) -> Dict:
         rating_text = " ".join(lines)
         if data["Rating"] != "N/A":
             # Look for rating count patterns near the rating
-            import re
-            rating_count_match = re.search(r'(\d+\.?\d*k?)\s*rating', rating_text.lower())
+            rating_count_match = RATING_COUNT_RE.search(rating_text.lower())
             if rating_count_match:
                 data["Rating Count"] = rating_count_match.group(1)
         
@@ -194,22 +313,142 @@ def extract_restaurant_data(element) -> Dict:
     return data
 
 
-def scrape_restaurants(url: str) -> List[Dict]:
-    """Scrape restaurants from Zomato."""
-    driver = init_driver(headless=True)  # Use headless mode for faster execution
+class ScrapeMetrics:
+    """Wall-clock accounting for one scrape run: time per phase plus wait outcomes."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.wait_durations: List[float] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, name: str, n: int = 1):
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def as_dict(self) -> Dict:
+        waits = sorted(self.wait_durations)
+        return {
+            "total_seconds": round(time.perf_counter() - self.started, 3),
+            "phase_seconds": {name: round(value, 3) for name, value in self.phases.items()},
+            "counts": dict(self.counts),
+            "waits": {
+                "n": len(waits),
+                "total_seconds": round(sum(waits), 3),
+                "p50_seconds": round(waits[len(waits) // 2], 3) if waits else None,
+                "max_seconds": round(waits[-1], 3) if waits else None,
+            },
+        }
+
+    def log_summary(self):
+        logging.info(f"Scrape metrics: {json.dumps(self.as_dict())}")
+
+
+# Installed once per page: records when the DOM last changed.
+_INSTALL_MUTATION_OBSERVER = """
+if (!window.__kkLastMutation) {
+    window.__kkLastMutation = performance.now();
+    new MutationObserver(function () { window.__kkLastMutation = performance.now(); })
+        .observe(document.body, {childList: true, subtree: true});
+}
+"""
+_CARD_COUNT_AND_QUIET = """
+return [document.querySelectorAll(arguments[0]).length,
+        (performance.now() - (window.__kkLastMutation || 0)) / 1000];
+"""
+
+
+def wait_for_new_cards(driver, selector: str, previous_count: int, budget: float,
+                       metrics: Optional[ScrapeMetrics] = None) -> int:
+    """Wait until ``selector`` matches more than ``previous_count`` elements.
+
+    Polls with exponential backoff (one script round trip per poll) and
+    returns the current count as soon as it grows, once the DOM has been
+    quiet for DOM_QUIET_PERIOD, or when ``budget`` seconds have passed.
+    """
+    start = time.perf_counter()
+    deadline = start + budget
+    interval = INITIAL_POLL_INTERVAL
+    outcome = "timeout"
+    while True:
+        count, quiet_for = driver.execute_script(_CARD_COUNT_AND_QUIET, selector)
+        if count > previous_count:
+            outcome = "grew"
+            break
+        now = time.perf_counter()
+        if quiet_for >= DOM_QUIET_PERIOD and now - start >= DOM_QUIET_PERIOD:
+            outcome = "quiet"
+            break
+        if now >= deadline:
+            break
+        time.sleep(min(interval, deadline - now))
+        interval = min(interval * 2, MAX_POLL_INTERVAL)
+    if metrics is not None:
+        metrics.wait_durations.append(time.perf_counter() - start)
+        metrics.count(f"wait_{outcome}")
+    return count
+
+
+class ScrapeError(RuntimeError):
+    """A listing that could not be scraped to the end."""
+
+
+def scrape_restaurants(url: str, driver=None, metrics: Optional[ScrapeMetrics] = None,
+                       extraction_mode: str = EXTRACTION_MODE,
+                       on_record: Optional[Callable[[Dict], None]] = None,
+                       raise_errors: bool = False) -> List[Dict]:
+    """Scrape restaurants from Zomato.
+
+    Pass ``driver`` to reuse a browser owned by the caller (for example one
+    from a worker pool); it is left open. Otherwise a headless driver is
+    started for this call and quit at the end. ``extraction_mode`` picks
+    bulk (one script call for all cards) or per-element card extraction.
+
+    With ``on_record`` every record is handed over as soon as it is parsed
+    and nothing is accumulated, so the returned list is empty; in bulk mode
+    newly loaded cards are harvested after every scroll that added some,
+    so a crash mid-scroll loses at most the cards of one scroll.
+
+    Errors are logged and end the scrape with what was found so far, unless
+    ``raise_errors`` is set: then they propagate, and a page with no cards
+    raises ScrapeError, so callers can tell a finished listing from a
+    failed one.
+    """
+    bulk = extraction_mode == "bulk"
+    streaming = on_record is not None
+    harvested = 0
+    find_cards = find_restaurant_cards if bulk else find_restaurant_elements
+    owns_driver = driver is None
+    if owns_driver:
+        driver = init_driver(headless=True)  # Use headless mode for faster execution
     
+    metrics = metrics if metrics is not None else ScrapeMetrics()
     try:
         logging.info(f"Navigating to: {url}")
-        driver.get(url)
-        
-        # Wait for page to load
-        time.sleep(8)  # increased initial wait time
+        with metrics.phase("page_load"):
+            driver.get(url)
         
         logging.info(f"Current URL: {driver.current_url}")
         logging.info(f"Page title: {driver.title}")
         
-        # Try to find restaurant elements
-        restaurant_elements, selector = find_restaurant_elements(driver)
+        # Wait for the first cards instead of sleeping a fixed time, backing off between tries
+        restaurant_elements, selector = [], None
+        with metrics.phase("first_cards"):
+            deadline = time.perf_counter() + TIMEOUT
+            interval = INITIAL_POLL_INTERVAL * 5
+            while True:
+                restaurant_elements, selector = find_cards(driver)
+                if restaurant_elements or time.perf_counter() >= deadline:
+                    break
+                time.sleep(interval)
+                interval = min(interval * 2, MAX_POLL_INTERVAL * 2)
         
         if not restaurant_elements:
             logging.error("No restaurant elements found")
@@ -217,139 +456,173 @@ def scrape_restaurants(url: str) -> List[Dict]:
             with open("page_source.html", "w", encoding="utf-8") as f:
                 f.write(driver.page_source)
             logging.info("Page source saved to page_source.html for debugging")
+            if raise_errors:
+                raise ScrapeError(f"No restaurant cards found at {url}")
             return []
         
         # Scroll to load ALL content - continue until absolutely no new content
-        logging.info(f"Found {len(restaurant_elements)} initial elements, scrolling extensively to load ALL restaurants...")
+        logging.info(f"Found {len(restaurant_elements)} initial elements with {selector}, scrolling to load ALL restaurants...")
+        driver.execute_script(_INSTALL_MUTATION_OBSERVER)
         
-        previous_count = len(restaurant_elements)
+        previous_count = driver.execute_script(_CARD_COUNT_AND_QUIET, selector)[0]
         no_change_count = 0
         scroll_attempts = 0
         
-        while scroll_attempts < MAX_SCROLL_LOOPS:
-            # Multiple scrolling techniques to ensure all content loads
-            
-            # Primary scrolling method - scroll to bottom
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(SCROLL_PAUSE)
-            
-            # Secondary scrolling - gradual scroll by large increments
-            if scroll_attempts % 3 == 0:
-                driver.execute_script("window.scrollBy(0, 2000);")
-                time.sleep(2)
-            
-            # Tertiary scrolling - scroll to specific positions
-            if scroll_attempts % 5 == 0:
-                driver.execute_script("window.scrollBy(0, 1500);")
-                time.sleep(1.5)
-            
-            # Press Page Down to trigger different loading mechanisms
-            if scroll_attempts % 8 == 0:
-                try:
-                    driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.PAGE_DOWN)
-                    time.sleep(1)
-                    driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.PAGE_DOWN)
-                    time.sleep(1)
-                except:
-                    pass
-            
-            # Additional aggressive scrolling every 10 attempts
-            if scroll_attempts % 10 == 0:
-                # Scroll to different parts of the page
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight * 0.8);")
-                time.sleep(1)
+        with metrics.phase("scrolling"):
+            while scroll_attempts < MAX_SCROLL_LOOPS:
                 driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-                
-            # Extra wait time every 20 scrolls to allow content to load
-            if scroll_attempts % 20 == 0:
-                logging.info(f"Extended pause at scroll {scroll_attempts} to allow content loading...")
-                time.sleep(6)
-            
-            scroll_attempts += 1
-            
-            # Check for new elements every scroll (more frequent checking)
-            if scroll_attempts % 1 == 0:
-                current_elements, _ = find_restaurant_elements(driver)
-                current_count = len(current_elements) if current_elements else 0
+                # Every few fruitless scrolls, nudge up and down again to re-trigger lazy loading
+                if no_change_count and no_change_count % 3 == 0:
+                    driver.execute_script("window.scrollBy(0, -1500); window.scrollTo(0, document.body.scrollHeight);")
+                scroll_attempts += 1
+                metrics.count("scrolls")
                 
+                current_count = wait_for_new_cards(driver, selector, previous_count, SCROLL_WAIT_BUDGET, metrics)
                 if current_count > previous_count:
                     logging.info(f"Scroll {scroll_attempts}: Found {current_count} elements (+{current_count - previous_count})")
                     previous_count = current_count
                     no_change_count = 0
-                else:
-                    no_change_count += 1
-                    
-                # Only stop if no new elements found for many consecutive attempts
-                # Increased threshold to be more aggressive in searching
-                if no_change_count >= 30:  # wait for 30 scrolls with no change
+                    if bulk and streaming:
+                        with metrics.phase("extraction"):
+                            cards, harvested = read_cards(driver, selector, harvested)
+                            for record in parse_restaurant_cards(cards):
+                                on_record(record)
+                    continue
+                no_change_count += 1
+                
+                if no_change_count >= NO_CHANGE_LIMIT:
                     logging.info(f"No new elements found for {no_change_count} scrolls. Performing final deep check...")
-                    
-                    # Triple-check by scrolling more extensively
-                    for extra_scroll in range(20):
-                        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                        time.sleep(3)
-                        if extra_scroll % 5 == 0:
-                            driver.execute_script("window.scrollBy(0, 3000);")
-                            time.sleep(2)
-                    
-                    final_elements, _ = find_restaurant_elements(driver)
-                    final_count = len(final_elements) if final_elements else 0
-                    
-                    if final_count == current_count:
+                    driver.execute_script("window.scrollBy(0, 3000); window.scrollTo(0, document.body.scrollHeight);")
+                    final_count = wait_for_new_cards(driver, selector, previous_count, FINAL_CHECK_BUDGET, metrics)
+                    if final_count <= previous_count:
                         logging.info(f"Confirmed: Reached end of page with {final_count} total elements")
                         break
-                    else:
-                        logging.info(f"Found more elements after extra scrolling: {final_count}")
-                        previous_count = final_count
-                        no_change_count = 0
+                    logging.info(f"Found more elements after extra scrolling: {final_count}")
+                    previous_count = final_count
+                    no_change_count = 0
+        
+        if bulk and streaming:
+            with metrics.phase("extraction"):
+                cards, harvested = read_cards(driver, selector, harvested)
+                for record in parse_restaurant_cards(cards):
+                    on_record(record)
+            logging.info(f"After exhaustive scrolling: streamed cards from {harvested} elements")
+            return []
         
         # Final element count
-        restaurant_elements, _ = find_restaurant_elements(driver)
+        with metrics.phase("find_elements"):
+            restaurant_elements, _ = find_cards(driver, selector)
         logging.info(f"After exhaustive scrolling: {len(restaurant_elements)} total elements")
         
+        if bulk:
+            with metrics.phase("extraction"):
+                restaurants = parse_restaurant_cards(restaurant_elements)
+            logging.info(f"Parsed {len(restaurants)} restaurants from {len(restaurant_elements)} cards")
+            return restaurants
+        
         # Extract data from ALL elements (no limit)
         restaurants = []
         total_elements = len(restaurant_elements)
         logging.info(f"Processing all {total_elements} restaurant elements...")
         
-        for i, element in enumerate(restaurant_elements):
-            try:
-                data = extract_restaurant_data(element)
-                if data["Name"] != "N/A" and len(data["Name"]) > 2:
-                    restaurants.append(data)
-                    if (i + 1) % 10 == 0:  # Log every 10 processed
-                        logging.info(f"Processed {i+1}/{total_elements}: {data['Name']}")
-            except Exception as e:
-                logging.error(f"Error processing element {i}: {e}")
-                continue
+        with metrics.phase("extraction"):
+            for i, element in enumerate(restaurant_elements):
+                try:
+                    data = extract_restaurant_data(element)
+                    if data["Name"] != "N/A" and len(data["Name"]) > 2:
+                        if streaming:
+                            on_record(data)
+                        else:
+                            restaurants.append(data)
+                        if (i + 1) % 10 == 0:  # Log every 10 processed
+                            logging.info(f"Processed {i+1}/{total_elements}: {data['Name']}")
+                except Exception as e:
+                    logging.error(f"Error processing element {i}: {e}")
+                    continue
         
         return restaurants
         
     except Exception as e:
         logging.error(f"Error in scrape_restaurants: {e}")
+        if raise_errors:
+            raise
         return []
     
     finally:
-        driver.quit()
+        metrics.log_summary()
+        if owns_driver:
+            driver.quit()
 
 
 def save_to_csv(restaurants: List[Dict], filename: str):
-    """Save restaurants data to CSV."""
+    """Save restaurants data to CSV, with price, rating and rating count parsed to numbers."""
     if not restaurants:
         logging.warning("No restaurant data to save.")
         return
 
-    keys = restaurants[0].keys()
-    with open(filename, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=keys)
-        writer.writeheader()
-        writer.writerows(restaurants)
+    cleaned, report = clean_frame(pd.DataFrame(restaurants, columns=list(restaurants[0].keys())))
+    for line in report.lines():
+        logging.info(f"Cleaning: {line}")
+    cleaned.to_csv(filename, index=False, encoding="utf-8")
     logging.info(f"Data saved to {filename}")
 
 
 if __name__ == "__main__":
+    import argparse
+    from fetchers import FETCHERS, captured_pages
+    from scrape_output import RecordSink
+
+    parser = argparse.ArgumentParser(description="Scrape Zomato restaurants for Pune.")
+    parser.add_argument("--output", default=OUTPUT_CSV, help="append-only .csv or .jsonl output")
+    parser.add_argument("--refresh", action="store_true",
+                        help="write only restaurants that are new or whose card changed since the last run")
+    parser.add_argument("--backend", choices=sorted(FETCHERS), default="selenium",
+                        help="html parses pages without a browser; auto adds a Selenium fallback")
+    parser.add_argument("--captured", metavar="DIR",
+                        help="parse the saved .html pages in DIR instead of the live listing")
+    parser.add_argument("--clean", metavar="CSV",
+                        help="also write the output with price, rating and rating count parsed to numbers")
+    args = parser.parse_args()
+
     logging.info("Starting Zomato scraper...")
-    data = scrape_restaurants(CITY_RESTAURANTS_URL)
-    save_to_csv(data, OUTPUT_CSV)
-    logging.info(f"Scraping completed. Found {len(data)} restaurants.")
+    run_metrics = ScrapeMetrics()
+    with RecordSink(args.output, refresh=args.refresh) as sink:
+        if args.backend == "selenium" and not args.captured:
+            if sink.listing_done(CITY_RESTAURANTS_URL):
+                logging.info(f"Resuming: {CITY_RESTAURANTS_URL} already done")
+            else:
+                try:
+                    scrape_restaurants(CITY_RESTAURANTS_URL, metrics=run_metrics, on_record=sink.offer,
+                                       raise_errors=True)
+                except Exception as e:
+                    # Records streamed so far are kept; the listing is scraped again next run.
+                    logging.error(f"{CITY_RESTAURANTS_URL} failed: {e}")
+                else:
+                    sink.mark_listing(CITY_RESTAURANTS_URL)
+        else:
+            pages = captured_pages(args.captured) if args.captured else [CITY_RESTAURANTS_URL]
+            pending = [page for page in pages if not sink.listing_done(page)]
+            if len(pending) < len(pages):
+                logging.info(f"Resuming: {len(pages) - len(pending)} listings already done")
+            fetcher = FETCHERS[args.backend]()
+            try:
+                for page in pending:
+                    with run_metrics.phase("fetch"):
+                        try:
+                            records = fetcher.fetch(page)
+                        except Exception as e:
+                            logging.error(f"{page} failed: {e}")
+                            continue
+                        for record in records:
+                            sink.offer(record)
+                    sink.mark_listing(page)
+                    run_metrics.count("pages")
+            finally:
+                fetcher.close()
+    with open(METRICS_JSON, "w", encoding="utf-8") as f:
+        json.dump(run_metrics.as_dict(), f, indent=2)
+    logging.info(f"Scraping completed. Wrote {sink.written} restaurants.")
+    if args.clean:
+        for line in clean_file(args.output, args.clean).lines():
+            logging.info(f"Cleaning: {line}")
+        logging.info(f"Cleaned output saved to {args.clean}")
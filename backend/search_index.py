@@ -0,0 +1,271 @@
+# File: backend/search_index.py
+"""Prefix and typo-tolerant search over dish and restaurant names.
+
+Every distinct name is a document. Prefix matching uses a sorted array of
+the name text starting at each word, so a query selects one contiguous
+range of it by binary search whatever the table size. Misspelt words are
+corrected against the vocabulary through a trigram inverted index, and
+the corrected phrases are looked up the same way.
+"""
+import itertools
+import re
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from menu_index import MenuIndex
+
+# Searchable columns and the result type each one produces.
+SEARCH_COLUMNS = {'Item_Name': 'item', 'Restaurant_Name': 'restaurant'}
+MIN_QUERY_LENGTH = 2
+NON_WORD_RE = re.compile(r'[\W_]+')
+SEPARATOR = 0
+SPACE = ord(' ')
+# Bytes of each word-start suffix kept in the sorted key array; longer
+# queries are looked up by their first KEY_WIDTH bytes and then verified.
+KEY_WIDTH = 16
+# Prefix matches (names with rows under the filters) collected per looked-up
+# phrase; the prefix range is read this many entries at a time.
+MAX_SCAN = 2000
+# Spellings tried for a misspelt word, and corrected phrases tried in all.
+CORRECTIONS_PER_WORD = 3
+MAX_VARIANTS = 6
+# A name equal to the query, starting with it, or with a word starting
+# with it; matches of a corrected phrase score at least CORRECTION_PENALTY less.
+EXACT_SCORE, NAME_PREFIX_SCORE, WORD_PREFIX_SCORE = 3.0, 2.0, 1.0
+CORRECTION_PENALTY = 0.5
+
+
+def normalize(text) -> str:
+    """Lower-case ``text`` and reduce it to words separated by single spaces."""
+    return NON_WORD_RE.sub(' ', str(text).lower()).strip()
+
+
+def allowed_typos(word: str) -> int:
+    """Edits tolerated in a word of this length."""
+    if len(word) <= 3:
+        return 0
+    return 1 if len(word) <= 7 else 2
+
+
+def _trigrams(data: np.ndarray) -> np.ndarray:
+    """Byte trigram codes of ``data`` (uint8), one per starting offset."""
+    data = data.astype(np.int64)
+    return (data[:-2] << 16) | (data[1:-1] << 8) | data[2:]
+
+
+def word_trigrams(word: str, prefix: bool = False) -> np.ndarray:
+    """Distinct trigrams of ``word`` padded with spaces; no trailing pad for a ``prefix``."""
+    data = np.frombuffer(f" {word}{'' if prefix else ' '}".encode('utf-8'), dtype=np.uint8)
+    if len(data) < 3:
+        return np.zeros(0, dtype=np.int64)
+    return np.unique(_trigrams(data))
+
+
+class TrigramIndex:
+    """Trigram inverted index over a list of words, in CSR form.
+
+    Words are padded with spaces so their starts and ends are trigrams of
+    their own; postings are built without a Python loop over the words.
+    """
+
+    def __init__(self, words: List[str]):
+        self.words = words
+        padded = [f' {word} '.encode('utf-8') for word in words]
+        lengths = np.array([len(text) for text in padded], dtype=np.int64)
+        data = np.frombuffer(bytes([SEPARATOR]).join(padded), dtype=np.uint8)
+        if len(data) < 3:
+            self.keys = np.zeros(0, dtype=np.int64)
+            self.offsets = np.zeros(1, dtype=np.int64)
+            self.postings = np.zeros(0, dtype=np.int32)
+            return
+        grams = _trigrams(data)
+        valid = (data[:-2] != SEPARATOR) & (data[1:-1] != SEPARATOR) & (data[2:] != SEPARATOR)
+        starts = np.cumsum(lengths + 1) - (lengths + 1)
+        ids = np.searchsorted(starts, np.arange(len(grams)), side='right') - 1
+        pairs = np.unique((grams[valid] << 32) | ids[valid])
+        keys, self.postings = pairs >> 32, (pairs & 0xFFFFFFFF).astype(np.int32)
+        self.keys, first = np.unique(keys, return_index=True)
+        self.offsets = np.append(first, len(keys)).astype(np.int64)
+
+    def posting(self, gram: int) -> np.ndarray:
+        i = np.searchsorted(self.keys, gram)
+        if i == len(self.keys) or self.keys[i] != gram:
+            return self.postings[:0]
+        return self.postings[self.offsets[i]:self.offsets[i + 1]]
+
+    def similar(self, word: str, prefix: bool = False, limit: int = CORRECTIONS_PER_WORD) -> List[tuple]:
+        """Return up to ``limit`` ``(word, similarity)`` pairs within the typo budget of ``word``.
+
+        Each edit breaks at most three trigrams, so a candidate must share
+        all but three per allowed typo. Candidates are ranked by shared
+        trigrams, then by closeness in length.
+        """
+        grams = word_trigrams(word, prefix)
+        lists = [self.posting(gram) for gram in grams]
+        if not any(len(posting) for posting in lists):
+            return []
+        need = max(1, len(grams) - 3 * allowed_typos(word))
+        ids, shared = np.unique(np.concatenate(lists), return_counts=True)
+        keep = shared >= need
+        ranked = sorted(zip(ids[keep].tolist(), shared[keep].tolist()),
+                        key=lambda item: (-item[1], abs(len(self.words[item[0]]) - len(word))))
+        return [(self.words[i], n / len(grams)) for i, n in ranked[:limit]]
+
+
+class MenuSearch:
+    """Search over the distinct names of ``SEARCH_COLUMNS``, mapped back to their rows.
+
+    ``keys`` holds, sorted, the first KEY_WIDTH bytes of the normalised text
+    starting at every word of every name (names are joined by NUL bytes,
+    which also end each key); ``key_docs`` and ``key_at_start`` give the
+    name of each entry and whether it starts that name. Filters are applied
+    to the matching names' rows through ``MenuIndex.row_matcher``.
+    """
+
+    def __init__(self, df: pd.DataFrame, index: MenuIndex):
+        self.index = index
+        names, kinds, row_offsets, rows = [], [], [0], []
+        for column, kind in SEARCH_COLUMNS.items():
+            if column not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[column])
+            names.extend(str(value) for value in uniques)
+            kinds.extend([kind] * len(uniques))
+            # Rows of each distinct name, grouped by name.
+            valid = codes >= 0
+            rows.append(np.flatnonzero(valid)[np.argsort(codes[valid], kind='stable')].astype(np.int32))
+            counts = np.bincount(codes[valid], minlength=len(uniques))
+            row_offsets.extend((row_offsets[-1] + np.cumsum(counts)).tolist())
+        self.names = names
+        self.kinds = kinds
+        self.rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int32)
+        self.row_offsets = np.array(row_offsets, dtype=np.int64)
+        self.normalized = (pd.Series(names, dtype=object).str.lower()
+                           .str.replace(NON_WORD_RE, ' ', regex=True).str.strip().tolist())
+        self._build_keys()
+        words = sorted({word for name in self.normalized for word in name.split()})
+        self.vocabulary = TrigramIndex(words)
+        self.sorted_words = np.array(words, dtype=object)
+
+    def _build_keys(self):
+        encoded = [name.encode('utf-8') for name in self.normalized]
+        self.doc_lengths = np.array([len(text) for text in encoded], dtype=np.int64)
+        doc_starts = np.cumsum(self.doc_lengths + 1) - (self.doc_lengths + 1)
+        # Trailing NULs let every key window run KEY_WIDTH bytes past its start.
+        self.text = bytes([SEPARATOR]).join(encoded) + bytes([SEPARATOR]) * KEY_WIDTH
+        data = np.frombuffer(self.text, dtype=np.uint8)
+        previous = np.concatenate(([SEPARATOR], data[:-1]))
+        word_starts = np.flatnonzero((data != SEPARATOR) & (data != SPACE)
+                                     & ((previous == SEPARATOR) | (previous == SPACE)))
+        windows = np.ascontiguousarray(data[word_starts[:, None] + np.arange(KEY_WIDTH)])
+        keys = windows.view(f'S{KEY_WIDTH}').ravel()
+        order = np.argsort(keys, kind='stable')
+        self.keys = keys[order]
+        self.key_starts = word_starts[order]
+        self.key_docs = (np.searchsorted(doc_starts, self.key_starts, side='right') - 1).astype(np.int32)
+        self.key_at_start = self.key_starts == doc_starts[self.key_docs]
+
+    def _lookup(self, phrase: str, penalty: float = 0.0, matcher=None, limit: int = 1):
+        """Return ``(scores, docs, counts)`` for the names with a word where ``phrase`` begins.
+
+        ``counts`` are the names' rows, or with ``matcher`` their rows under
+        the filters; names with none are left out. Entries starting a name
+        are read before the other word starts, as they score higher, each
+        MAX_SCAN at a time until ``limit`` names are found or they run out,
+        so a narrow filter is not left with an empty first batch.
+        """
+        encoded = phrase.encode('utf-8')
+        head = encoded[:KEY_WIDTH]
+        lo = int(np.searchsorted(self.keys, head, side='left'))
+        hi = int(np.searchsorted(self.keys, (head + b'\xff' * KEY_WIDTH)[:KEY_WIDTH], side='right'))
+        at_start = self.key_at_start[lo:hi]
+        found, found_counts, found_docs = [], [], 0
+        for candidates in (lo + np.flatnonzero(at_start), lo + np.flatnonzero(~at_start)):
+            for start in range(0, len(candidates), MAX_SCAN):
+                if found_docs >= limit:
+                    break
+                entries = candidates[start:start + MAX_SCAN]
+                if len(encoded) > KEY_WIDTH:
+                    starts = self.key_starts[entries].tolist()
+                    entries = entries[[self.text[s:s + len(encoded)] == encoded for s in starts]]
+                counts = self._row_counts(self.key_docs[entries], matcher)
+                found.append(entries[counts > 0])
+                found_counts.append(counts[counts > 0])
+                found_docs = len(np.unique(self.key_docs[np.concatenate(found)]))
+        if not found:
+            return np.zeros(0), np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int64)
+        entries, counts = np.concatenate(found), np.concatenate(found_counts)
+        docs = self.key_docs[entries]
+        at_start = self.key_at_start[entries]
+        scores = np.where(at_start, NAME_PREFIX_SCORE, WORD_PREFIX_SCORE)
+        scores[at_start & (self.doc_lengths[docs] == len(encoded))] = EXACT_SCORE
+        return scores - penalty, docs, counts
+
+    def _row_counts(self, docs: np.ndarray, matcher=None) -> np.ndarray:
+        """Rows of each name in ``docs``; with ``matcher``, only the rows it accepts."""
+        if matcher is None:
+            return self.row_offsets[docs + 1] - self.row_offsets[docs]
+        unique, inverse = np.unique(docs, return_inverse=True)
+        starts = self.row_offsets[unique]
+        lengths = self.row_offsets[unique + 1] - starts
+        # Row positions of every name, name after name.
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        hits = np.bincount(np.repeat(np.arange(len(unique)), lengths),
+                           weights=matcher(self.rows[positions]), minlength=len(unique))
+        return hits.astype(np.int64)[inverse.reshape(-1)]
+
+    def _is_known(self, word: str, prefix: bool) -> bool:
+        i = int(np.searchsorted(self.sorted_words, word))
+        if i == len(self.sorted_words):
+            return False
+        return self.sorted_words[i].startswith(word) if prefix else self.sorted_words[i] == word
+
+    def _corrections(self, words: List[str]) -> List[tuple]:
+        """Return ``(phrase, penalty)`` for the likeliest respellings of a query's unknown words.
+
+        The last word may be unfinished, so it only needs to start a
+        vocabulary word to count as known.
+        """
+        options, corrected = [], False
+        for i, word in enumerate(words):
+            prefix = i == len(words) - 1
+            spellings = []
+            if allowed_typos(word) and not self._is_known(word, prefix):
+                spellings = self.vocabulary.similar(word, prefix)
+            corrected = corrected or bool(spellings)
+            options.append(spellings or [(word, 1.0)])
+        if not corrected:
+            return []
+        phrases = sorted(((' '.join(word for word, _ in combination),
+                           float(np.prod([similarity for _, similarity in combination])))
+                          for combination in itertools.product(*options)), key=lambda item: -item[1])
+        return [(phrase, CORRECTION_PENALTY + (1 - similarity)) for phrase, similarity in phrases[:MAX_VARIANTS]]
+
+    def search(self, query: str, filters: Optional[Dict[str, Sequence]] = None, min_price=None,
+               max_price=None, limit: int = 10) -> List[dict]:
+        """Return up to ``limit`` ranked names matching ``query`` that have rows under the filters.
+
+        An exact name ranks first, then names starting with the query, then
+        names with a word starting with it; shorter names win ties. Words
+        not in the vocabulary are also tried respelt, ranking below the
+        literal matches. Each result counts the rows that match the filters.
+        """
+        query = normalize(query)
+        if len(query) < MIN_QUERY_LENGTH:
+            return []
+        matcher = self.index.row_matcher(filters or {}, min_price, max_price) if (
+            filters and any(filters.values()) or min_price is not None or max_price is not None) else None
+        lookups = [self._lookup(query, matcher=matcher, limit=limit)]
+        lookups += [self._lookup(phrase, penalty, matcher, limit)
+                    for phrase, penalty in self._corrections(query.split())]
+        scores, docs, counts = (np.concatenate(parts) for parts in zip(*lookups))
+        if not len(docs):
+            return []
+        # Best first, each name once at its best score.
+        order = np.lexsort((docs, self.doc_lengths[docs], -scores))
+        docs, scores, counts = docs[order], scores[order], counts[order]
+        first = np.sort(np.unique(docs, return_index=True)[1])[:limit]
+        return [{'type': self.kinds[doc], 'name': self.names[doc], 'score': round(score, 3), 'count': matching}
+                for doc, score, matching in zip(docs[first].tolist(), scores[first].tolist(), counts[first].tolist())]
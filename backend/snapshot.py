@@ -0,0 +1,137 @@
+# File: backend/snapshot.py
+"""Columnar, memory-mapped snapshot of the cleaned menu table.
+
+Layout: an 8-byte magic, a little-endian uint64 header length, a JSON header
+and then the column arrays, each aligned to 64 bytes. Text columns are
+dictionary-encoded: an integer code array plus a string heap holding the
+distinct values as NUL-separated UTF-8. Numeric columns are stored raw;
+float64 columns that round-trip through float32 exactly (prices in whole or
+half rupees) are stored as float32.
+
+Compile it offline next to the CSV with:  python snapshot.py
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b'KKSNAP01'
+ALIGNMENT = 64
+
+
+def file_sha256(path: str) -> str:
+    """Return the hex SHA-256 of the file at ``path``."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _code_dtype(cardinality: int):
+    for dtype in (np.int8, np.int16, np.int32):
+        if cardinality < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _encode_column(series: pd.Series):
+    """Return ``(meta, arrays)`` for one column; ``arrays`` maps a role to bytes-like data."""
+    if pd.api.types.is_numeric_dtype(series) and not isinstance(series.dtype, pd.CategoricalDtype):
+        values = series.to_numpy()
+        if values.dtype == np.float64 and np.array_equal(
+                values.astype(np.float32).astype(np.float64), values, equal_nan=True):
+            values = values.astype(np.float32)
+        return {'kind': 'numeric', 'dtype': values.dtype.str}, {'values': values}
+
+    codes, uniques = pd.factorize(series)
+    strings = list(uniques)
+    if not all(isinstance(value, str) for value in strings):
+        raise ValueError(f"Column {series.name!r} mixes text with other types and cannot be heap-encoded")
+    if any('\0' in value for value in strings):
+        raise ValueError(f"Column {series.name!r} contains NUL characters and cannot be heap-encoded")
+    codes = codes.astype(_code_dtype(len(strings)))
+    heap = np.frombuffer('\0'.join(strings).encode('utf-8'), dtype=np.uint8)
+    return ({'kind': 'dictionary', 'dtype': codes.dtype.str, 'cardinality': len(strings)},
+            {'codes': codes, 'heap': heap})
+
+
+def write_snapshot(df: pd.DataFrame, path: str, source_sha256: str) -> None:
+    """Write ``df`` to ``path`` as a snapshot tagged with the source file's hash."""
+    columns = []
+    blobs = []
+    offset = 0
+    for name in df.columns:
+        meta, arrays = _encode_column(df[name])
+        meta['name'] = name
+        meta['arrays'] = {}
+        for role, array in arrays.items():
+            data = np.ascontiguousarray(array).tobytes()
+            meta['arrays'][role] = [offset, len(data)]
+            blobs.append(data)
+            padding = -len(data) % ALIGNMENT
+            blobs.append(b'\0' * padding)
+            offset += len(data) + padding
+        columns.append(meta)
+
+    header = json.dumps({'source_sha256': source_sha256, 'rows': len(df), 'columns': columns}).encode('utf-8')
+    preamble_size = len(MAGIC) + 8 + len(header)
+    data_start = preamble_size + (-preamble_size % ALIGNMENT)
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+        f.write(b'\0' * (data_start - preamble_size))
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path: str):
+    """Memory-map the snapshot at ``path`` and return ``(header, df)``.
+
+    Code and numeric arrays are views over the mapping; only the string
+    dictionaries are decoded into Python objects.
+    """
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if buffer[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a menu snapshot (bad magic)")
+    (header_size,) = struct.unpack_from('<Q', buffer, len(MAGIC))
+    header_start = len(MAGIC) + 8
+    header = json.loads(buffer[header_start:header_start + header_size].decode('utf-8'))
+    data_start = header_start + header_size
+    data_start += -data_start % ALIGNMENT
+
+    def view(meta, role, dtype):
+        offset, size = meta['arrays'][role]
+        return np.frombuffer(buffer, dtype=dtype, count=size // np.dtype(dtype).itemsize,
+                             offset=data_start + offset)
+
+    columns = {}
+    for meta in header['columns']:
+        if meta['kind'] == 'numeric':
+            columns[meta['name']] = view(meta, 'values', meta['dtype'])
+        else:
+            heap = view(meta, 'heap', np.uint8).tobytes().decode('utf-8')
+            categories = heap.split('\0') if meta['cardinality'] else []
+            columns[meta['name']] = pd.Categorical.from_codes(view(meta, 'codes', meta['dtype']), categories)
+    return header, pd.DataFrame(columns)
+
+
+if __name__ == '__main__':
+    from menu_loader import DATA_FILE_NAME, load_menu_csv, snapshot_path_for
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    source = sys.argv[1] if len(sys.argv) > 1 else os.path.join(script_dir, DATA_FILE_NAME)
+    target = snapshot_path_for(source)
+    cleaned = load_menu_csv(source)
+    write_snapshot(cleaned, target, file_sha256(source))
+    print(f"--- LOG: Wrote snapshot with {len(cleaned)} rows to {target} ({os.path.getsize(target)} bytes)")
@@ -0,0 +1,7 @@
+# File: backend/tests/conftest.py
+"""Make the backend modules importable as top-level modules, as they are when run from backend/."""
+import os
+import sys
+
+os.environ.setdefault('DATA_WATCH_INTERVAL', '0')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
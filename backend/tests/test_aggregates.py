@@ -0,0 +1,27 @@
+# File: backend/tests/test_aggregates.py
+import pandas as pd
+import pytest
+
+from aggregates import MenuAggregates
+
+MENU = pd.DataFrame({
+    'Restaurant_Name': ['Cafe B', 'Cafe B', 'Annapurna', 'Zaika', 'Zaika', 'Moti Mahal'],
+    'Price': [120.0, 180.0, 90.0, 300.0, 260.0, 150.0],
+    'Food Type': ['Veg', 'Veg', 'Veg', 'Non-Veg', 'Veg', 'Non-Veg'],
+    'Cuisine': ['Cafe', 'Cafe', 'South Indian', 'Mughlai', 'North Indian', 'Mughlai'],
+    'Area': ['Baner', 'Baner', 'Aundh', 'Camp', 'Camp', 'Baner'],
+}).astype({'Restaurant_Name': 'string', 'Area': 'string'})
+
+
+@pytest.mark.parametrize('descending', [False, True])
+def test_sort_by_name(descending):
+    result = MenuAggregates(MENU).top_restaurants({}, 'name', descending, limit=10)
+    names = [record['name'] for record in result['results']]
+    assert names == sorted(['Annapurna', 'Cafe B', 'Moti Mahal', 'Zaika'], reverse=descending)
+    assert result['total'] == 4
+
+
+def test_filtered_price_ranking():
+    result = MenuAggregates(MENU).top_restaurants({'Cuisine': ['Mughlai']}, 'medianPrice', False, limit=1)
+    assert result['total'] == 2
+    assert [record['name'] for record in result['results']] == ['Moti Mahal']
@@ -0,0 +1,50 @@
+# File: backend/tests/test_app.py
+import importlib
+import sys
+
+import pytest
+
+from bench.common import synthetic_menu
+from dataset import DATA_DIR_ENV_VAR
+from menu_loader import DATA_FILE_NAME
+from metrics import METRICS
+
+
+@pytest.fixture
+def app_module(tmp_path, monkeypatch):
+    synthetic_menu(2_000).to_csv(tmp_path / DATA_FILE_NAME, index=False)
+    monkeypatch.setenv(DATA_DIR_ENV_VAR, str(tmp_path))
+    sys.modules.pop('app', None)
+    module = importlib.import_module('app')
+
+    @module.app.route('/api/test/fail')
+    def fail():
+        raise RuntimeError('handler failed')
+
+    yield module
+    sys.modules.pop('app', None)
+
+
+def status_count(route: str, status: int) -> int:
+    return METRICS.statuses.get((route, status), 0)
+
+
+@pytest.mark.parametrize('propagate', [False, True])
+def test_unhandled_errors_are_recorded_once(app_module, propagate):
+    app_module.app.config['PROPAGATE_EXCEPTIONS'] = propagate
+    before = status_count('/api/test/fail', 500)
+    client = app_module.app.test_client()
+    if propagate:
+        with pytest.raises(RuntimeError):
+            client.get('/api/test/fail')
+    else:
+        assert client.get('/api/test/fail').status_code == 500
+    assert status_count('/api/test/fail', 500) == before + 1
+
+
+def test_handled_requests_keep_their_status(app_module):
+    before = status_count('/api/recommend', 400), status_count('/api/recommend', 200)
+    client = app_module.app.test_client()
+    assert client.post('/api/recommend', json={'minPrice': 'abc'}).status_code == 400
+    assert client.post('/api/recommend', json={}).status_code == 200
+    assert (status_count('/api/recommend', 400), status_count('/api/recommend', 200)) == (before[0] + 1, before[1] + 1)
@@ -0,0 +1,35 @@
+# File: backend/tests/test_cleaning.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from cleaning import clean_frame, parse_column
+
+PRICES = [
+    ('₹2,000 for two', 2000.0, 'currency'),
+    ('Rs. 450', 450.0, 'currency'),
+    ('4.2 / ₹300', 300.0, 'currency'),
+    ('250/-', 250.0, 'suffixed'),
+    ('250 INR', 250.0, 'suffixed'),
+    ('250 Rs', 250.0, 'suffixed'),
+    ('Price: 250', 250.0, 'labelled'),
+    ('1,200', 1200.0, 'plain'),
+    ('747.5', 747.5, 'plain'),
+    ('approx 320 per head', 320.0, 'first_number'),
+    ('N/A', np.nan, 'missing'),
+    ('free', np.nan, 'unparseable'),
+]
+
+
+@pytest.mark.parametrize('text, expected, rule', PRICES)
+def test_price_shapes(text, expected, rule):
+    values, counts = parse_column(pd.Series([text]), 'price')
+    np.testing.assert_equal(values.iloc[0], expected)
+    assert counts == {rule: 1}
+
+
+def test_fractional_counts_become_integers():
+    cleaned, _ = clean_frame(pd.DataFrame({'Rating Count': [12.4, 3.0, None], 'Price': ['₹300', '250/-', '-']}))
+    assert str(cleaned['Rating Count'].dtype) == 'Int64'
+    assert cleaned['Rating Count'].tolist() == [12, 3, pd.NA]
+    assert cleaned['Price'].tolist()[:2] == [300.0, 250.0]
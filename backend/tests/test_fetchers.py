@@ -0,0 +1,34 @@
+# File: backend/tests/test_fetchers.py
+import pytest
+
+from fetchers import _lxml_cards, _stdlib_cards, lxml
+from scraping_updated import parse_restaurant_card
+
+PAGES = {
+    'unclosed p': '<div data-testid="restaurant-card"><h4>Alpha Cafe</h4><p>Cafe, Coffee<p>Baner, Pune<p>4.2'
+                  '</div><div data-testid="res-card"><h4>Beta Bistro</h4><p>Italian</div>',
+    'card is a link': '<a data-testid="restaurant-card" href="/pune/alpha-cafe"><h4>Alpha Cafe</h4>'
+                      '<p>Cafe</p></a>',
+    'stray end tag': '<div data-testid="restaurant-card"><h4>Alpha <span>Cafe</span></h4><p>Cafe</span></p>'
+                     '<div>Baner, Pune</div></div><div data-testid="restaurant-card"><h4>Beta Bistro</h4></div>',
+    'block inside p': '<div data-testid="restaurant-card"><h4>Alpha Cafe</h4><p>Cafe<div>Baner, Pune</div>'
+                      '4.2</div>',
+}
+
+
+def records(cards):
+    return [parse_restaurant_card(text, headings, hrefs) for text, headings, hrefs in cards]
+
+
+def test_unclosed_p_does_not_swallow_the_next_card():
+    assert [record['Name'] for record in records(_stdlib_cards(PAGES['unclosed p']))] == ['Alpha Cafe', 'Beta Bistro']
+
+
+def test_card_link_href():
+    assert _stdlib_cards(PAGES['card is a link'])[0][2] == ['/pune/alpha-cafe']
+
+
+@pytest.mark.skipif(lxml is None, reason='lxml is not installed')
+@pytest.mark.parametrize('name', sorted(PAGES))
+def test_parsers_agree(name):
+    assert records(_stdlib_cards(PAGES[name])) == records(_lxml_cards(PAGES[name]))
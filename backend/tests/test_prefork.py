@@ -0,0 +1,69 @@
+# File: backend/tests/test_prefork.py
+import gc
+import importlib
+import json
+import os
+import signal
+import socket
+import sys
+import threading
+import urllib.request
+
+import pytest
+
+from bench.common import synthetic_menu
+from dataset import DATA_DIR_ENV_VAR, WATCH_INTERVAL_ENV_VAR
+from menu_loader import DATA_FILE_NAME
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs os.fork')
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    synthetic_menu(20_000).to_csv(tmp_path / DATA_FILE_NAME, index=False)
+    monkeypatch.setenv(DATA_DIR_ENV_VAR, str(tmp_path))
+    monkeypatch.setenv(WATCH_INTERVAL_ENV_VAR, '60')
+    sys.modules.pop('app', None)
+    prefork = importlib.import_module('prefork')
+    listener = socket.create_server(('127.0.0.1', 0))
+    server = prefork.PreforkServer(listener, workers=1, access_log=False)
+    server.app = server._import_app()
+    yield server
+    for pid in server.workers:
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+    listener.close()
+    gc.unfreeze()
+    sys.modules.pop('app', None)
+
+
+def test_parent_polls_without_a_watcher_thread(server):
+    assert server.watch_interval == 60 and os.environ[WATCH_INTERVAL_ENV_VAR] == '60'
+    assert 'dataset-watch' not in [thread.name for thread in threading.enumerate()]
+
+
+def test_worker_serves_from_read_only_arrays(server):
+    server._share_current()
+    positions = server.app.datasets.current.index.positions
+    assert not positions.flags.writeable
+    with pytest.raises(ValueError):
+        positions[0] = 0
+
+    server.workers = {server._spawn()}
+    host, port = server.listener.getsockname()[:2]
+    request = urllib.request.Request(f'http://{host}:{port}/api/recommend', data=json.dumps({'seed': 1}).encode(),
+                                     headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        assert response.status == 200
+        assert len(json.loads(response.read())) == 5
+
+
+def test_reload_loads_in_the_parent_thread_and_rolls(server, tmp_path):
+    server._share_current()
+    datasets = server.app.datasets
+    synthetic_menu(20_001).to_csv(tmp_path / DATA_FILE_NAME, index=False)
+    server._reload()
+    assert 'dataset-reload' not in [thread.name for thread in threading.enumerate()]
+    assert not datasets.loading
+    assert len(datasets.current.df) == 20_001
+    assert server.generation == datasets.swaps and len(server.workers) == 1
@@ -0,0 +1,57 @@
+# File: backend/tests/test_queries.py
+import pandas as pd
+import pytest
+
+from dataset import Dataset
+from queries import QueryError, recommend, recommend_batch
+
+MENU = pd.DataFrame({
+    'Restaurant_Name': [f'Restaurant {i}' for i in range(12)],
+    'Item_Name': ['Dal'] * 12,
+    'Price': [100.0 + 10 * i for i in range(12)],
+    'Food Type': ['Veg'] * 12,
+    'Cuisine': ['North Indian'] * 12,
+})
+
+
+@pytest.fixture(scope='module')
+def data_set():
+    return Dataset(MENU, 'test')
+
+
+@pytest.mark.parametrize('seed', ['abc', -1, 1.5, True, [1]])
+def test_bad_seed_is_a_query_error(data_set, seed):
+    with pytest.raises(QueryError, match='seed'):
+        recommend(data_set, {'seed': seed})
+    with pytest.raises(QueryError, match='seed'):
+        recommend_batch(data_set, {'seed': seed, 'queries': [{}]})
+
+
+@pytest.mark.parametrize('body, message', [
+    ({'foodTypes': [['Veg']]}, 'foodTypes'),
+    ({'foodTypes': 'Veg'}, 'foodTypes'),
+    ({'cuisines': [1]}, 'cuisines'),
+    ({'minPrice': 'abc'}, 'minPrice'),
+    ({'maxPrice': [300]}, 'maxPrice'),
+    ({'minPrice': True}, 'minPrice'),
+    (['Veg'], 'JSON object'),
+])
+def test_bad_filters_are_query_errors(data_set, body, message):
+    for mode in ('uniform', 'ranked'):
+        with pytest.raises(QueryError, match=message):
+            recommend(data_set, dict(body, mode=mode) if isinstance(body, dict) else body)
+    if isinstance(body, dict):
+        with pytest.raises(QueryError, match=message):
+            recommend_batch(data_set, [body])
+
+
+def test_null_filters_mean_no_filter(data_set):
+    body = {'foodTypes': None, 'minPrice': None, 'maxPrice': 150, 'seed': 3}
+    assert len(recommend(data_set, body)) == 5
+
+
+@pytest.mark.parametrize('mode', ['uniform', 'ranked'])
+def test_seeded_recommendations_repeat(data_set, mode):
+    first = recommend(data_set, {'seed': 7, 'mode': mode})
+    assert list(recommend(data_set, {'seed': 7, 'mode': mode})) == list(first)
+    assert len(recommend(data_set, {'seed': 0, 'mode': mode})) == 5
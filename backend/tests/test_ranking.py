@@ -0,0 +1,74 @@
+# File: backend/tests/test_ranking.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataset import Dataset
+from ranking import AliasTable, build_alias
+
+WEIGHTS = {
+    'equal': np.full(41, 0.84),
+    'tied': np.array([1, 4, 3, 4, 1, 3, 2, 4, 1, 1], dtype=float),
+    # Several columns scale to exactly 1 (the mean weight).
+    'at the mean': np.array([1, 4, 3, 2, 2, 2, 2, 0], dtype=float),
+    'tied large': np.array([4, 2, 1, 4, 4], dtype=float),
+    'skewed': np.random.default_rng(3).lognormal(0.0, 1.5, size=200),
+    'with zeros': np.array([0.0, 2.0, 0.0, 1.0, 1.0]),
+}
+
+
+def implied_probabilities(prob: np.ndarray, alias: np.ndarray) -> np.ndarray:
+    """Exact draw probabilities of an alias table: own share plus what other columns alias to."""
+    n = len(prob)
+    return (prob + np.bincount(alias, weights=1.0 - prob, minlength=n)) / n
+
+
+@pytest.mark.parametrize('name', list(WEIGHTS))
+def test_alias_table_reproduces_weights(name):
+    weights = WEIGHTS[name]
+    prob, alias = build_alias(weights)
+    assert ((prob >= 0) & (prob <= 1)).all()
+    np.testing.assert_allclose(implied_probabilities(prob, alias), weights / weights.sum(), atol=1e-12)
+
+
+@pytest.mark.parametrize('name', list(WEIGHTS))
+def test_draw_frequencies_match_weights(name):
+    weights = WEIGHTS[name]
+    table = AliasTable(np.arange(len(weights)), weights, len(weights))
+    draws = 400_000
+    counts = np.bincount(table.draw(draws, np.random.default_rng(0)), minlength=len(weights))
+    expected = weights / weights.sum()
+    # Five standard deviations of a binomial count, per entry.
+    tolerance = 5 * np.sqrt(expected * (1 - expected) / draws) + 1e-9
+    assert (np.abs(counts / draws - expected) <= tolerance).all()
+
+
+def test_ranked_sample_with_identical_rows():
+    df = pd.DataFrame({
+        'Restaurant_Name': [f'Restaurant {i}' for i in range(45)],
+        'Item_Name': ['Dal'] * 45,
+        'Price': [250.0] * 45,
+        'Food Type': ['Veg'] * 45,
+        'Cuisine': ['North Indian'] * 45,
+    })
+    data_set = Dataset(df, 'test')
+    picks = data_set.ranker.sample({}, None, None, k=5, seed=1)
+    assert len(picks) == 5 and len(set(df['Restaurant_Name'].to_numpy()[picks])) == 5
+
+
+def test_ranked_cache_keys_on_raw_price_bounds():
+    df = pd.DataFrame({
+        'Restaurant_Name': [f'Restaurant {i}' for i in range(20)],
+        'Item_Name': ['Dal'] * 20,
+        'Price': np.linspace(100.0, 300.0, 20),
+        'Food Type': ['Veg'] * 20,
+        'Cuisine': ['North Indian'] * 20,
+    })
+    data_set = Dataset(df, 'test')
+    ranker, cache = data_set.ranker, data_set.ranked_cache
+    unbounded = ranker.alias_table({}, None, None, cache=cache)
+    # Same rows, but weights centred on 50000 instead of 200.
+    wide = ranker.alias_table({}, 0, 100_000, cache=cache)
+    assert wide is not unbounded
+    assert ranker.alias_table({}, None, None, cache=cache) is unbounded
+    assert ranker.alias_table({}, 0.0, 100_000.0, cache=cache) is wide
@@ -0,0 +1,43 @@
+# File: backend/tests/test_scrape_output.py
+import csv
+import json
+
+import pytest
+
+from scrape_output import RecordSink
+
+
+def record(name: str, rating: str) -> dict:
+    return {"Name": name, "URL": f"https://www.zomato.com/pune/{name.lower()}", "Area": "Baner",
+            "Cuisine": "Cafe", "Rating": rating, "Rating Count": "10", "Price": "300", "Availability": "Open"}
+
+
+def read(path: str) -> list:
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            return [json.loads(line) for line in f]
+        return list(csv.DictReader(f))
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".jsonl"])
+def test_refresh_replaces_changed_restaurant(tmp_path, suffix):
+    path = str(tmp_path / f"out{suffix}")
+    with RecordSink(path) as sink:
+        sink.offer(record("Alpha", "4.1"))
+        sink.offer(record("Beta", "3.9"))
+    with RecordSink(path, refresh=True) as sink:
+        assert sink.offer(record("Alpha", "4.4"))
+        assert not sink.offer(record("Beta", "3.9"))
+        assert sink.offer(record("Gamma", "4.0"))
+    rows = read(path)
+    assert [(row["Name"], row["Rating"]) for row in rows] == [("Alpha", "4.4"), ("Beta", "3.9"), ("Gamma", "4.0")]
+
+
+def test_resume_skips_finished_listings(tmp_path):
+    path = str(tmp_path / "out.csv")
+    with RecordSink(path) as sink:
+        sink.mark_listing("https://www.zomato.com/pune/restaurants")
+    with RecordSink(path) as sink:
+        assert sink.listing_done("https://www.zomato.com/pune/restaurants")
+    with RecordSink(path, refresh=True) as sink:
+        assert not sink.listing_done("https://www.zomato.com/pune/restaurants")
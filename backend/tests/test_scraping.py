@@ -0,0 +1,51 @@
+# File: backend/tests/test_scraping.py
+import pytest
+
+from fetchers import SeleniumFetcher
+from scrape_output import RecordSink
+from scraping_parallel import scrape_areas
+from scraping_updated import scrape_restaurants
+
+
+class BrokenDriver:
+    """A browser whose page load fails."""
+
+    def get(self, url):
+        raise TimeoutError(f"{url} did not load")
+
+
+def test_failure_is_swallowed_by_default():
+    assert scrape_restaurants('https://www.zomato.com/pune/restaurants', driver=BrokenDriver()) == []
+
+
+def test_failure_propagates_with_raise_errors():
+    with pytest.raises(TimeoutError):
+        scrape_restaurants('https://www.zomato.com/pune/restaurants', driver=BrokenDriver(), raise_errors=True)
+
+
+class FlakyFetcher:
+    """Returns one restaurant per listing, and fails on listings with 'bad' in the URL."""
+
+    def fetch(self, url):
+        if 'bad' in url:
+            raise RuntimeError('listing failed')
+        return [{'Name': f'Cafe {url[-1]}', 'URL': f'{url}/cafe', 'Area': 'Baner', 'Cuisine': 'Cafe',
+                 'Rating': '4.1', 'Rating Count': '10', 'Price': '300', 'Availability': 'Open'}]
+
+    def close(self):
+        pass
+
+
+def test_selenium_fetcher_raises_on_a_failed_scrape():
+    fetcher = SeleniumFetcher.__new__(SeleniumFetcher)
+    fetcher.driver = BrokenDriver()
+    with pytest.raises(TimeoutError):
+        fetcher.fetch('https://www.zomato.com/pune/baner-restaurants')
+
+
+def test_failed_listings_are_not_marked_done(tmp_path):
+    output = str(tmp_path / 'out.csv')
+    good, bad = 'https://www.zomato.com/pune/good-1', 'https://www.zomato.com/pune/bad-2'
+    assert scrape_areas([good, bad], output, workers=1, fetcher_factory=FlakyFetcher) == 1
+    with RecordSink(output) as sink:
+        assert sink.listing_done(good) and not sink.listing_done(bad)
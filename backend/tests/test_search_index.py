@@ -0,0 +1,41 @@
+# File: backend/tests/test_search_index.py
+import pandas as pd
+
+from dataset import Dataset
+from search_index import MAX_SCAN
+
+# Many Chinese "paneer" dishes sort before the one North Indian one.
+ROWS = MAX_SCAN * 2
+MENU = pd.DataFrame({
+    'Restaurant_Name': [f'Restaurant {i % 50}' for i in range(ROWS)] + ['Punjab Grill'],
+    'Item_Name': [f'Paneer A{i:05d}' for i in range(ROWS)] + ['Paneer Tikka'],
+    'Price': [200.0] * ROWS + [350.0],
+    'Food Type': ['Veg'] * (ROWS + 1),
+    'Cuisine': ['Chinese'] * ROWS + ['North Indian'],
+})
+
+
+def test_filtered_match_beyond_the_first_scan():
+    search = Dataset(MENU, 'test').search
+    results = search.search('paneer', {'Cuisine': ['North Indian']})
+    assert [(result['name'], result['count']) for result in results] == [('Paneer Tikka', 1)]
+
+
+def test_unfiltered_counts_every_row():
+    search = Dataset(MENU, 'test').search
+    results = search.search('restaurant 1', limit=3)
+    assert [result['count'] for result in results] == [ROWS // 50] * 3
+
+
+def test_name_prefix_beyond_the_first_scan():
+    # Word-prefix matches "... Biryani A00000" sort before "Biryani Veg".
+    menu = pd.DataFrame({
+        'Restaurant_Name': ['Restaurant'] * (ROWS + 1),
+        'Item_Name': [f'Pav Biryani A{i:05d}' for i in range(ROWS)] + ['Biryani Veg'],
+        'Price': [200.0] * (ROWS + 1),
+        'Food Type': ['Veg'] * (ROWS + 1),
+        'Cuisine': ['Mughlai'] * (ROWS + 1),
+    })
+    results = Dataset(menu, 'test').search.search('bi', limit=3)
+    assert results[0]['name'] == 'Biryani Veg'
+    assert [result['score'] for result in results] == [2.0, 1.0, 1.0]